@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Compares the time of conll18_ud_eval.evaluate computing all the metrics with the time of computing only the UAS and LAS metrics
+# used by the T-test, both for a whole file and for each sentence evaluated separately, and the time of the general word alignment with
+# the time of the identical words fast path, and the time of the metrics computed word by word with the time of the NumPy arrays.
+
+import sys
+from argparse import ArgumentParser
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.treebanks import generate_sentences, perturb_sentences, to_conllu  # noqa: E402
+from modules.conll18_ud_eval import ALIGNMENT_METRICS, AlignmentArrays, align, align_words, alignment_score, evaluate, \
+    identical_alignment, load_conllu  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark of the metric selection of evaluate')
+    parser.add_argument('--sentences', type=int, default=5000)
+    parser.add_argument('--repetitions', type=int, default=3)
+    arguments = parser.parse_args()
+
+    gold = generate_sentences(arguments.sentences)
+    system = perturb_sentences(gold)
+    gold_ud = load_conllu(StringIO(to_conllu(gold)))
+    system_ud = load_conllu(StringIO(to_conllu(system)))
+    sentence_pairs = [(load_conllu(StringIO(to_conllu([gold_sentence]))), load_conllu(StringIO(to_conllu([system_sentence]))))
+                      for gold_sentence, system_sentence in zip(gold, system)]
+
+    print(f"{'Metrics':>10} | {'File (s)':>9} | {'Sentence (us)':>13}")
+    times = {}
+    for name, metrics in (("All", None), ("UAS+LAS", ["UAS", "LAS"])):
+        file_time = min(measure(lambda: evaluate(gold_ud, system_ud, metrics)) for _ in range(arguments.repetitions))
+        sentences_time = min(measure(lambda: [evaluate(gold_sentence, system_sentence, metrics)
+                                              for gold_sentence, system_sentence in sentence_pairs])
+                             for _ in range(arguments.repetitions))
+        times[name] = (file_time, sentences_time)
+        print(f"{name:>10} | {file_time:>9.3f} | {1e6 * sentences_time / len(sentence_pairs):>13.1f}")
+
+    print(f"{'Speedup':>10} | {times['All'][0] / times['UAS+LAS'][0]:>8.2f}x | {times['All'][1] / times['UAS+LAS'][1]:>12.2f}x")
+
+    # The synthetic system keeps the gold tokenization, so its words can be aligned by the identical words fast path
+    general_time = min(measure(lambda: align_words(gold_ud.words, system_ud.words)) for _ in range(arguments.repetitions))
+    identical_time = min(measure(lambda: identical_alignment(gold_ud.words, system_ud.words)) for _ in range(arguments.repetitions))
+    print(f"Alignment: align_words {general_time:.3f} s, identical words {identical_time:.3f} s ({general_time / identical_time:.2f}x)")
+
+    alignment = align(gold_ud, system_ud)
+    python_time = min(measure(lambda: [alignment_score(alignment, key_fn, filter_fn) for key_fn, filter_fn in ALIGNMENT_METRICS.values()])
+                      for _ in range(arguments.repetitions))
+    numpy_time = min(measure(lambda: [arrays.score(metric) for arrays in [AlignmentArrays(alignment)] for metric in ALIGNMENT_METRICS])
+                     for _ in range(arguments.repetitions))
+    print(f"Metrics: alignment_score {python_time:.3f} s, NumPy arrays {numpy_time:.3f} s ({python_time / numpy_time:.2f}x)")
+
+
+def measure(function) -> float:
+    start = perf_counter()
+    function()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
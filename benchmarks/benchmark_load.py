@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Measures the time and the memory used by conll18_ud_eval.load_conllu to load a synthetic treebank, about 1M words by default.
+
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.treebanks import generate_sentences, to_conllu  # noqa: E402
+from modules.conll18_ud_eval import load_conllu  # noqa: E402
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark of load_conllu')
+    parser.add_argument('--sentences', type=int, default=60000)
+    parser.add_argument('--repetitions', type=int, default=3)
+    arguments = parser.parse_args()
+
+    text = to_conllu(generate_sentences(arguments.sentences))
+
+    load_time = float("inf")
+    for _ in range(arguments.repetitions):
+        start = perf_counter()
+        treebank = load_conllu(StringIO(text))
+        load_time = min(load_time, perf_counter() - start)
+        del treebank
+
+    tracemalloc.start()
+    treebank = load_conllu(StringIO(text))
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{'Words':>10} | {'Load (s)':>8} | {'us/word':>7} | {'Memory (MB)':>11} | {'Peak (MB)':>9}")
+    words = len(treebank.words)
+    print(f"{words:>10} | {load_time:>8.3f} | {1e6 * load_time / words:>7.2f} | {size / 2 ** 20:>11.1f} | {peak / 2 ** 20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Measures how the time of the split command grows with the number of sentences of the training file. The time per sentence must
+# stay roughly constant, which shows that the split is linear. The previous membership based selection is included for the small
+# sizes as a reference.
+
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from random import sample
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.splitter import select_random_blocks, split_file  # noqa: E402
+
+SENTENCE = "# sent_id = {}\n1\tLa\tel\tDET\t_\t_\t2\tdet\t_\t_\n2\tcasa\tcasa\tNOUN\t_\t_\t0\troot\t_\t_\n\n"
+
+
+def legacy_select(blocks: List[str]) -> None:
+    training_collection = sample(blocks, int(0.8 * len(blocks)))
+    [block for block in blocks if block not in training_collection]
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark of the split command')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 20000, 40000, 80000, 160000, 320000])
+    parser.add_argument('--legacy_limit', type=int, default=20000, help='Largest size measured with the previous algorithm')
+    arguments = parser.parse_args()
+
+    print(f"{'Sentences':>10} | {'Selection (s)':>13} | {'Split (s)':>9} | {'us/sentence':>11} | {'Previous (s)':>12}")
+    with TemporaryDirectory() as folder:
+        for size in arguments.sizes:
+            training_file = Path(folder).joinpath("xx_test-ud-train.conllu")
+            with open(training_file, 'wt', encoding='UTF-8') as file:
+                file.writelines(SENTENCE.format(index) for index in range(size))
+
+            with redirect_stdout(StringIO()):
+                start = perf_counter()
+                select_random_blocks(size, 0.8, 42)
+                selection_time = perf_counter() - start
+                start = perf_counter()
+                split_file(training_file, Path(folder).joinpath("train.conllu"), Path(folder).joinpath("dev.conllu"), 0.8, 42)
+                split_time = perf_counter() - start
+
+            legacy = "-"
+            if size <= arguments.legacy_limit:
+                blocks = [SENTENCE.format(index) for index in range(size)]
+                start = perf_counter()
+                legacy_select(blocks)
+                legacy = f"{perf_counter() - start:.3f}"
+
+            print(f"{size:>10} | {selection_time:>13.3f} | {split_time:>9.3f} | {1e6 * split_time / size:>11.2f} | {legacy:>12}")
+
+
+if __name__ == "__main__":
+    main()
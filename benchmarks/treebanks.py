@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Synthetic CoNLL-U treebanks used by the benchmarks.
+
+from random import Random
+from typing import List
+
+FORMS = ["casa", "perro", "gato", "vamos", "niño", "come", "pan", "y", "el", "la", "de", "los"]
+UPOS_TAGS = ["NOUN", "VERB", "DET", "ADP", "ADJ", "PRON"]
+DEPRELS = ["nsubj", "obj", "det", "case", "advmod", "amod", "nmod:poss", "aux", "cc", "conj", "cop", "mark", "acl:relcl"]
+FEATS = ["Gender=Masc|Number=Sing", "Number=Plur|Typo=Yes", "_", "Case=Nom|Animacy=Anim|Other=1"]
+
+
+def generate_sentences(sentences: int, seed: int = 42, multiword_ratio: float = 0.1) -> List[List[List[str]]]:
+    random = Random(seed)
+    treebank = []
+    for _ in range(sentences):
+        rows = []
+        length = random.randint(3, 30)
+        word_id = 1
+        while word_id <= length:
+            if random.random() < multiword_ratio and word_id < length:
+                parts = [random.choice(FORMS) for _ in range(2)]
+                rows.append([f"{word_id}-{word_id + 1}", "".join(parts)] + ["_"] * 8)
+            else:
+                parts = [random.choice(FORMS)]
+            for part in parts:
+                head = 0 if word_id == 1 else random.randint(1, word_id - 1)
+                deprel = "root" if head == 0 else random.choice(DEPRELS)
+                rows.append([str(word_id), part, part, random.choice(UPOS_TAGS), "X", random.choice(FEATS), str(head), deprel, "_",
+                             "_"])
+                word_id += 1
+        treebank.append(rows)
+
+    return treebank
+
+
+def perturb_sentences(treebank: List[List[List[str]]], seed: int = 7, error_ratio: float = 0.15) -> List[List[List[str]]]:
+    # Same tokenization as the original treebank, with some wrong heads, relations, tags and lemmas
+    random = Random(seed)
+    perturbed = []
+    for rows in treebank:
+        new_rows = []
+        for row in rows:
+            row = list(row)
+            if row[0].isdigit():
+                if random.random() < error_ratio:
+                    row[6] = str(random.randint(0, int(row[0]) - 1))
+                    row[7] = "root" if row[6] == "0" else row[7]
+                if random.random() < error_ratio:
+                    row[7] = random.choice(DEPRELS) if row[6] != "0" else "root"
+                if random.random() < error_ratio:
+                    row[3] = random.choice(UPOS_TAGS)
+                if random.random() < error_ratio:
+                    row[2] = "_"
+            new_rows.append(row)
+        perturbed.append(new_rows)
+
+    return perturbed
+
+
+def to_conllu(treebank: List[List[List[str]]]) -> str:
+    return "".join("".join("\t".join(row) + "\n" for row in rows) + "\n" for rows in treebank)
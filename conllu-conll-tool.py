@@ -6,11 +6,16 @@ from pathlib import Path
 from typing import Any, List
 
 from modules import column_inserter, columns_generator, column_remover, columns_swapper, empty_nodes, remove_pos, ud_enhancer
-from modules import combiner, splitter, converter, cleaner, filler, embeddings_generator, calculate_ttest, extractor
+from modules import combiner, splitter, converter, cleaner, filler, embeddings_generator, calculate_ttest, extractor, pipeline, indexer
+from modules import evaluator, vocabulary, embeddings_converter
 
 
 def main() -> None:
     parser = ArgumentParser(description='Convert CoNLL-U files to CoNLL files')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes used to process the files in parallel')
+    parser.add_argument('--chunk_size', type=int, default=64, help='Size in MB above which a file is split into chunks of sentences '
+                                                                   'processed in parallel by line-oriented commands when --jobs is '
+                                                                   'greater than 1. Use 0 to disable it.')
     subparsers = parser.add_subparsers(title='Commands', dest='command')
 
     input_help = "Input file(s) folder"
@@ -28,14 +33,19 @@ def main() -> None:
     subparser.add_argument('--type', choices=['train', 'dev', 'test'], required=True, help='The type of files to combine')
     # Split
     subparser = subparsers.add_parser('split', help='In case there is no validation file (dev), the training file (train) is split in '
-                                                    'two with a random 80-20 ratio.')
+                                                    'two at random, with 80 percent of the sentences for the training file by '
+                                                    'default (see --ratio).')
     subparser.add_argument('--input', type=str, required=True, help=input_help)
     subparser.add_argument('--output', type=str, required=True, help=output_help)
+    subparser.add_argument('--ratio', type=float, default=0.8, help='Ratio of sentences for the training file, between 0 and 1')
+    subparser.add_argument('--seed', type=int, help='Seed for the random selection, to be able to reproduce the split')
     # Clean
     subparser = subparsers.add_parser('clean', help='Cleans up an embedding file by removing the first line with the number of words and '
                                                     'the vector size.')
     subparser.add_argument('--input', type=str, required=True, help=input_help)
-    subparser.add_argument('--output', type=str, required=True, help=output_help)
+    subparser.add_argument('--output', type=str, help=f"{output_help}, required unless the files are cleaned in place")
+    subparser.add_argument('--in_place', action='store_true', help='Remove the first line from the input files themselves instead of '
+                                                                   'writing the cleaned files to the output folder')
     # Fill in
     subparser = subparsers.add_parser('fill', help='Add a label (with the given name) for unknown words with random values, using a '
                                                    'fixed seed for the given dimension.')
@@ -49,6 +59,11 @@ def main() -> None:
     subparser.add_argument('--input', type=str, required=True, help=input_help)
     subparser.add_argument('--output', type=str, required=True, help=output_help)
     subparser.add_argument('--dimension', type=int, required=True, help=dimension_help)
+    subparser.add_argument('--format', choices=['text', 'binary'], default='text', help='Format of the embeddings file: text or a NumPy '
+                                                                                        'matrix with a file of words (binary)')
+    subparser.add_argument('--precision', choices=['float32', 'float16', 'int8'], default='float32',
+                           help='Type in which the values of the binary format are stored: 32-bit floats, 16-bit floats or 8-bit integers '
+                                'scaled by the largest value of the file')
     # Add columns
     subparser = subparsers.add_parser('columns', help='Adds the required number of columns to the end of each line of a CoNLL file to '
                                                       'match the CoNLL-U format of 10 tab-separated columns.')
@@ -65,6 +80,32 @@ def main() -> None:
     subparser.add_argument('--predicted_a', type=str, required=True, help="Folder with CoNLL test files predicted by a model of parser A")
     subparser.add_argument('--gold_b', type=str, required=True, help="Folder with the original CoNLL test files for the parser B")
     subparser.add_argument('--predicted_b', type=str, required=True, help="Folder with CoNLL test files predicted by a model of parser B")
+    subparser.add_argument('--no_cache', action='store_true', help="Evaluate all the predicted files again instead of using the scores "
+                                                                   "cached by previous runs")
+    subparser.add_argument('--stream', action='store_true', help="Read the gold and predicted files in lockstep instead of loading them "
+                                                                 "whole, so the memory used does not grow with their size")
+    subparser.add_argument('--test', choices=['ttest', 'bootstrap', 'permutation'], default='ttest',
+                           help="Significance test: the unpaired T-test, paired bootstrap resampling or a paired permutation test "
+                                "(approximate randomization)")
+    subparser.add_argument('--resamples', type=int, default=10000, help="Number of resamples of the bootstrap and permutation tests")
+    subparser.add_argument('--seed', type=int, help="Seed for the resamples, to be able to reproduce the p-values")
+    # Compare
+    subparser = subparsers.add_parser('compare', help='Compares every pair of several systems with a significance test on the scores of '
+                                                      'each sentence, and writes the matrix of each language to a table.')
+    subparser.add_argument('--gold', type=str, required=True, help="Folder with the original CoNLL test files")
+    subparser.add_argument('--systems', type=str, nargs='+', required=True, help="Name and folder with the CoNLL test files predicted by "
+                                                                                 "each system, as NAME=FOLDER")
+    subparser.add_argument('--output', type=str, required=True, help=output_help)
+    subparser.add_argument('--format', choices=['csv', 'json'], default='csv', help='Format of the tables with the comparisons')
+    subparser.add_argument('--test', choices=['ttest', 'bootstrap', 'permutation'], default='ttest',
+                           help="Significance test: the unpaired T-test, paired bootstrap resampling or a paired permutation test "
+                                "(approximate randomization)")
+    subparser.add_argument('--resamples', type=int, default=10000, help="Number of resamples of the bootstrap and permutation tests")
+    subparser.add_argument('--seed', type=int, help="Seed for the resamples, to be able to reproduce the p-values")
+    subparser.add_argument('--no_cache', action='store_true', help="Evaluate all the predicted files again instead of using the scores "
+                                                                   "cached by previous runs")
+    subparser.add_argument('--stream', action='store_true', help="Read the gold and predicted files in lockstep instead of loading them "
+                                                                 "whole, so the memory used does not grow with their size")
     # Swap
     subparser = subparsers.add_parser('swap', help='Swaps the position of two given columns.')
     subparser.add_argument('--input', type=str, required=True, help=input_help)
@@ -100,6 +141,42 @@ def main() -> None:
     subparser.add_argument('--input', type=str, required=True, help=input_help)
     subparser.add_argument('--output', type=str, required=True, help=output_help)
     subparser.add_argument('--percentages', type=int, nargs='+', required=True, help="Percentage of sentences to be extracted")
+    # Pipeline
+    subparser = subparsers.add_parser('pipeline', help='Applies an ordered list of column transformations to each line in a single pass '
+                                                       'over every file.')
+    subparser.add_argument('--input', type=str, required=True, help=input_help)
+    subparser.add_argument('--output', type=str, required=True, help=output_help)
+    subparser.add_argument('--steps', type=str, required=True, help='Steps separated by |, e.g. "swap 3 4 | remove-column 9 | '
+                                                                    'enhanced-ud --keep". Valid steps: convert, columns, remove-pos, '
+                                                                    'swap FROM TO, remove-column POSITION, add-column POSITION CONTENT '
+                                                                    'and enhanced-ud [--keep].')
+    # Evaluate
+    subparser = subparsers.add_parser('evaluate', help='Evaluates the predicted files of several systems against the same gold files and '
+                                                       'writes every metric of each language and system to a table.')
+    subparser.add_argument('--gold', type=str, required=True, help="Folder with the original CoNLL test files")
+    subparser.add_argument('--predicted', type=str, nargs='+', required=True, help="Folders with the CoNLL test files predicted by each "
+                                                                                   "system")
+    subparser.add_argument('--output', type=str, required=True, help=output_help)
+    subparser.add_argument('--format', choices=['csv', 'json'], default='csv', help='Format of the table with the scores')
+    # Index
+    subparser = subparsers.add_parser('index', help='Creates a sidecar index with the position of each sentence of the CoNLL-U files, '
+                                                    'used by split and extract to access the sentences without reading whole files.')
+    subparser.add_argument('--input', type=str, required=True, help=input_help)
+    # Vocabulary
+    subparser = subparsers.add_parser('vocab', help='Counts the words of the training and validation files and writes them sorted by '
+                                                    'frequency to a vocabulary file, which can be used by generate.')
+    subparser.add_argument('--input', type=str, required=True, help=input_help)
+    subparser.add_argument('--output', type=str, required=True, help=output_help)
+    subparser.add_argument('--min_count', type=int, default=1, help='Minimum number of times a word must appear to be in the vocabulary')
+    # Convert embeddings
+    subparser = subparsers.add_parser('convert-embeddings', help='Converts the embeddings files from the text format to the binary format '
+                                                                 '(a NumPy matrix with a file of words) or the other way around.')
+    subparser.add_argument('--input', type=str, required=True, help=input_help)
+    subparser.add_argument('--output', type=str, required=True, help=output_help)
+    subparser.add_argument('--format', choices=['text', 'binary'], required=True, help='Format to convert the embeddings files to')
+    subparser.add_argument('--precision', choices=['float32', 'float16', 'int8'], default='float32',
+                           help='Type in which the values of the binary format are stored: 32-bit floats, 16-bit floats or 8-bit integers '
+                                'scaled by the largest value of the file')
 
     arguments = parser.parse_args()
     if arguments.command:
@@ -112,239 +189,397 @@ def process_arguments(arguments: Namespace) -> None:
     print("INFO: Processing arguments")
 
     base_path = "output"
+    jobs = max(1, arguments.jobs)
+    chunk_size = max(0, arguments.chunk_size) * 1024 * 1024
 
     command = arguments.command
     if command == "convert":
         input_folder = arguments.input
         output_folder = arguments.output
-        converter_handler(base_path, input_folder, output_folder)
+        converter_handler(base_path, input_folder, output_folder, jobs, chunk_size)
     elif command == "combine":
         input_folder = arguments.input
         output_folder = arguments.output
         file_type = arguments.type
-        combiner_handler(base_path, input_folder, output_folder, file_type)
+        combiner_handler(base_path, input_folder, output_folder, file_type, jobs)
     elif command == "split":
         input_folder = arguments.input
         output_folder = arguments.output
-        splitter_handler(base_path, input_folder, output_folder)
+        ratio = arguments.ratio
+        seed = arguments.seed
+        splitter_handler(base_path, input_folder, output_folder, ratio, seed, jobs)
     elif command == "clean":
         input_folder = arguments.input
         output_folder = arguments.output
-        cleaner_handler(base_path, input_folder, output_folder)
+        in_place = arguments.in_place
+        cleaner_handler(base_path, input_folder, output_folder, in_place, jobs)
     elif command == "fill":
         input_folder = arguments.input
         label = arguments.label
         dimension = arguments.dimension
         position = arguments.position
-        filler_handler(base_path, input_folder, label, dimension, position)
+        filler_handler(base_path, input_folder, label, dimension, position, jobs)
     elif command == "generate":
         input_folder = arguments.input
         output_folder = arguments.output
         dimension = arguments.dimension
-        embeddings_generator_handler(base_path, input_folder, output_folder, dimension)
+        output_format = arguments.format
+        precision = arguments.precision
+        embeddings_generator_handler(base_path, input_folder, output_folder, dimension, output_format, precision, jobs)
     elif command == "columns":
         input_folder = arguments.input
         output_folder = arguments.output
-        columns_generator_handler(base_path, input_folder, output_folder)
+        columns_generator_handler(base_path, input_folder, output_folder, jobs, chunk_size)
     elif command == "remove-pos":
         input_folder = arguments.input
         output_folder = arguments.output
-        remove_pos_handler(base_path, input_folder, output_folder)
+        remove_pos_handler(base_path, input_folder, output_folder, jobs, chunk_size)
     elif command == "ttest":
         gold_a_folder = arguments.gold_a
         predicted_a_folder = arguments.predicted_a
         gold_b_folder = arguments.gold_b
         predicted_b_folder = arguments.predicted_b
-        ttest_handler(gold_a_folder, predicted_a_folder, gold_b_folder, predicted_b_folder)
+        use_cache = not arguments.no_cache
+        stream = arguments.stream
+        test = arguments.test
+        resamples = arguments.resamples
+        seed = arguments.seed
+        ttest_handler(gold_a_folder, predicted_a_folder, gold_b_folder, predicted_b_folder, jobs, use_cache, stream, test, resamples, seed)
+    elif command == "compare":
+        gold_folder = arguments.gold
+        systems = arguments.systems
+        output_folder = arguments.output
+        output_format = arguments.format
+        test = arguments.test
+        resamples = arguments.resamples
+        seed = arguments.seed
+        use_cache = not arguments.no_cache
+        stream = arguments.stream
+        compare_handler(base_path, gold_folder, systems, output_folder, output_format, jobs, use_cache, stream, test, resamples, seed)
     elif command == "swap":
         input_folder = arguments.input
         output_folder = arguments.output
         column_from = arguments.from_position
         column_to = arguments.to_position
-        swap_handler(base_path, input_folder, output_folder, column_from, column_to)
+        swap_handler(base_path, input_folder, output_folder, column_from, column_to, jobs, chunk_size)
     elif command == "remove-column":
         input_folder = arguments.input
         output_folder = arguments.output
         position = arguments.position
-        remove_column_handler(base_path, input_folder, output_folder, position)
+        remove_column_handler(base_path, input_folder, output_folder, position, jobs, chunk_size)
     elif command == "add-column":
         input_folder = arguments.input
         output_folder = arguments.output
         position = arguments.position
         content = arguments.content
-        add_column_handler(base_path, input_folder, output_folder, position, content)
+        add_column_handler(base_path, input_folder, output_folder, position, content, jobs, chunk_size)
     elif command == "empty-nodes":
         input_folder = arguments.input
         output_folder = arguments.output
-        empty_nodes_handler(base_path, input_folder, output_folder)
+        empty_nodes_handler(base_path, input_folder, output_folder, jobs)
     elif command == "enhanced-ud":
         keep_content = arguments.keep
         input_folder = arguments.input
         output_folder = arguments.output
-        enhanced_ud_handler(base_path, keep_content, input_folder, output_folder)
+        enhanced_ud_handler(base_path, keep_content, input_folder, output_folder, jobs, chunk_size)
     elif command == "extract":
         input_folder = arguments.input
         output_folder = arguments.output
         percentages = arguments.percentages
-        extract_handler(base_path, input_folder, output_folder, percentages)
+        extract_handler(base_path, input_folder, output_folder, percentages, jobs)
+    elif command == "pipeline":
+        input_folder = arguments.input
+        output_folder = arguments.output
+        steps = arguments.steps
+        pipeline_handler(base_path, input_folder, output_folder, steps, jobs, chunk_size)
+    elif command == "index":
+        input_folder = arguments.input
+        index_handler(base_path, input_folder, jobs)
+    elif command == "evaluate":
+        gold_folder = arguments.gold
+        predicted_folders = arguments.predicted
+        output_folder = arguments.output
+        output_format = arguments.format
+        evaluate_handler(base_path, gold_folder, predicted_folders, output_folder, output_format, jobs)
+    elif command == "vocab":
+        input_folder = arguments.input
+        output_folder = arguments.output
+        min_count = arguments.min_count
+        vocabulary_handler(base_path, input_folder, output_folder, min_count, jobs, chunk_size)
+    elif command == "convert-embeddings":
+        input_folder = arguments.input
+        output_folder = arguments.output
+        output_format = arguments.format
+        precision = arguments.precision
+        convert_embeddings_handler(base_path, input_folder, output_folder, output_format, precision, jobs)
     else:
         print(f"Error: Command {command} is not recognised")
 
 
 FOLDERS_ERROR_MESSAGE = "Error: Check that the arguments are folders and not files, and that the folders exist"
 FOLDER_ERROR_MESSAGE = "Error: Check that the argument is a folder and not a file, and that the folder exists"
+PRECISION_ERROR_MESSAGE = "Error: The precision can only be changed in the binary format"
 
 
-def converter_handler(base_path: str, input_folder: str, output_folder: str) -> None:
+def converter_handler(base_path: str, input_folder: str, output_folder: str, jobs: int, chunk_size: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        converter.walk_directories(input_path, output_path)
+        converter.walk_directories(input_path, output_path, jobs, chunk_size)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def combiner_handler(base_path: str, input_folder: str, output_folder: str, file_type: str) -> None:
+def combiner_handler(base_path: str, input_folder: str, output_folder: str, file_type: str, jobs: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        combiner.walk_directories(input_path, output_path, file_type)
+        combiner.walk_directories(input_path, output_path, file_type, jobs)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def splitter_handler(base_path: str, input_folder: str, output_folder: str) -> None:
+def splitter_handler(base_path: str, input_folder: str, output_folder: str, ratio: float, seed: Any, jobs: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
-    if input_path.is_dir() and output_path.is_dir():
-        splitter.walk_directories(input_path, output_path)
+    if not 0 < ratio < 1:
+        print("Error: The ratio must be greater than 0 and less than 1")
+    elif input_path.is_dir() and output_path.is_dir():
+        splitter.walk_directories(input_path, output_path, ratio, seed, jobs)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def cleaner_handler(base_path: str, input_folder: str, output_folder: str) -> None:
+def cleaner_handler(base_path: str, input_folder: str, output_folder: Any, in_place: bool, jobs: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
-    output_path = Path(base_path).joinpath(output_folder)
 
-    if input_path.is_dir() and output_path.is_dir():
-        cleaner.walk_directories(input_path, output_path)
+    if in_place:
+        if input_path.is_dir():
+            cleaner.walk_directories(input_path, None, in_place, jobs)
+        else:
+            print(FOLDER_ERROR_MESSAGE)
+    elif output_folder is None:
+        print("Error: The output folder is required unless the files are cleaned in place")
     else:
-        print(FOLDERS_ERROR_MESSAGE)
+        output_path = Path(base_path).joinpath(output_folder)
+        if input_path.is_dir() and output_path.is_dir():
+            cleaner.walk_directories(input_path, output_path, in_place, jobs)
+        else:
+            print(FOLDERS_ERROR_MESSAGE)
 
 
-def filler_handler(base_path: str, input_folder: str, label: str, dimension: int, position: Any) -> None:
+def filler_handler(base_path: str, input_folder: str, label: str, dimension: int, position: Any, jobs: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
 
     if input_path.is_dir():
         if filler.validate_parameters(label):
-            filler.walk_directories(input_path, label, dimension, position)
+            filler.walk_directories(input_path, label, dimension, position, jobs)
         else:
             print("Error: The label may only contain letters")
     else:
         print(FOLDER_ERROR_MESSAGE)
 
 
-def embeddings_generator_handler(base_path: str, input_folder: str, output_folder: str, dimension: int) -> None:
+def embeddings_generator_handler(base_path: str, input_folder: str, output_folder: str, dimension: int, output_format: str,
+                                 precision: str, jobs: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
-    if input_path.is_dir() and output_path.is_dir():
-        embeddings_generator.walk_directories(input_path, output_path, dimension)
+    if output_format == 'text' and precision != 'float32':
+        print(PRECISION_ERROR_MESSAGE)
+    elif input_path.is_dir() and output_path.is_dir():
+        embeddings_generator.walk_directories(input_path, output_path, dimension, output_format, precision, jobs)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def columns_generator_handler(base_path: str, input_folder: str, output_folder: str) -> None:
+def columns_generator_handler(base_path: str, input_folder: str, output_folder: str, jobs: int, chunk_size: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        columns_generator.walk_directories(input_path, output_path)
+        columns_generator.walk_directories(input_path, output_path, jobs, chunk_size)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def remove_pos_handler(base_path: str, input_folder: str, output_folder: str) -> None:
+def remove_pos_handler(base_path: str, input_folder: str, output_folder: str, jobs: int, chunk_size: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        remove_pos.walk_directories(input_path, output_path)
+        remove_pos.walk_directories(input_path, output_path, jobs, chunk_size)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def ttest_handler(gold_a_folder: str, predicted_a_folder: str, gold_b_folder: str, predicted_b_folder: str) -> None:
+def ttest_handler(gold_a_folder: str, predicted_a_folder: str, gold_b_folder: str, predicted_b_folder: str, jobs: int,
+                  use_cache: bool, stream: bool, test: str, resamples: int, seed: Any) -> None:
     gold_a_path = Path.home().joinpath(gold_a_folder)
     predicted_a_path = Path.home().joinpath(predicted_a_folder)
     gold_b_path = Path.home().joinpath(gold_b_folder)
     predicted_b_path = Path.home().joinpath(predicted_b_folder)
 
-    if gold_a_path.is_dir() and predicted_a_path.is_dir() and gold_b_path.is_dir() and predicted_b_path.is_dir():
-        calculate_ttest.walk_directories(gold_a_path, predicted_a_path, gold_b_path, predicted_b_path)
+    if resamples < 1:
+        print("Error: The number of resamples must be greater than 0")
+    elif gold_a_path.is_dir() and predicted_a_path.is_dir() and gold_b_path.is_dir() and predicted_b_path.is_dir():
+        calculate_ttest.walk_directories(gold_a_path, predicted_a_path, gold_b_path, predicted_b_path, jobs, use_cache, stream, test,
+                                         resamples, seed)
+    else:
+        print(FOLDERS_ERROR_MESSAGE)
+
+
+def compare_handler(base_path: str, gold_folder: str, systems: List[str], output_folder: str, output_format: str, jobs: int,
+                    use_cache: bool, stream: bool, test: str, resamples: int, seed: Any) -> None:
+    gold_path = Path.home().joinpath(gold_folder)
+    output_path = Path(base_path).joinpath(output_folder)
+
+    system_paths = {}
+    for system in systems:
+        name, separator, system_folder = system.partition("=")
+        if not separator or not name or not system_folder:
+            print(f"Error: The system {system} must be given as NAME=FOLDER")
+            return
+        if name in system_paths:
+            print(f"Error: The name {name} is used by more than one system")
+            return
+        system_paths[name] = Path.home().joinpath(system_folder)
+
+    if len(system_paths) < 2:
+        print("Error: At least two systems are needed to compare them")
+    elif resamples < 1:
+        print("Error: The number of resamples must be greater than 0")
+    elif gold_path.is_dir() and all(system_path.is_dir() for system_path in system_paths.values()) and output_path.is_dir():
+        calculate_ttest.compare_directories(gold_path, system_paths, output_path, output_format, jobs, use_cache, stream, test, resamples,
+                                            seed)
+    else:
+        print(FOLDERS_ERROR_MESSAGE)
+
+
+def swap_handler(base_path: str, input_folder: str, output_folder: str, column_from: int, column_to: int, jobs: int,
+                 chunk_size: int) -> None:
+    input_path = Path(base_path).joinpath(input_folder)
+    output_path = Path(base_path).joinpath(output_folder)
+
+    if input_path.is_dir() and output_path.is_dir():
+        columns_swapper.walk_directories(input_path, output_path, column_from, column_to, jobs, chunk_size)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def swap_handler(base_path: str, input_folder: str, output_folder: str, column_from: int, column_to: int) -> None:
+def remove_column_handler(base_path: str, input_folder: str, output_folder: str, position: int, jobs: int, chunk_size: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        columns_swapper.walk_directories(input_path, output_path, column_from, column_to)
+        column_remover.walk_directories(input_path, output_path, position, jobs, chunk_size)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def remove_column_handler(base_path: str, input_folder: str, output_folder: str, position: int) -> None:
+def add_column_handler(base_path: str, input_folder: str, output_folder: str, position: int, content: str, jobs: int,
+                       chunk_size: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        column_remover.walk_directories(input_path, output_path, position)
+        column_inserter.walk_directories(input_path, output_path, position, content, jobs, chunk_size)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def add_column_handler(base_path: str, input_folder: str, output_folder: str, position: int, content: str) -> None:
+def empty_nodes_handler(base_path: str, input_folder: str, output_folder: str, jobs: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        column_inserter.walk_directories(input_path, output_path, position, content)
+        empty_nodes.walk_directories(input_path, output_path, jobs)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def empty_nodes_handler(base_path: str, input_folder: str, output_folder: str) -> None:
+def enhanced_ud_handler(base_path: str, keep_content: bool, input_folder: str, output_folder: str, jobs: int, chunk_size: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        empty_nodes.walk_directories(input_path, output_path)
+        ud_enhancer.walk_directories(input_path, output_path, keep_content, jobs, chunk_size)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def enhanced_ud_handler(base_path: str, keep_content: bool, input_folder: str, output_folder: str) -> None:
+def extract_handler(base_path: str, input_folder: str, output_folder: str, percentages: List[int], jobs: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
     if input_path.is_dir() and output_path.is_dir():
-        ud_enhancer.walk_directories(input_path, output_path, keep_content)
+        extractor.walk_directories(input_path, output_path, percentages, jobs)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
 
-def extract_handler(base_path: str, input_folder: str, output_folder: str, percentages: List[int]) -> None:
+def pipeline_handler(base_path: str, input_folder: str, output_folder: str, steps_description: str, jobs: int, chunk_size: int) -> None:
     input_path = Path(base_path).joinpath(input_folder)
     output_path = Path(base_path).joinpath(output_folder)
 
+    try:
+        steps = pipeline.parse_steps(steps_description)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return
+
     if input_path.is_dir() and output_path.is_dir():
-        extractor.walk_directories(input_path, output_path, percentages)
+        rename = converter.convert_line in steps
+        pipeline.walk_directories(input_path, output_path, steps, rename, jobs, chunk_size)
+    else:
+        print(FOLDERS_ERROR_MESSAGE)
+
+
+def index_handler(base_path: str, input_folder: str, jobs: int) -> None:
+    input_path = Path(base_path).joinpath(input_folder)
+
+    if input_path.is_dir():
+        indexer.walk_directories(input_path, jobs)
+    else:
+        print(FOLDER_ERROR_MESSAGE)
+
+
+def evaluate_handler(base_path: str, gold_folder: str, predicted_folders: List[str], output_folder: str, output_format: str,
+                     jobs: int) -> None:
+    gold_path = Path.home().joinpath(gold_folder)
+    predicted_paths = [Path.home().joinpath(predicted_folder) for predicted_folder in predicted_folders]
+    output_path = Path(base_path).joinpath(output_folder)
+
+    if gold_path.is_dir() and all(predicted_path.is_dir() for predicted_path in predicted_paths) and output_path.is_dir():
+        evaluator.walk_directories(gold_path, predicted_paths, output_path, output_format, jobs)
+    else:
+        print(FOLDERS_ERROR_MESSAGE)
+
+
+def vocabulary_handler(base_path: str, input_folder: str, output_folder: str, min_count: int, jobs: int, chunk_size: int) -> None:
+    input_path = Path(base_path).joinpath(input_folder)
+    output_path = Path(base_path).joinpath(output_folder)
+
+    if min_count < 1:
+        print("Error: The minimum count must be at least 1")
+    elif input_path.is_dir() and output_path.is_dir():
+        vocabulary.walk_directories(input_path, output_path, min_count, jobs, chunk_size)
+    else:
+        print(FOLDERS_ERROR_MESSAGE)
+
+
+def convert_embeddings_handler(base_path: str, input_folder: str, output_folder: str, output_format: str, precision: str,
+                               jobs: int) -> None:
+    input_path = Path(base_path).joinpath(input_folder)
+    output_path = Path(base_path).joinpath(output_folder)
+
+    if output_format == 'text' and precision != 'float32':
+        print(PRECISION_ERROR_MESSAGE)
+    elif input_path.is_dir() and output_path.is_dir():
+        embeddings_converter.walk_directories(input_path, output_path, output_format, precision, jobs)
     else:
         print(FOLDERS_ERROR_MESSAGE)
 
@@ -1,29 +1,146 @@
 # -*- coding: utf-8 -*-
 
-from io import StringIO
+import csv
+import json
+from functools import lru_cache
+from itertools import combinations
 from pathlib import Path
 from re import search
-from typing import List, Tuple, Dict
+from tempfile import TemporaryDirectory
+from typing import Any, List, Optional, Tuple, Dict
 
+import numpy
 from scipy.stats import ttest_ind
 
-from modules.conll18_ud_eval import load_conllu, evaluate
+from modules.conll18_ud_eval import UDArrays, load_conllu_file, evaluate_sentences, evaluate_sentences_arrays, evaluate_stream_sentences
+from modules.score_cache import evict_scores, get_cache_file, load_scores, save_scores
+from modules.shared_gold import load_shared_gold, share_gold_files
+from modules.utils import run_tasks
 
+GOLD_PATTERN = '\\-test\\.conll$'
+PREDICTED_PATTERN = '\\-predicted-test\\.conll$'
+
+COMPARISON_COLUMNS = ['model', 'metric', 'system_a', 'system_b', 'statistic', 'p_value']
 
-def walk_directories(gold_a_path: Path, predicted_a_path: Path, gold_b_path: Path, predicted_b_path: Path) -> None:
-    print("INFO: Browsing through directories to calculate the T-Test")
 
-    gold_pattern = '\\-test\\.conll$'
-    predited_pattern = '\\-predicted-test\\.conll$'
+def walk_directories(gold_a_path: Path, predicted_a_path: Path, gold_b_path: Path, predicted_b_path: Path, jobs: int = 1,
+                     use_cache: bool = True, stream: bool = False, test: str = 'ttest', resamples: int = 10000,
+                     seed: Optional[int] = None) -> None:
+    print("INFO: Browsing through directories to calculate the T-Test")
 
-    gold_a_files = walk_directory(gold_a_path, gold_pattern)
-    predicted_a_files = walk_directory(predicted_a_path, predited_pattern)
-    gold_b_files = walk_directory(gold_b_path, gold_pattern)
-    predicted_b_files = walk_directory(predicted_b_path, predited_pattern)
+    gold_a_files = walk_directory(gold_a_path, GOLD_PATTERN)
+    predicted_a_files = walk_directory(predicted_a_path, PREDICTED_PATTERN)
+    gold_b_files = walk_directory(gold_b_path, GOLD_PATTERN)
+    predicted_b_files = walk_directory(predicted_b_path, PREDICTED_PATTERN)
 
     parser_a_values = (gold_a_files, predicted_a_files)
     parser_b_values = (gold_b_files, predicted_b_files)
-    ttest(parser_a_values, parser_b_values)
+    ttest(parser_a_values, parser_b_values, jobs, use_cache, stream, test, resamples, seed)
+
+
+def compare_directories(gold_path: Path, system_paths: Dict[str, Path], output_path: Path, output_format: str, jobs: int = 1,
+                        use_cache: bool = True, stream: bool = False, test: str = 'ttest', resamples: int = 10000,
+                        seed: Optional[int] = None) -> None:
+    print("INFO: Browsing through directories to compare the systems")
+
+    # Only one GOLD file per language is expected, and all the systems are evaluated against it
+    gold_files = {}
+    for gold_group in walk_directory(gold_path, GOLD_PATTERN):
+        gold_files[get_language(gold_group, gold_path, gold_path.name)] = gold_group[0]
+
+    # The predicted files of each system are evaluated once, and all the pairs of systems are compared with the same values
+    tasks = []
+    task_systems = []
+    for system, system_path in system_paths.items():
+        for predicted_group in walk_directory(system_path, PREDICTED_PATTERN):
+            language = get_language(predicted_group, system_path, gold_path.name)
+            if language in gold_files:
+                gold_file = gold_files[language]
+                for predicted_file in predicted_group:
+                    tasks.append((predicted_file, language, gold_file, get_task_cache_file(gold_file, predicted_file, use_cache), stream))
+                    task_systems.append(system)
+            else:
+                print(f"Error: There is no gold file for the language {language} of the system {system}")
+    for language in sorted(gold_files.keys() - {task[1] for task in tasks}):
+        print(f"WARNING: There are no predicted files for the language {language} of the gold files")
+
+    with TemporaryDirectory() as shared_path:
+        results = run_tasks(evaluate_model, share_gold(tasks, Path(shared_path), jobs), jobs)
+        load_gold_file.cache_clear()
+        load_shared_gold.cache_clear()
+    if use_cache:
+        evict_scores()
+
+    # The values of the models of each system, by language and in the order of their files
+    language_values = {}
+    for system, (_, language, *_), result in zip(task_systems, tasks, results):
+        language_values.setdefault(language, {}).setdefault(system, []).append(result)
+
+    # A single generator for all the tests, so a run with the same seed gives the same values
+    generator = numpy.random.default_rng(seed)
+    for language, system_values in language_values.items():
+        rows = compare_systems(system_values, test, resamples, generator)
+        write_comparison(output_path.joinpath(f"{language}.{output_format}"), rows, output_format)
+
+
+def compare_systems(system_values: Dict[str, List[Optional[Tuple[List[float], List[float]]]]], test: str, resamples: int,
+                    generator: numpy.random.Generator) -> List[Dict[str, Any]]:
+    # Each pair of systems is tested once, the opposite pair has the same p-value and the opposite statistic
+    rows = []
+    models = max(len(values) for values in system_values.values())
+    for model in range(models):
+        for metric_index, metric in enumerate(['UAS', 'LAS']):
+            matrix = {}
+            for system_a, system_b in combinations(system_values, 2):
+                values_a = get_model_values(system_values[system_a], model)
+                values_b = get_model_values(system_values[system_b], model)
+                if values_a is None or values_b is None:
+                    continue
+                if test != 'ttest' and len(values_a[metric_index]) != len(values_b[metric_index]):
+                    print(f"ERROR: The paired tests need the same sentences for both systems. {system_a} "
+                          f"({len(values_a[metric_index])} sentences) vs. {system_b} ({len(values_b[metric_index])} sentences)")
+                    continue
+                try:
+                    statistic, pvalue = significance_test(values_a[metric_index], values_b[metric_index], test, resamples, generator)
+                except ValueError as error:
+                    print(f"ERROR: {error} between {system_a} and {system_b}")
+                    continue
+                matrix[(system_a, system_b)] = (float(statistic), float(pvalue))
+                matrix[(system_b, system_a)] = (-float(statistic), float(pvalue))
+
+            for system_a in system_values:
+                for system_b in system_values:
+                    if (system_a, system_b) in matrix:
+                        statistic, pvalue = matrix[(system_a, system_b)]
+                        rows.append({'model': model + 1, 'metric': metric, 'system_a': system_a, 'system_b': system_b,
+                                     'statistic': statistic, 'p_value': pvalue})
+
+    return rows
+
+
+def get_language(files: List[Path], files_path: Path, root_language: str) -> str:
+    # The files directly inside the GOLD folder and the ones directly inside a system folder are the same language, named after the GOLD
+    # folder, and the files of a subfolder are the language of the subfolder
+    return root_language if files[0].parent == files_path else files[0].parent.name
+
+
+def get_model_values(model_values: List[Optional[Tuple[List[float], List[float]]]],
+                     model: int) -> Optional[Tuple[List[float], List[float]]]:
+    # A system may have less models than the others, and a model whose evaluation failed has already been reported
+    return model_values[model] if model < len(model_values) else None
+
+
+def write_comparison(output_file: Path, rows: List[Dict[str, Any]], output_format: str) -> None:
+    print(f"INFO: Writing the comparison of the systems to {output_file}")
+
+    with open(output_file, 'wt', encoding='UTF-8', newline='') as table:
+        if output_format == 'json':
+            json.dump(rows, table, indent=2)
+            table.write("\n")
+        else:
+            writer = csv.DictWriter(table, fieldnames=COMPARISON_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
 
 
 def walk_directory(files_path: Path, file_pattern: str) -> List[List[Path]]:
@@ -54,73 +171,156 @@ def walk_directory(files_path: Path, file_pattern: str) -> List[List[Path]]:
     return all_files
 
 
-def ttest(parser_a_values: Tuple[List[List[Path]], List[List[Path]]], parser_b_values: Tuple[List[List[Path]], List[List[Path]]]) -> None:
+def ttest(parser_a_values: Tuple[List[List[Path]], List[List[Path]]], parser_b_values: Tuple[List[List[Path]], List[List[Path]]],
+          jobs: int = 1, use_cache: bool = True, stream: bool = False, test: str = 'ttest', resamples: int = 10000,
+          seed: Optional[int] = None) -> None:
     print("INFO: Processing the data for the T-Test")
+    print(f"INFO: Processing the parser files")
 
-    parser_a_uas_las_values = process_parser_files(parser_a_values)
-    parser_b_uas_las_values = process_parser_files(parser_b_values)
-    calculate_ttest_value(parser_a_uas_las_values, parser_b_uas_las_values)
+    # The evaluations of both parsers are independent, so they are sent together to the pool of processes
+    parser_a_tasks = get_parser_tasks(parser_a_values, use_cache, stream)
+    parser_b_tasks = get_parser_tasks(parser_b_values, use_cache, stream)
+    with TemporaryDirectory() as shared_path:
+        tasks = share_gold(parser_a_tasks + parser_b_tasks, Path(shared_path), jobs)
+        results = run_tasks(evaluate_model, tasks, jobs)
+        load_gold_file.cache_clear()
+        load_shared_gold.cache_clear()
+    if use_cache:
+        evict_scores()
 
+    parser_a_uas_las_values = group_values(parser_a_tasks, results[:len(parser_a_tasks)])
+    parser_b_uas_las_values = group_values(parser_b_tasks, results[len(parser_a_tasks):])
+    calculate_ttest_value(parser_a_uas_las_values, parser_b_uas_las_values, test, resamples, seed)
 
-def process_parser_files(parser_values: Tuple[List[List[Path]], List[List[Path]]]) -> Dict[str, Dict[str, Tuple[List[float], List[float]]]]:
-    print(f"INFO: Processing the parser files")
 
+def get_parser_tasks(parser_values: Tuple[List[List[Path]], List[List[Path]]], use_cache: bool = True,
+                     stream: bool = False) -> List[Tuple[Path, str, Path, Optional[Path], bool]]:
     gold_groups, predicted_groups = parser_values
     # Only one GOLD file per language is expected. For the predicted files of each language
     # it is possible to pass several files generated by different models.
-    language_values = {}
+    tasks = []
     for gold_group, predicted_group in zip(gold_groups, predicted_groups):
         gold_file = gold_group[0]
         gold_language = gold_file.parent.name
         predicted_language = predicted_group[0].parent.name
 
         if gold_language == predicted_language:
-            models_values = {}
             for predicted_file in predicted_group:
-                gold_list = file_to_list(gold_file)
-                predicted_list = file_to_list(predicted_file)
-                uas_values, las_values = get_uas_las_values(gold_language, gold_list, predicted_list)
-                models_values[predicted_file.stem] = (uas_values, las_values)
-
-            language_values[gold_language] = models_values
+                tasks.append((predicted_file, gold_language, gold_file, get_task_cache_file(gold_file, predicted_file, use_cache), stream))
         else:
             print(f"Error: Gold language ({gold_language}) does not match with predicted language ({predicted_language})")
 
+    return tasks
+
+
+def get_task_cache_file(gold_file: Path, predicted_file: Path, use_cache: bool = True) -> Optional[Path]:
+    # The files are hashed once here and the cache file is sent with the task, as the workers do not share the memoized hashes
+    return get_cache_file(gold_file, predicted_file, ['UAS', 'LAS']) if use_cache else None
+
+
+def share_gold(tasks: List[Tuple[Path, str, Path, Optional[Path], bool]], shared_path: Path,
+               jobs: int) -> List[Tuple[Path, str, Path, Optional[Path], bool, Optional[Path]]]:
+    # With several workers, the GOLD files are parsed once by the pool and mapped into memory by the workers instead of being parsed by
+    # each one of them. Only the GOLD files of the models without cached values are needed, and streaming does not load the whole GOLD
+    # files.
+    gold_files = []
+    if jobs > 1:
+        gold_files = [gold_file for _, _, gold_file, cache_file, stream in tasks
+                      if not stream and not (cache_file is not None and cache_file.exists())]
+    shared_folders = share_gold_files(gold_files, shared_path, jobs)
+
+    return [task + (shared_folders.get(task[2]),) for task in tasks]
+
+
+def group_values(tasks: List[Tuple[Path, str, Path, Optional[Path], bool]],
+                 results: List[Any]) -> Dict[str, Dict[str, Tuple[List[float], List[float]]]]:
+    # The results come back in the order of the tasks, so the languages and models keep the order of the folders
+    language_values = {}
+    for (predicted_file, language, *_), result in zip(tasks, results):
+        models_values = language_values.setdefault(language, {})
+        # A model whose evaluation failed has already been reported and is left out
+        if result is not None:
+            models_values[predicted_file.stem] = result
+
     return language_values
 
 
-def file_to_list(test_file: Path) -> List[str]:
-    print(f"INFO: Converting the file {test_file.name} into a list")
+def evaluate_model(predicted_file: Path, language: str, gold_file: Path, cache_file: Optional[Path] = None, stream: bool = False,
+                   shared_gold: Optional[Path] = None) -> Tuple[List[float], List[float]]:
+    if cache_file is not None:
+        scores = load_scores(cache_file)
+        if scores is not None:
+            print(f"INFO: Using the cached UAS and LAS values of the file {predicted_file.name}")
+            return scores['UAS'], scores['LAS']
+
+    if stream:
+        uas_values, las_values = stream_uas_las_values(language, gold_file, predicted_file)
+    else:
+        gold_ud = load_gold_file(gold_file) if shared_gold is None else load_shared_gold(shared_gold)
+        predicted_ud = load_file(predicted_file)
+        uas_values, las_values = get_uas_las_values(language, gold_ud, predicted_ud)
+    if cache_file is not None:
+        save_scores(cache_file, {'UAS': uas_values, 'LAS': las_values})
+
+    return uas_values, las_values
+
+
+@lru_cache(maxsize=4)
+def load_gold_file(gold_file: Path) -> Any:
+    # The GOLD file is loaded once per process and shared by all the models of the language
+    return load_conllu_file(gold_file)
 
-    with open(test_file) as file:
-        sentences = file.read().split('\n\n')
 
-    return sentences
+def load_file(test_file: Path) -> Any:
+    print(f"INFO: Loading the file {test_file.name}")
 
+    return load_conllu_file(test_file)
 
-def get_uas_las_values(language: str, gold_list: List[str], predicted_list: List[str]) -> Tuple[List[float], List[float]]:
+
+def get_uas_las_values(language: str, gold_ud: Any, predicted_ud: Any) -> Tuple[List[float], List[float]]:
     print(f"INFO: Calculating the UAS and LAS values for each sentence in language {language}")
 
+    # Only the metrics needed by the T-test are computed, a shared GOLD file straight from its memory-mapped arrays
+    if isinstance(gold_ud, UDArrays):
+        scores = evaluate_sentences_arrays(gold_ud, predicted_ud, metrics=['UAS', 'LAS'])
+    else:
+        scores = evaluate_sentences(gold_ud, predicted_ud, metrics=['UAS', 'LAS'])
+    uas_values = [score.f1 * 100 for score in scores['UAS']]
+    las_values = [score.f1 * 100 for score in scores['LAS']]
+
+    return uas_values, las_values
+
+
+def stream_uas_las_values(language: str, gold_file: Path, predicted_file: Path) -> Tuple[List[float], List[float]]:
+    print(f"INFO: Calculating the UAS and LAS values for each sentence in language {language} reading {predicted_file.name} as a stream")
+
+    # Only the sentences until the next boundary common to both files are kept in memory
     uas_values = []
     las_values = []
-    for gold_sentence, predicted_sentence in zip(gold_list, predicted_list):
-        gold_temp = StringIO(gold_sentence + '\n\n')
-        predicted_temp = StringIO(predicted_sentence + '\n\n')
-        gold_ud = load_conllu(gold_temp)
-        output_ud = load_conllu(predicted_temp)
-        score = evaluate(gold_ud, output_ud)
-        uas = score['UAS'].f1 * 100
-        las = score['LAS'].f1 * 100
-        uas_values.append(uas)
-        las_values.append(las)
+    with open(gold_file, 'rt', encoding='UTF-8') as gold, open(predicted_file, 'rt', encoding='UTF-8') as predicted:
+        for scores in evaluate_stream_sentences(gold, predicted, metrics=['UAS', 'LAS']):
+            uas_values.append(scores['UAS'].f1 * 100)
+            las_values.append(scores['LAS'].f1 * 100)
 
     return uas_values, las_values
 
 
+# Number of values of each block of resamples, so the memory used by the bootstrap and permutation tests does not grow with the number
+# of resamples
+RESAMPLES_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Name of the statistic printed for each test
+TEST_STATISTICS = {'ttest': "t-statistic", 'bootstrap': "mean difference", 'permutation': "mean difference"}
+
+
 def calculate_ttest_value(parser_a_uas_las_values: Dict[str, Dict[str, Tuple[List[float], List[float]]]],
-                          parser_b_uas_las_values: Dict[str, Dict[str, Tuple[List[float], List[float]]]]) -> None:
-    print(f"INFO: Calculating the T-test values")
+                          parser_b_uas_las_values: Dict[str, Dict[str, Tuple[List[float], List[float]]]], test: str = 'ttest',
+                          resamples: int = 10000, seed: Optional[int] = None) -> None:
+    print(f"INFO: Calculating the {'T-test' if test == 'ttest' else f'paired {test} test'} values")
 
+    # A single generator for all the tests, so a run with the same seed gives the same values
+    generator = numpy.random.default_rng(seed)
+    statistic = TEST_STATISTICS[test]
     for (language_a, predicted_a), (language_b, predicted_b) in zip(parser_a_uas_las_values.items(), parser_b_uas_las_values.items()):
         if language_a == language_b:
             if len(predicted_a) == len(predicted_b):
@@ -129,11 +329,21 @@ def calculate_ttest_value(parser_a_uas_las_values: Dict[str, Dict[str, Tuple[Lis
                 for sentences_a, sentences_b in zip(predicted_a.values(), predicted_b.values()):
                     parser_a_uas, parser_a_las = sentences_a
                     parser_b_uas, parser_b_las = sentences_b
-                    tstatistic_uas, pvalue_uas = ttest_ind(parser_a_uas, parser_b_uas)
-                    tstatistic_las, pvalue_las = ttest_ind(parser_a_las, parser_b_las)
+                    if test != 'ttest' and len(parser_a_uas) != len(parser_b_uas):
+                        print(f"ERROR: The paired tests need the same sentences for both parsers. Parser A ({len(parser_a_uas)} sentences) "
+                              f"vs. Parser B ({len(parser_b_uas)} sentences)")
+                        index += 1
+                        continue
+                    try:
+                        statistic_uas, pvalue_uas = significance_test(parser_a_uas, parser_b_uas, test, resamples, generator)
+                        statistic_las, pvalue_las = significance_test(parser_a_las, parser_b_las, test, resamples, generator)
+                    except ValueError as error:
+                        print(f"ERROR: {error} for the predicted file #{index}")
+                        index += 1
+                        continue
                     print(
-                        f"(#{index}) t-statistic UAS: {tstatistic_uas:.2f}\tp-value UAS: {pvalue_uas:.2f}\t|\t(#{index}) t-statistic LAS: "
-                        f"{tstatistic_las:.2f}\tp-value LAS: {pvalue_las:.2f}")
+                        f"(#{index}) {statistic} UAS: {statistic_uas:.2f}\tp-value UAS: {pvalue_uas:.2f}\t|\t(#{index}) {statistic} LAS: "
+                        f"{statistic_las:.2f}\tp-value LAS: {pvalue_las:.2f}")
                     index += 1
             else:
                 print(f"ERROR: Only parsers with the same number of predicted files can be compared. Parser A ({len(predicted_a)} files) "
@@ -143,6 +353,64 @@ def calculate_ttest_value(parser_a_uas_las_values: Dict[str, Dict[str, Tuple[Lis
                   f"languages to compare.")
 
 
+def significance_test(values_a: List[float], values_b: List[float], test: str, resamples: int,
+                      generator: numpy.random.Generator) -> Tuple[float, float]:
+    if test == 'bootstrap':
+        return paired_bootstrap_test(values_a, values_b, resamples, generator)
+    if test == 'permutation':
+        return permutation_test(values_a, values_b, resamples, generator)
+
+    return ttest_ind(values_a, values_b)
+
+
+def paired_bootstrap_test(values_a: List[float], values_b: List[float], resamples: int,
+                          generator: numpy.random.Generator) -> Tuple[float, float]:
+    # Each row of the index matrix is a resample of the sentences with replacement. The p-value is the fraction of resamples whose mean
+    # difference is at least as far from the observed one as the observed one is from zero (two-sided), with a small tolerance so
+    # the resamples equal to the observed difference are not lost to rounding errors. As in the permutation test, one is added to both
+    # counts so the p-value is never zero.
+    differences = get_differences(values_a, values_b)
+    observed = differences.mean()
+    extreme = 0
+    for block in resample_blocks(resamples, len(differences)):
+        indices = generator.integers(0, len(differences), size=(block, len(differences)))
+        means = differences[indices].mean(axis=1)
+        extreme += numpy.count_nonzero(numpy.abs(means - observed) >= abs(observed) - 1e-9)
+
+    return observed, (extreme + 1) / (resamples + 1)
+
+
+def permutation_test(values_a: List[float], values_b: List[float], resamples: int,
+                     generator: numpy.random.Generator) -> Tuple[float, float]:
+    # Approximate randomization: each row of the matrix swaps the scores of both parsers for a random subset of the sentences, which
+    # changes the sign of their differences. The mean of a row is (sum - 2 * swapped differences) / sentences.
+    differences = get_differences(values_a, values_b)
+    observed = differences.mean()
+    total = differences.sum()
+    extreme = 0
+    for block in resample_blocks(resamples, len(differences)):
+        # Random bits unpacked from random bytes, which is faster than drawing each bit as an integer
+        swaps = numpy.unpackbits(generator.integers(0, 256, size=(block, (len(differences) + 7) // 8), dtype=numpy.uint8), axis=1,
+                                 count=len(differences)).astype(numpy.float64)
+        means = (total - 2 * (swaps @ differences)) / len(differences)
+        extreme += numpy.count_nonzero(numpy.abs(means) >= abs(observed) - 1e-9)
+
+    return observed, (extreme + 1) / (resamples + 1)
+
+
+def get_differences(values_a: List[float], values_b: List[float]) -> numpy.ndarray:
+    # Without sentences there is nothing to resample, and the observed difference would be NaN
+    if not len(values_a) or not len(values_b):
+        raise ValueError("There are no sentences to compare")
+
+    return numpy.asarray(values_a, dtype=numpy.float64) - numpy.asarray(values_b, dtype=numpy.float64)
+
+
+def resample_blocks(resamples: int, sentences: int) -> List[int]:
+    block_size = max(1, RESAMPLES_BLOCK_SIZE // max(1, sentences))
+    return [min(block_size, resamples - start) for start in range(0, resamples, block_size)]
+
+
 def print_header(language: str, row_length: int) -> None:
     letters = len(language)
     separation = 2  # A separation space for each side
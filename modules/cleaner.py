@@ -1,23 +1,32 @@
 # -*- coding: utf-8 -*-
 
 from pathlib import Path
-from typing import List
+from shutil import copyfile, copyfileobj
+from typing import List, Optional
 
-from .utils import search_files
+from .embeddings_format import get_embeddings_files, get_scale_file, get_words_file, is_binary_file, is_header, load_matrix
+from .utils import search_files, run_tasks
 
+# Size of the blocks in which the rest of the file is copied after the first line
+COPY_BLOCK_SIZE = 16 * 1024 * 1024
 
-def walk_directories(input_path: Path, output_path: Path) -> None:
+
+def walk_directories(input_path: Path, output_path: Optional[Path], in_place: bool = False, jobs: int = 1) -> None:
     print("INFO: Browsing through directories to clean")
 
     input_path_name = input_path.name
-    files = search_files(input_path)
+    files = get_embeddings_files(search_files(input_path))
 
-    clean_files(files, input_path_name, output_path)
+    if in_place:
+        clean_files_in_place(files, jobs)
+    else:
+        clean_files(files, input_path_name, output_path, jobs)
 
 
-def clean_files(files: List[Path], input_path_name: str, output_path: Path) -> None:
+def clean_files(files: List[Path], input_path_name: str, output_path: Path, jobs: int = 1) -> None:
     print("INFO: Cleaning files")
 
+    tasks = []
     for file in files:
         name = file.name
         file_folder_name = file.parent.name
@@ -27,25 +36,82 @@ def clean_files(files: List[Path], input_path_name: str, output_path: Path) -> N
             output_file = file_folder.joinpath(name)
         else:
             output_file = output_path.joinpath(name)
-        clean_file(file, output_file)
+        tasks.append((file, output_file))
+
+    run_tasks(clean_file, tasks, jobs)
+
+
+def clean_files_in_place(files: List[Path], jobs: int = 1) -> None:
+    print("INFO: Cleaning files in place")
+
+    tasks = [(file,) for file in files]
+    run_tasks(clean_file_in_place, tasks, jobs)
 
 
 def clean_file(input_file: Path, output_file: Path) -> None:
+    if is_binary_file(input_file):
+        clean_binary_file(input_file, output_file)
+    else:
+        clean_text_file(input_file, output_file)
+
+
+def clean_text_file(input_file: Path, output_file: Path) -> None:
     print(f"INFO: Cleaning {input_file} file to {output_file} file")
 
-    with open(input_file, 'rt', encoding='UTF-8', errors="replace") as dirty, open(output_file, 'wt', encoding='UTF-8',
-                                                                                   errors="replace") as clean:
-        for line in dirty:
-            tuples = line.split()
-            if len(tuples) == 2 and is_a_number(tuples[0]) and is_a_number(tuples[1]):
-                continue
-            else:
-                clean.write(line)
-
-
-def is_a_number(number: str) -> bool:
-    try:
-        int(number)
-        return True
-    except ValueError:
-        return False
+    # Only the first line can have the number of words and the size of the vectors, the rest of the file is copied as it is
+    with open(input_file, 'rb') as dirty, open(output_file, 'wb') as clean:
+        first_line = dirty.readline()
+        if not is_header_line(first_line):
+            clean.write(first_line)
+        copyfileobj(dirty, clean, COPY_BLOCK_SIZE)
+
+
+def clean_file_in_place(input_file: Path) -> None:
+    if is_binary_file(input_file):
+        print(f"INFO: {input_file} file is in the binary format and has no line with the number of words, skipping")
+    else:
+        remove_header_in_place(input_file)
+
+
+def remove_header_in_place(input_file: Path) -> None:
+    with open(input_file, 'r+b') as file:
+        first_line = file.readline()
+        if is_header_line(first_line):
+            print(f"INFO: Cleaning {input_file} file in place")
+            # The rest of the file is moved back block by block over the first line, so no copy of the file is needed
+            read_position = len(first_line)
+            write_position = 0
+            while True:
+                file.seek(read_position)
+                block = file.read(COPY_BLOCK_SIZE)
+                if not block:
+                    break
+                file.seek(write_position)
+                file.write(block)
+                read_position += len(block)
+                write_position += len(block)
+            file.truncate(write_position)
+        else:
+            print(f"INFO: {input_file} file has no line with the number of words and the size of the vectors, skipping")
+
+
+def is_header_line(line: bytes) -> bool:
+    # The same check as when the text embeddings are read, so clean removes the line that the other commands skip
+    return is_header(line.decode('UTF-8', errors="replace").split())
+
+
+def clean_binary_file(input_file: Path, output_file: Path) -> None:
+    # The size of the matrix is kept in the header of the NumPy file, which the embeddings need, and there is no line with the number of
+    # words and the size of the vectors to remove, so the files are only checked and copied
+    print(f"INFO: Copying the binary {input_file} file to {output_file} file")
+
+    rows = load_matrix(input_file).shape[0]
+    with open(get_words_file(input_file), 'rb') as words_file:
+        words = sum(1 for _ in words_file)
+    if rows != words:
+        raise ValueError(f"The matrix has {rows} rows but there are {words} words")
+
+    copyfile(input_file, output_file)
+    copyfile(get_words_file(input_file), get_words_file(output_file))
+    if get_scale_file(input_file).exists():
+        copyfile(get_scale_file(input_file), get_scale_file(output_file))
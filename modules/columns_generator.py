@@ -3,22 +3,23 @@
 from pathlib import Path
 from typing import List
 
-from .utils import search_files_pattern
+from .utils import search_files_pattern, transform_file, transform_files
 
 
-def walk_directories(input_path: Path, output_folder: Path) -> None:
+def walk_directories(input_path: Path, output_folder: Path, jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Browsing through directories to generate columns")
 
     pattern = '\\.conll$'
     input_path_name = input_path.name
     files = search_files_pattern(input_path, pattern)
 
-    generate_columns(files, input_path_name, output_folder)
+    generate_columns(files, input_path_name, output_folder, jobs, chunk_size)
 
 
-def generate_columns(files: List[Path], input_path_name: str, output_path: Path) -> None:
+def generate_columns(files: List[Path], input_path_name: str, output_path: Path, jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Generating columns")
 
+    tasks = []
     for file in files:
         file_folder_name = file.parent.name
         if file_folder_name != input_path_name:
@@ -27,28 +28,28 @@ def generate_columns(files: List[Path], input_path_name: str, output_path: Path)
             output_file = file_folder.joinpath(file.name)
         else:
             output_file = output_path.joinpath(file.name)
-        generate(file, output_file)
+        tasks.append((file, output_file))
+
+    transform_files(tasks, generate_line, jobs, chunk_size)
 
 
 def generate(file: Path, output_file: Path) -> None:
-    with open(file, 'rt', encoding='UTF-8', errors="replace") as actual_file, open(output_file, 'wt', encoding='UTF-8',
-                                                                                   errors="replace") as new_file:
-        for line in actual_file:
-            if not line.startswith("#"):
-                if line != "\n":
-                    line = line.replace("\n", "")
-                    tuples = line.split("\t")
-                    if len(tuples) < 10:
-                        columns_to_generate = 10 - len(tuples)
-                        expand_line(tuples, columns_to_generate)
-                        new_line = '\t'.join(tuples) + '\n'
-                        new_file.write(new_line)
-                    else:
-                        new_file.write(line)
-                else:
-                    new_file.write('\n')
-            else:
-                new_file.write(line)
+    transform_file(file, output_file, generate_line)
+
+
+def generate_line(line: str) -> str:
+    if not line.startswith("#"):
+        if line != "\n":
+            line = line.replace("\n", "")
+            tuples = line.split("\t")
+            if len(tuples) < 10:
+                columns_to_generate = 10 - len(tuples)
+                expand_line(tuples, columns_to_generate)
+            return '\t'.join(tuples) + '\n'
+        else:
+            return '\n'
+    else:
+        return line
 
 
 def expand_line(tuples: List[str], columns_to_generate: int) -> None:
@@ -1,24 +1,27 @@
 # -*- coding: utf-8 -*-
 
+from functools import partial
 from pathlib import Path
 from typing import List
 
-from .utils import search_files_pattern
+from .utils import search_files_pattern, transform_file, transform_files
 
 
-def walk_directories(input_folder: Path, output_folder: Path, column_from: int, column_to: int) -> None:
+def walk_directories(input_folder: Path, output_folder: Path, column_from: int, column_to: int, jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Browsing through directories to swap columns")
 
     pattern = '\\.conllu$'
     input_path_name = input_folder.name
     files = search_files_pattern(input_folder, pattern)
 
-    swap_columns(files, input_path_name, column_from, column_to, output_folder)
+    swap_columns(files, input_path_name, column_from, column_to, output_folder, jobs, chunk_size)
 
 
-def swap_columns(files: List[Path], input_path_name: str, column_from: int, column_to: int, output_path: Path) -> None:
+def swap_columns(files: List[Path], input_path_name: str, column_from: int, column_to: int, output_path: Path,
+                 jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Swapping columns")
 
+    tasks = []
     for file in files:
         file_folder_name = file.parent.name
         if file_folder_name != input_path_name:
@@ -27,21 +30,23 @@ def swap_columns(files: List[Path], input_path_name: str, column_from: int, colu
             output_file = file_folder.joinpath(file.name)
         else:
             output_file = output_path.joinpath(file.name)
-        swap(file, column_from, column_to, output_file)
+        tasks.append((file, output_file))
+
+    transform_files(tasks, partial(swap_line, column_from=column_from, column_to=column_to), jobs, chunk_size)
 
 
 def swap(file: Path, column_from: int, column_to: int, output_file: Path) -> None:
-    with open(file, 'rt', encoding='UTF-8', errors="replace") as actual_file, open(output_file, 'wt', encoding='UTF-8',
-                                                                                   errors="replace") as new_file:
-        for line in actual_file:
-            if not line.startswith("#"):
-                if line != "\n":
-                    line = line.replace("\n", "")
-                    tuples = line.split("\t")
-                    tuples[column_from], tuples[column_to] = tuples[column_to], tuples[column_from]
-                    new_line = '\t'.join(tuples) + '\n'
-                    new_file.write(new_line)
-                else:
-                    new_file.write('\n')
-            else:
-                new_file.write(line)
+    transform_file(file, output_file, partial(swap_line, column_from=column_from, column_to=column_to))
+
+
+def swap_line(line: str, column_from: int, column_to: int) -> str:
+    if not line.startswith("#"):
+        if line != "\n":
+            line = line.replace("\n", "")
+            tuples = line.split("\t")
+            tuples[column_from], tuples[column_to] = tuples[column_to], tuples[column_from]
+            return '\t'.join(tuples) + '\n'
+        else:
+            return '\n'
+    else:
+        return line
@@ -4,8 +4,10 @@ from pathlib import Path
 from re import search, sub
 from typing import Any, List
 
+from .utils import INDEX_SUFFIX, run_tasks
 
-def walk_directories(input_path: Path, output_path: Path, type_files_join: Any) -> None:
+
+def walk_directories(input_path: Path, output_path: Path, type_files_join: Any, jobs: int = 1) -> None:
     print("INFO: Browsing through directories to combine")
 
     input_path_name = input_path.name
@@ -27,22 +29,24 @@ def walk_directories(input_path: Path, output_path: Path, type_files_join: Any)
     if files_root_folder:
         files_to_combine.append(files_root_folder)
 
-    combine_files(type_files_join, files_to_combine, input_path_name, output_path)
+    combine_files(type_files_join, files_to_combine, input_path_name, output_path, jobs)
 
 
 def valid_file_combine(name: str, type_files_join) -> bool:
     pattern = f"\\-{type_files_join}\\-"
 
     result = search(pattern, name)
-    if result:
+    # The sentence index files created next to the files by the index command are not combined
+    if result and not name.endswith(INDEX_SUFFIX):
         return True
     else:
         return False
 
 
-def combine_files(type_files_join: str, file_groups: List[List[Path]], input_folder_name: str, output_path: Path) -> None:
+def combine_files(type_files_join: str, file_groups: List[List[Path]], input_folder_name: str, output_path: Path, jobs: int = 1) -> None:
     print(f"INFO: Combining {type_files_join} files")
 
+    tasks = []
     for file_group in file_groups:
         raw_file_name = file_group[0].name
         raw_file_name_suffix = file_group[0].suffix
@@ -55,11 +59,16 @@ def combine_files(type_files_join: str, file_groups: List[List[Path]], input_fol
             output_file = file_folder.joinpath(output_file_name)
         else:
             output_file = output_path.joinpath(output_file_name)
+        tasks.append((output_file, file_group, type_files_join))
+
+    run_tasks(combine_group, tasks, jobs)
+
 
-        with open(output_file, 'wt', encoding='UTF-8', errors="replace") as output_stream:
-            for file in file_group:
-                with open(file, 'rt', encoding='UTF-8', errors="replace") as input_stream:
-                    original = input_stream.read()
-                    removed_double_empty_lines = sub(r'[\r\n][\r\n]{2,}', '\n', original)
-                    output_stream.write(removed_double_empty_lines)
-        print(f"INFO: Files of type {type_files_join} have been correctly combined into {output_file}")
+def combine_group(output_file: Path, file_group: List[Path], type_files_join: str) -> None:
+    with open(output_file, 'wt', encoding='UTF-8', errors="replace") as output_stream:
+        for file in file_group:
+            with open(file, 'rt', encoding='UTF-8', errors="replace") as input_stream:
+                original = input_stream.read()
+                removed_double_empty_lines = sub(r'[\r\n][\r\n]{2,}', '\n', original)
+                output_stream.write(removed_double_empty_lines)
+    print(f"INFO: Files of type {type_files_join} have been correctly combined into {output_file}")
@@ -24,7 +24,7 @@
 
 # Command line usage
 # ------------------
-# conll18_ud_eval.py [-v] gold_conllu_file system_conllu_file
+# conll18_ud_eval.py [-v] [-c] [-s] [-b] gold_conllu_file system_conllu_file
 #
 # - if no -v is given, only the official CoNLL18 UD Shared Task evaluation metrics
 #   are printed
@@ -48,6 +48,10 @@
 #       HEAD+DEPREL(ignoring subtypes)+LEMMAS match
 # - if -c is given, raw counts of correct/gold_total/system_total/aligned words are printed
 #   instead of precision/recall/F1/AlignedAccuracy for all metrics.
+# - if -s is given, the files are evaluated as a stream (see evaluate_stream) instead of
+#   being loaded whole, with the same results
+# - if -b is given, the evaluation time and the number of alignments that took the
+#   fast path of identical gold and system words are printed as well
 
 # API usage
 # ---------
@@ -55,11 +59,33 @@
 #   - loads CoNLL-U file from given file object to an internal representation
 #   - the file object should return str in both Python 2 and Python 3
 #   - raises UDError exception if the given file cannot be loaded
-# - evaluate(gold_ud, system_ud)
+# - evaluate(gold_ud, system_ud, metrics=None, alignment_counts=None)
 #   - evaluate the given gold and system CoNLL-U files (loaded with load_conllu)
 #   - raises UDError if the concatenated tokens of gold and system file do not match
+#   - metrics is an optional list of metric names (see METRICS); only those are
+#     computed, and words are not aligned unless one of them needs it
+#   - alignment_counts is an optional dictionary (see new_alignment_counts) where
+#     the alignments which took the fast path of identical words are counted
 #   - returns a dictionary with the metrics described above, each metric having
 #     three fields: precision, recall and f1
+# - evaluate_sentences(gold_ud, system_ud, metrics=None)
+#   - same as evaluate, but the metrics computed on aligned words (UAS and LAS by
+#     default) are computed for every gold sentence using a single alignment of
+#     the whole files
+#   - returns a dictionary with a list of scores (one for each gold sentence)
+#     for each metric
+# - evaluate_arrays(gold, system_ud, metrics=None, alignment_counts=None)
+#   and evaluate_sentences_arrays(gold, system_ud, metrics=None, alignment_counts=None)
+#   - same as evaluate and evaluate_sentences, for a gold file given as UDArrays of the
+#     (possibly memory-mapped) arrays of flatten_conllu, so no UDWord is created for it
+#   - requires NumPy
+# - evaluate_stream(gold_file, system_file, metrics=None)
+#   - same as evaluate, but reads the given file objects in lockstep and evaluates
+#     them by chunks of sentences ending at the same character, so the memory
+#     used does not grow with the size of the files
+# - evaluate_stream_sentences(gold_file, system_file, metrics=None)
+#   - same as evaluate_sentences, reading the files as evaluate_stream does and
+#     yielding a dictionary with the scores of each gold sentence
 
 # Description of token matching
 # -----------------------------
@@ -93,12 +119,32 @@ from __future__ import division
 from __future__ import print_function
 
 import argparse
+import bisect
+import collections
+import gc
 import io
+import itertools
+import multiprocessing
+import operator
+import random
+import re
 import sys
+import time
 import unittest
 
 import unicodedata
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Any whitespace character, which includes every character with category Zs
+WHITESPACE = re.compile(r"\s", re.UNICODE)
+
+# Version of the evaluator, which must change whenever the computed scores change
+VERSION = "1.2"
+
 # CoNLL-U column names
 ID, FORM, LEMMA, UPOS, XPOS, FEATS, HEAD, DEPREL, DEPS, MISC = range(10)
 
@@ -135,56 +181,148 @@ def _encode(text):
     return text if sys.version_info[0] >= 3 or not isinstance(text, unicode) else text.encode("utf-8")
 
 
+# Internal representation classes
+class UDRepresentation:
+    __slots__ = ("characters", "tokens", "words", "sentences")
+
+    def __init__(self):
+        # Characters of all the tokens in the whole file, as a single string.
+        # Whitespace between tokens is not included.
+        self.characters = ""
+        # List of UDSpan instances with start&end indices into `characters`.
+        self.tokens = []
+        # List of UDWord instances.
+        self.words = []
+        # List of UDSpan instances with start&end indices into `characters`.
+        self.sentences = []
+
+
+class UDSpan:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start, end):
+        self.start = start
+        # Note that self.end marks the first position **after the end** of span,
+        # so we can use characters[start:end] or range(start, end).
+        self.end = end
+
+
+class UDWord:
+    __slots__ = ("span", "columns", "is_multiword", "parent", "functional_children", "is_content_deprel",
+                 "is_functional_deprel")
+
+    def __init__(self, span, columns, is_multiword, normalized=None):
+        # Span of this word (or MWT, see below) within ud_representation.characters.
+        self.span = span
+        # 10 columns of the CoNLL-U file: ID, FORM, LEMMA,...
+        self.columns = columns
+        # is_multiword==True means that this word is part of a multi-word token.
+        # In that case, self.span marks the span of the whole multi-word token.
+        self.is_multiword = is_multiword
+        # Reference to the UDWord instance representing the HEAD (or None if root).
+        self.parent = None
+        # References to UDWord instances representing functional-deprel children.
+        # The empty tuple is shared and replaced by a list when the first child is added.
+        self.functional_children = ()
+        # The normalized FEATS and DEPREL values are memoized by the file being loaded (see normalized_values),
+        # as treebanks only use a few distinct values.
+        normalized_feats, normalized_deprels = normalized if normalized is not None else normalized_values()
+        # Only consider universal FEATS.
+        try:
+            columns[FEATS] = normalized_feats[columns[FEATS]]
+        except KeyError:
+            columns[FEATS] = normalize_feats(columns[FEATS], normalized_feats)
+        # Let's ignore language-specific deprel subtypes.
+        # Precompute which deprels are CONTENT_DEPRELS and which FUNCTIONAL_DEPRELS
+        try:
+            columns[DEPREL], self.is_content_deprel, self.is_functional_deprel = normalized_deprels[columns[DEPREL]]
+        except KeyError:
+            columns[DEPREL], self.is_content_deprel, self.is_functional_deprel = normalize_deprel(columns[DEPREL], normalized_deprels)
+
+
+# Memoized normalized FEATS and DEPREL values, created for each loaded file so they are freed with it
+# instead of growing with every file evaluated by the process.
+def normalized_values():
+    return {}, {}
+
+
+def normalize_feats(feats, normalized_feats):
+    normalized = "|".join(sorted(feat for feat in feats.split("|") if feat.split("=", 1)[0] in UNIVERSAL_FEATURES))
+    normalized_feats[feats] = normalized
+    return normalized
+
+
+def normalize_deprel(deprel, normalized_deprels):
+    universal_deprel = deprel.split(":")[0]
+    normalized = (universal_deprel, universal_deprel in CONTENT_DEPRELS, universal_deprel in FUNCTIONAL_DEPRELS)
+    normalized_deprels[deprel] = normalized
+    return normalized
+
+
+# Delete spaces from FORM, so gold.characters == system.characters
+# even if one of them tokenizes the space. Use any Unicode character
+# with category Zs.
+def remove_spaces(form):
+    # Every Zs character is a whitespace character, so most forms are returned untouched.
+    if not WHITESPACE.search(form):
+        return form
+    return "".join(filter(lambda c: unicodedata.category(c) != "Zs", form))
+
+
+# Add parent and children UDWord links of the words of a sentence and check there are no cycles
+def link_words(words, sentence_start):
+    sentence_length = len(words) - sentence_start
+    for word in words[sentence_start:]:
+        # Follow the chain of unprocessed heads, marking its words to detect cycles
+        chain, current = [], word
+        while current.parent is None:
+            head = int(current.columns[HEAD])
+            if head < 0 or head > sentence_length:
+                raise UDError("HEAD '{}' points outside of the sentence".format(_encode(current.columns[HEAD])))
+            if not head:
+                break
+            current.parent = "remapping"
+            chain.append(current)
+            current = words[sentence_start + head - 1]
+        if current.parent == "remapping":
+            raise UDError("There is a cycle in a sentence")
+        for child in chain:
+            child.parent = words[sentence_start + int(child.columns[HEAD]) - 1]
+
+    for word in words[sentence_start:]:
+        if word.parent and word.is_functional_deprel:
+            if word.parent.functional_children:
+                word.parent.functional_children.append(word)
+            else:
+                word.parent.functional_children = [word]
+
+
 # Load given CoNLL-U file into internal representation
 def load_conllu(file):
-    # Internal representation classes
-    class UDRepresentation:
-        def __init__(self):
-            # Characters of all the tokens in the whole file.
-            # Whitespace between tokens is not included.
-            self.characters = []
-            # List of UDSpan instances with start&end indices into `characters`.
-            self.tokens = []
-            # List of UDWord instances.
-            self.words = []
-            # List of UDSpan instances with start&end indices into `characters`.
-            self.sentences = []
-
-    class UDSpan:
-        def __init__(self, start, end):
-            self.start = start
-            # Note that self.end marks the first position **after the end** of span,
-            # so we can use characters[start:end] or range(start, end).
-            self.end = end
-
-    class UDWord:
-        def __init__(self, span, columns, is_multiword):
-            # Span of this word (or MWT, see below) within ud_representation.characters.
-            self.span = span
-            # 10 columns of the CoNLL-U file: ID, FORM, LEMMA,...
-            self.columns = columns
-            # is_multiword==True means that this word is part of a multi-word token.
-            # In that case, self.span marks the span of the whole multi-word token.
-            self.is_multiword = is_multiword
-            # Reference to the UDWord instance representing the HEAD (or None if root).
-            self.parent = None
-            # List of references to UDWord instances representing functional-deprel children.
-            self.functional_children = []
-            # Only consider universal FEATS.
-            self.columns[FEATS] = "|".join(sorted(feat for feat in columns[FEATS].split("|")
-                                                  if feat.split("=", 1)[0] in UNIVERSAL_FEATURES))
-            # Let's ignore language-specific deprel subtypes.
-            self.columns[DEPREL] = columns[DEPREL].split(":")[0]
-            # Precompute which deprels are CONTENT_DEPRELS and which FUNCTIONAL_DEPRELS
-            self.is_content_deprel = self.columns[DEPREL] in CONTENT_DEPRELS
-            self.is_functional_deprel = self.columns[DEPREL] in FUNCTIONAL_DEPRELS
-
+    # The cyclic garbage collector would go through all the words created so far again and again,
+    # and none of them is garbage, so it is paused while the file is read.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return read_conllu(file)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def read_conllu(file):
     ud = UDRepresentation()
+    # FORMs of the tokens, joined into ud.characters at the end
+    forms = []
+    # Repeated column values share a single string object to save memory
+    share = {}.setdefault
+    normalized = normalized_values()
 
     # Load the CoNLL-U file
     index, sentence_start = 0, None
+    readline = file.readline
     while True:
-        line = file.readline()
+        line = readline()
         if not line:
             break
         line = _decode(line.rstrip("\r\n"))
@@ -199,27 +337,7 @@ def load_conllu(file):
             sentence_start = len(ud.words)
 
         if not line:
-            # Add parent and children UDWord links and check there are no cycles
-            def process_word(word):
-                if word.parent == "remapping":
-                    raise UDError("There is a cycle in a sentence")
-                if word.parent is None:
-                    head = int(word.columns[HEAD])
-                    if head < 0 or head > len(ud.words) - sentence_start:
-                        raise UDError("HEAD '{}' points outside of the sentence".format(_encode(word.columns[HEAD])))
-                    if head:
-                        parent = ud.words[sentence_start + head - 1]
-                        word.parent = "remapping"
-                        process_word(parent)
-                        word.parent = parent
-
-            for word in ud.words[sentence_start:]:
-                process_word(word)
-            # func_children cannot be assigned within process_word
-            # because it is called recursively and may result in adding one child twice.
-            for word in ud.words[sentence_start:]:
-                if word.parent and word.is_functional_deprel:
-                    word.parent.functional_children.append(word)
+            link_words(ud.words, sentence_start)
 
             # Check there is a single root node
 
@@ -233,6 +351,7 @@ def load_conllu(file):
 
         # Read next token/word
         columns = line.split("\t")
+        columns = list(map(share, columns, columns))
 
         if len(columns) != 10:
             raise UDError("The CoNLL-U line does not contain 10 tab-separated columns: '{}'".format(_encode(line)))
@@ -241,16 +360,14 @@ def load_conllu(file):
         if "." in columns[ID]:
             continue
 
-        # Delete spaces from FORM, so gold.characters == system.characters
-        # even if one of them tokenizes the space. Use any Unicode character
-        # with category Zs.
-        columns[FORM] = "".join(filter(lambda c: unicodedata.category(c) != "Zs", columns[FORM]))
+        columns[FORM] = remove_spaces(columns[FORM])
         if not columns[FORM]:
             raise UDError("There is an empty FORM in the CoNLL-U file")
 
         # Save token
-        ud.characters.extend(columns[FORM])
-        ud.tokens.append(UDSpan(index, index + len(columns[FORM])))
+        forms.append(columns[FORM])
+        token = UDSpan(index, index + len(columns[FORM]))
+        ud.tokens.append(token)
         index += len(columns[FORM])
 
         # Handle multi-word tokens to save word(s)
@@ -261,12 +378,13 @@ def load_conllu(file):
                 raise UDError("Cannot parse multi-word token ID '{}'".format(_encode(columns[ID])))
 
             for _ in range(start, end + 1):
-                word_line = _decode(file.readline().rstrip("\r\n"))
+                word_line = _decode(readline().rstrip("\r\n"))
                 word_columns = word_line.split("\t")
+                word_columns = list(map(share, word_columns, word_columns))
                 if len(word_columns) != 10:
                     raise UDError(
                         "The CoNLL-U line does not contain 10 tab-separated columns: '{}'".format(_encode(word_line)))
-                ud.words.append(UDWord(ud.tokens[-1], word_columns, is_multiword=True))
+                ud.words.append(UDWord(token, word_columns, is_multiword=True, normalized=normalized))
         # Basic tokens/words
         else:
             try:
@@ -284,224 +402,1178 @@ def load_conllu(file):
             if head_id < 0:
                 raise UDError("HEAD cannot be negative")
 
-            ud.words.append(UDWord(ud.tokens[-1], columns, is_multiword=False))
+            ud.words.append(UDWord(token, columns, is_multiword=False, normalized=normalized))
 
     if sentence_start is not None:
         raise UDError("The CoNLL-U file does not end with empty line")
 
+    ud.characters = "".join(forms)
     return ud
 
 
-# Evaluate the gold and system treebanks (loaded using load_conllu).
-def evaluate(gold_ud, system_ud):
-    class Score:
-        def __init__(self, gold_total, system_total, correct, aligned_total=None):
-            self.correct = correct
-            self.gold_total = gold_total
-            self.system_total = system_total
-            self.aligned_total = aligned_total
-            self.precision = correct / system_total if system_total else 0.0
-            self.recall = correct / gold_total if gold_total else 0.0
-            self.f1 = 2 * correct / (system_total + gold_total) if system_total + gold_total else 0.0
-            self.aligned_accuracy = correct / aligned_total if aligned_total else aligned_total
-
-    class AlignmentWord:
-        def __init__(self, gold_word, system_word):
-            self.gold_word = gold_word
-            self.system_word = system_word
-
-    class Alignment:
-        def __init__(self, gold_words, system_words):
-            self.gold_words = gold_words
-            self.system_words = system_words
-            self.matched_words = []
-            self.matched_words_map = {}
-
-        def append_aligned_words(self, gold_word, system_word):
-            self.matched_words.append(AlignmentWord(gold_word, system_word))
-            self.matched_words_map[system_word] = gold_word
-
-    def spans_score(gold_spans, system_spans):
-        correct, gi, si = 0, 0, 0
-        while gi < len(gold_spans) and si < len(system_spans):
-            if system_spans[si].start < gold_spans[gi].start:
+# Evaluation classes and helpers
+class Score:
+    def __init__(self, gold_total, system_total, correct, aligned_total=None):
+        self.correct = correct
+        self.gold_total = gold_total
+        self.system_total = system_total
+        self.aligned_total = aligned_total
+        self.precision = correct / system_total if system_total else 0.0
+        self.recall = correct / gold_total if gold_total else 0.0
+        self.f1 = 2 * correct / (system_total + gold_total) if system_total + gold_total else 0.0
+        self.aligned_accuracy = correct / aligned_total if aligned_total else aligned_total
+
+
+class AlignmentWord:
+    def __init__(self, gold_word, system_word):
+        self.gold_word = gold_word
+        self.system_word = system_word
+
+
+class Alignment:
+    def __init__(self, gold_words, system_words):
+        self.gold_words = gold_words
+        self.system_words = system_words
+        self.matched_words = []
+        self.matched_words_map = {}
+
+    def append_aligned_words(self, gold_word, system_word):
+        self.matched_words.append(AlignmentWord(gold_word, system_word))
+        self.matched_words_map[system_word] = gold_word
+
+
+def spans_score(gold_spans, system_spans):
+    correct, gi, si = 0, 0, 0
+    while gi < len(gold_spans) and si < len(system_spans):
+        if system_spans[si].start < gold_spans[gi].start:
+            si += 1
+        elif gold_spans[gi].start < system_spans[si].start:
+            gi += 1
+        else:
+            correct += gold_spans[gi].end == system_spans[si].end
+            si += 1
+            gi += 1
+
+    return Score(len(gold_spans), len(system_spans), correct)
+
+
+def alignment_score(alignment, key_fn=None, filter_fn=None):
+    if filter_fn is not None:
+        gold = sum(1 for gold in alignment.gold_words if filter_fn(gold))
+        system = sum(1 for system in alignment.system_words if filter_fn(system))
+        aligned = sum(1 for word in alignment.matched_words if filter_fn(word.gold_word))
+    else:
+        gold = len(alignment.gold_words)
+        system = len(alignment.system_words)
+        aligned = len(alignment.matched_words)
+
+    if key_fn is None:
+        # Return score for whole aligned words
+        return Score(gold, system, aligned)
+
+    def gold_aligned_gold(word):
+        return word
+
+    def gold_aligned_system(word):
+        return alignment.matched_words_map.get(word, "NotAligned") if word is not None else None
+
+    correct = 0
+    for words in alignment.matched_words:
+        if filter_fn is None or filter_fn(words.gold_word):
+            if key_fn(words.gold_word, gold_aligned_gold) == key_fn(words.system_word, gold_aligned_system):
+                correct += 1
+
+    return Score(gold, system, correct, aligned)
+
+
+def beyond_end(words, i, multiword_span_end):
+    if i >= len(words):
+        return True
+    if words[i].is_multiword:
+        return words[i].span.start >= multiword_span_end
+    return words[i].span.end > multiword_span_end
+
+
+def extend_end(word, multiword_span_end):
+    if word.is_multiword and word.span.end > multiword_span_end:
+        return word.span.end
+    return multiword_span_end
+
+
+def find_multiword_span(gold_words, system_words, gi, si):
+    # We know gold_words[gi].is_multiword or system_words[si].is_multiword.
+    # Find the start of the multiword span (gs, ss), so the multiword span is minimal.
+    # Initialize multiword_span_end characters index.
+    if gold_words[gi].is_multiword:
+        multiword_span_end = gold_words[gi].span.end
+        if not system_words[si].is_multiword and system_words[si].span.start < gold_words[gi].span.start:
+            si += 1
+    else:  # if system_words[si].is_multiword
+        multiword_span_end = system_words[si].span.end
+        if not gold_words[gi].is_multiword and gold_words[gi].span.start < system_words[si].span.start:
+            gi += 1
+    gs, ss = gi, si
+
+    # Find the end of the multiword span
+    # (so both gi and si are pointing to the word following the multiword span end).
+    while not beyond_end(gold_words, gi, multiword_span_end) or \
+            not beyond_end(system_words, si, multiword_span_end):
+        if gi < len(gold_words) and (si >= len(system_words) or
+                                     gold_words[gi].span.start <= system_words[si].span.start):
+            multiword_span_end = extend_end(gold_words[gi], multiword_span_end)
+            gi += 1
+        else:
+            multiword_span_end = extend_end(system_words[si], multiword_span_end)
+            si += 1
+    return gs, ss, gi, si
+
+
+# Spans with fewer gold x system word pairs than this are aligned in pure Python,
+# where NumPy would be slower because of its per-call overhead.
+LCS_NUMPY_MIN_CELLS = 512
+
+
+# Table of the LCS lengths of every pair of suffixes of the lowercased gold and system forms.
+def compute_lcs(gold_forms, system_forms):
+    if numpy is not None and len(gold_forms) * len(system_forms) >= LCS_NUMPY_MIN_CELLS:
+        return compute_lcs_numpy(gold_forms, system_forms)
+    return compute_lcs_python(gold_forms, system_forms)
+
+
+def compute_lcs_python(gold_forms, system_forms):
+    gold_length, system_length = len(gold_forms), len(system_forms)
+    lcs = [[0] * (system_length + 1) for i in range(gold_length + 1)]
+    for g in reversed(range(gold_length)):
+        row, below, gold_form = lcs[g], lcs[g + 1], gold_forms[g]
+        for s in reversed(range(system_length)):
+            value = below[s + 1] + 1 if gold_form == system_forms[s] else 0
+            row[s] = max(value, below[s], row[s + 1])
+    return lcs
+
+
+def compute_lcs_numpy(gold_forms, system_forms):
+    # Forms are replaced by integer identifiers, the system forms missing in gold get -1 and never match
+    identifiers = {}
+    gold_ids = numpy.array([identifiers.setdefault(form, len(identifiers)) for form in gold_forms])
+    system_ids = numpy.array([identifiers.get(form, -1) for form in system_forms])
+    matches = gold_ids[:, None] == system_ids[None, :]
+
+    # Each row only depends on the row below and on the cells to its right, so it is the
+    # cumulative maximum from the right of the values given by the row below.
+    system_length = len(system_forms)
+    lcs = numpy.zeros((len(gold_forms) + 1, system_length + 1), dtype=numpy.int64)
+    for g in reversed(range(len(gold_forms))):
+        below = lcs[g + 1]
+        values = numpy.maximum(numpy.where(matches[g], below[1:] + 1, 0), below[:-1])
+        lcs[g, :system_length] = numpy.maximum.accumulate(values[::-1])[::-1]
+    return lcs
+
+
+def align_words(gold_words, system_words):
+    alignment = Alignment(gold_words, system_words)
+
+    gi, si = 0, 0
+    while gi < len(gold_words) and si < len(system_words):
+        if gold_words[gi].is_multiword or system_words[si].is_multiword:
+            # A: Multi-word tokens => align via LCS within the whole "multiword span".
+            gs, ss, gi, si = find_multiword_span(gold_words, system_words, gi, si)
+
+            if si > ss and gi > gs:
+                gold_forms = [word.columns[FORM].lower() for word in gold_words[gs:gi]]
+                system_forms = [word.columns[FORM].lower() for word in system_words[ss:si]]
+                lcs = compute_lcs(gold_forms, system_forms)
+
+                # Store aligned words
+                s, g = 0, 0
+                while g < gi - gs and s < si - ss:
+                    if gold_forms[g] == system_forms[s]:
+                        alignment.append_aligned_words(gold_words[gs + g], system_words[ss + s])
+                        g += 1
+                        s += 1
+                    elif lcs[g][s] == lcs[g + 1][s]:
+                        g += 1
+                    else:
+                        s += 1
+        else:
+            # B: No multi-word token => align according to spans.
+            if (gold_words[gi].span.start, gold_words[gi].span.end) == (
+                    system_words[si].span.start, system_words[si].span.end):
+                alignment.append_aligned_words(gold_words[gi], system_words[si])
+                gi += 1
                 si += 1
-            elif gold_spans[gi].start < system_spans[si].start:
+            elif gold_words[gi].span.start <= system_words[si].span.start:
                 gi += 1
             else:
-                correct += gold_spans[gi].end == system_spans[si].end
                 si += 1
-                gi += 1
 
-        return Score(len(gold_spans), len(system_spans), correct)
+    return alignment
 
-    def alignment_score(alignment, key_fn=None, filter_fn=None):
-        if filter_fn is not None:
-            gold = sum(1 for gold in alignment.gold_words if filter_fn(gold))
-            system = sum(1 for system in alignment.system_words if filter_fn(system))
-            aligned = sum(1 for word in alignment.matched_words if filter_fn(word.gold_word))
-        else:
-            gold = len(alignment.gold_words)
-            system = len(alignment.system_words)
-            aligned = len(alignment.matched_words)
 
-        if key_fn is None:
-            # Return score for whole aligned words
-            return Score(gold, system, aligned)
+# Alignment of words which have the same spans in gold and system (the system tokenization is the gold one),
+# or None otherwise. Such words are aligned one to one by align_words, so it is not needed: the words of a
+# multi-word token are aligned by their FORMs, which must also be the same.
+def identical_alignment(gold_words, system_words):
+    if len(gold_words) != len(system_words):
+        return None
+    for gold_word, system_word in zip(gold_words, system_words):
+        if gold_word.span.start != system_word.span.start or gold_word.span.end != system_word.span.end or \
+                gold_word.is_multiword != system_word.is_multiword:
+            return None
+        if gold_word.is_multiword and gold_word.columns[FORM].lower() != system_word.columns[FORM].lower():
+            return None
 
-        def gold_aligned_gold(word):
-            return word
+    alignment = Alignment(gold_words, system_words)
+    alignment.matched_words = list(map(AlignmentWord, gold_words, system_words))
+    alignment.matched_words_map = dict(zip(system_words, gold_words))
+    return alignment
 
-        def gold_aligned_system(word):
-            return alignment.matched_words_map.get(word, "NotAligned") if word is not None else None
 
-        correct = 0
-        for words in alignment.matched_words:
-            if filter_fn is None or filter_fn(words.gold_word):
-                if key_fn(words.gold_word, gold_aligned_gold) == key_fn(words.system_word, gold_aligned_system):
-                    correct += 1
+# Counts of the alignments which took the fast path of identical words and which needed align_words,
+# updated by align (and the evaluate functions) when given.
+def new_alignment_counts():
+    return {"identical": 0, "aligned": 0}
 
-        return Score(gold, system, correct, aligned)
 
-    def beyond_end(words, i, multiword_span_end):
-        if i >= len(words):
-            return True
-        if words[i].is_multiword:
-            return words[i].span.start >= multiword_span_end
-        return words[i].span.end > multiword_span_end
+def align(gold_ud, system_ud, alignment_counts=None):
+    alignment = identical_alignment(gold_ud.words, system_ud.words)
+    if alignment_counts is not None:
+        alignment_counts["identical" if alignment is not None else "aligned"] += 1
+    if alignment is not None:
+        return alignment
+    return align_words(gold_ud.words, system_ud.words)
 
-    def extend_end(word, multiword_span_end):
-        if word.is_multiword and word.span.end > multiword_span_end:
-            return word.span.end
-        return multiword_span_end
 
-    def find_multiword_span(gold_words, system_words, gi, si):
-        # We know gold_words[gi].is_multiword or system_words[si].is_multiword.
-        # Find the start of the multiword span (gs, ss), so the multiword span is minimal.
-        # Initialize multiword_span_end characters index.
-        if gold_words[gi].is_multiword:
-            multiword_span_end = gold_words[gi].span.end
-            if not system_words[si].is_multiword and system_words[si].span.start < gold_words[gi].span.start:
-                si += 1
-        else:  # if system_words[si].is_multiword
-            multiword_span_end = system_words[si].span.end
-            if not gold_words[gi].is_multiword and gold_words[gi].span.start < system_words[si].span.start:
-                gi += 1
-        gs, ss = gi, si
-
-        # Find the end of the multiword span
-        # (so both gi and si are pointing to the word following the multiword span end).
-        while not beyond_end(gold_words, gi, multiword_span_end) or \
-                not beyond_end(system_words, si, multiword_span_end):
-            if gi < len(gold_words) and (si >= len(system_words) or
-                                         gold_words[gi].span.start <= system_words[si].span.start):
-                multiword_span_end = extend_end(gold_words[gi], multiword_span_end)
-                gi += 1
-            else:
-                multiword_span_end = extend_end(system_words[si], multiword_span_end)
-                si += 1
-        return gs, ss, gi, si
-
-    def compute_lcs(gold_words, system_words, gi, si, gs, ss):
-        lcs = [[0] * (si - ss) for i in range(gi - gs)]
-        for g in reversed(range(gi - gs)):
-            for s in reversed(range(si - ss)):
-                if gold_words[gs + g].columns[FORM].lower() == system_words[ss + s].columns[FORM].lower():
-                    lcs[g][s] = 1 + (lcs[g + 1][s + 1] if g + 1 < gi - gs and s + 1 < si - ss else 0)
-                lcs[g][s] = max(lcs[g][s], lcs[g + 1][s] if g + 1 < gi - gs else 0)
-                lcs[g][s] = max(lcs[g][s], lcs[g][s + 1] if s + 1 < si - ss else 0)
-        return lcs
-
-    def align_words(gold_words, system_words):
-        alignment = Alignment(gold_words, system_words)
-
-        gi, si = 0, 0
-        while gi < len(gold_words) and si < len(system_words):
-            if gold_words[gi].is_multiword or system_words[si].is_multiword:
-                # A: Multi-word tokens => align via LCS within the whole "multiword span".
-                gs, ss, gi, si = find_multiword_span(gold_words, system_words, gi, si)
-
-                if si > ss and gi > gs:
-                    lcs = compute_lcs(gold_words, system_words, gi, si, gs, ss)
-
-                    # Store aligned words
-                    s, g = 0, 0
-                    while g < gi - gs and s < si - ss:
-                        if gold_words[gs + g].columns[FORM].lower() == system_words[ss + s].columns[FORM].lower():
-                            alignment.append_aligned_words(gold_words[gs + g], system_words[ss + s])
-                            g += 1
-                            s += 1
-                        elif lcs[g][s] == (lcs[g + 1][s] if g + 1 < gi - gs else 0):
-                            g += 1
-                        else:
-                            s += 1
-            else:
-                # B: No multi-word token => align according to spans.
-                if (gold_words[gi].span.start, gold_words[gi].span.end) == (
-                        system_words[si].span.start, system_words[si].span.end):
-                    alignment.append_aligned_words(gold_words[gi], system_words[si])
-                    gi += 1
-                    si += 1
-                elif gold_words[gi].span.start <= system_words[si].span.start:
-                    gi += 1
-                else:
-                    si += 1
+# Check that the underlying character sequences of the gold and system treebanks do match.
+def check_characters(gold_ud, system_ud):
+    check_texts(gold_ud.characters, system_ud.characters)
 
-        return alignment
 
-    # Check that the underlying character sequences do match.
-    if gold_ud.characters != system_ud.characters:
+def check_texts(gold_characters, system_characters):
+    if gold_characters != system_characters:
         index = 0
-        while index < len(gold_ud.characters) and index < len(system_ud.characters) and \
-                gold_ud.characters[index] == system_ud.characters[index]:
+        while index < len(gold_characters) and index < len(system_characters) and \
+                gold_characters[index] == system_characters[index]:
             index += 1
 
         raise UDError(
             "The concatenation of tokens in gold file and in system file differ!\n" +
             "First 20 differing characters in gold file: '{}' and system file: '{}'".format(
-                "".join(map(_encode, gold_ud.characters[index:index + 20])),
-                "".join(map(_encode, system_ud.characters[index:index + 20]))
+                "".join(map(_encode, gold_characters[index:index + 20])),
+                "".join(map(_encode, system_characters[index:index + 20]))
             )
         )
 
-    # Align words
-    alignment = align_words(gold_ud.words, system_ud.words)
+
+# Metrics computed on the tokens and sentences spans.
+SPAN_METRICS = ["Tokens", "Sentences"]
+
+# Metrics computed on the aligned words, with their key_fn and filter_fn for alignment_score.
+ALIGNMENT_METRICS = {
+    "Words": (None, None),
+    "UPOS": (lambda w, _: w.columns[UPOS], None),
+    "XPOS": (lambda w, _: w.columns[XPOS], None),
+    "UFeats": (lambda w, _: w.columns[FEATS], None),
+    "AllTags": (lambda w, _: (w.columns[UPOS], w.columns[XPOS], w.columns[FEATS]), None),
+    "Lemmas": (lambda w, ga: w.columns[LEMMA] if ga(w).columns[LEMMA] != "_" else "_", None),
+    "UAS": (lambda w, ga: ga(w.parent), None),
+    "LAS": (lambda w, ga: (ga(w.parent), w.columns[DEPREL]), None),
+    "CLAS": (lambda w, ga: (ga(w.parent), w.columns[DEPREL]),
+             lambda w: w.is_content_deprel),
+    "MLAS": (lambda w, ga: (ga(w.parent), w.columns[DEPREL], w.columns[UPOS], w.columns[FEATS],
+                            [(ga(c), c.columns[DEPREL], c.columns[UPOS], c.columns[FEATS])
+                             for c in w.functional_children]),
+             lambda w: w.is_content_deprel),
+    "BLEX": (lambda w, ga: (ga(w.parent), w.columns[DEPREL],
+                            w.columns[LEMMA] if ga(w).columns[LEMMA] != "_" else "_"),
+             lambda w: w.is_content_deprel),
+}
+
+# All the metrics, in the order in which they are printed.
+METRICS = ["Tokens", "Sentences", "Words", "UPOS", "XPOS", "UFeats", "AllTags", "Lemmas", "UAS", "LAS",
+           "CLAS", "MLAS", "BLEX"]
+
+
+def check_metrics(metrics, allowed):
+    for metric in metrics:
+        if metric not in allowed:
+            raise UDError("Unknown metric '{}', expected one of: {}".format(metric, ", ".join(allowed)))
+
+
+# Aligned words encoded into NumPy boolean arrays, so the metrics are computed by combining whole arrays
+# instead of calling the key_fn of ALIGNMENT_METRICS for every aligned word.
+class AlignmentArrays:
+    def __init__(self, alignment):
+        self.alignment = alignment
+        self.gold_matched = list(map(operator.attrgetter("gold_word"), alignment.matched_words))
+        self.system_matched = list(map(operator.attrgetter("system_word"), alignment.matched_words))
+        self.gold_columns = list(map(operator.attrgetter("columns"), self.gold_matched))
+        self.system_columns = list(map(operator.attrgetter("columns"), self.system_matched))
+        self.cache = {}
+
+    def cached(self, name, compute):
+        if name not in self.cache:
+            self.cache[name] = compute()
+        return self.cache[name]
+
+    # Number of gold words, system words and aligned words
+    def totals(self):
+        return len(self.alignment.gold_words), len(self.alignment.system_words), len(self.alignment.matched_words)
+
+    # Whether each gold (or system) word has a content DEPREL
+    def content(self, words):
+        return numpy.fromiter(map(operator.attrgetter("is_content_deprel"), words), dtype=bool, count=len(words))
+
+    # Masks of the gold words, system words and aligned words with a content DEPREL (the one of the gold word)
+    def content_masks(self):
+        return (self.cached("gold_content", lambda: self.content(self.alignment.gold_words)),
+                self.cached("system_content", lambda: self.content(self.alignment.system_words)),
+                self.cached("aligned_content", lambda: self.content(self.gold_matched)))
+
+    # Whether the given column has the same value in each pair of aligned words
+    def equal_column(self, column):
+        def compute():
+            gold = map(operator.itemgetter(column), self.gold_columns)
+            system = map(operator.itemgetter(column), self.system_columns)
+            return numpy.fromiter(map(operator.eq, gold, system), dtype=bool, count=len(self.gold_columns))
+        return self.cached(column, compute)
+
+    # Whether the HEAD of each pair of aligned words is the same gold word (or both are the root)
+    def equal_parents(self):
+        def compute():
+            gold_parents = map(operator.attrgetter("parent"), self.gold_matched)
+            system_parents = map(operator.attrgetter("parent"), self.system_matched)
+            # Gold word aligned to the HEAD of each system word, or "NotAligned"
+            gold_aligned_system = dict(self.alignment.matched_words_map)
+            gold_aligned_system[None] = None
+            system_parents = map(gold_aligned_system.get, system_parents, itertools.repeat("NotAligned"))
+            return numpy.fromiter(map(operator.is_, gold_parents, system_parents), dtype=bool, count=len(self.gold_matched))
+        return self.cached("parents", compute)
+
+    # The system LEMMA is only compared when the gold one is given
+    def equal_lemmas(self):
+        def compute():
+            gold = map(operator.itemgetter(LEMMA), self.gold_columns)
+            missing = numpy.fromiter(map("_".__eq__, gold), dtype=bool, count=len(self.gold_columns))
+            return missing | self.equal_column(LEMMA)
+        return self.cached("lemmas", compute)
+
+    # The given aligned words whose functional children differ, compared as in the MLAS key_fn
+    def unequal_children(self, candidates):
+        def gold_aligned_gold(word):
+            return word
+
+        def gold_aligned_system(word):
+            return self.alignment.matched_words_map.get(word, "NotAligned")
+
+        def children_key(children, gold_aligned):
+            return [(gold_aligned(child), child.columns[DEPREL], child.columns[UPOS], child.columns[FEATS]) for child in children]
+
+        unequal = []
+        for index in candidates.tolist():
+            gold_children = self.gold_matched[index].functional_children
+            system_children = self.system_matched[index].functional_children
+            if (gold_children or system_children) and \
+                    children_key(gold_children, gold_aligned_gold) != children_key(system_children, gold_aligned_system):
+                unequal.append(index)
+        return unequal
+
+    # Masks of the gold words, system words and aligned words counted by the metric, None meaning all of them,
+    # and whether each aligned word is correct (None for the Words metric).
+    def metric_masks(self, metric):
+        gold_mask, system_mask, aligned_mask = None, None, None
+        if ALIGNMENT_METRICS[metric][1] is not None:
+            gold_mask, system_mask, aligned_mask = self.content_masks()
+
+        if metric == "Words":
+            correct = None
+        elif metric == "UPOS":
+            correct = self.equal_column(UPOS)
+        elif metric == "XPOS":
+            correct = self.equal_column(XPOS)
+        elif metric == "UFeats":
+            correct = self.equal_column(FEATS)
+        elif metric == "AllTags":
+            correct = self.equal_column(UPOS) & self.equal_column(XPOS) & self.equal_column(FEATS)
+        elif metric == "Lemmas":
+            correct = self.equal_lemmas()
+        elif metric == "UAS":
+            correct = self.equal_parents()
+        elif metric in ("LAS", "CLAS"):
+            correct = self.equal_parents() & self.equal_column(DEPREL)
+        elif metric == "BLEX":
+            correct = self.equal_parents() & self.equal_column(DEPREL) & self.equal_lemmas()
+        else:
+            correct = self.equal_parents() & self.equal_column(DEPREL) & self.equal_column(UPOS) & self.equal_column(FEATS)
+            # The functional children are only compared for the words which are otherwise correct
+            correct[self.unequal_children(numpy.flatnonzero(correct & aligned_mask))] = False
+        if correct is not None and aligned_mask is not None:
+            correct = correct & aligned_mask
+
+        return gold_mask, system_mask, aligned_mask, correct
+
+    def score(self, metric):
+        gold_mask, system_mask, aligned_mask, correct = self.metric_masks(metric)
+        gold_words, system_words, aligned_words = self.totals()
+        gold = int(gold_mask.sum()) if gold_mask is not None else gold_words
+        system = int(system_mask.sum()) if system_mask is not None else system_words
+        aligned = int(aligned_mask.sum()) if aligned_mask is not None else aligned_words
+        if correct is None:
+            # Score for whole aligned words
+            return Score(gold, system, aligned)
+        return Score(gold, system, int(correct.sum()), aligned)
+
+    # Scores of each gold sentence, the words being assigned to the gold sentence where their span starts.
+    # The words of each sentence are counted with bincount, as reduceat does not handle empty sentences.
+    def sentence_scores(self, metric, gold_ud):
+        gold_mask, system_mask, aligned_mask, correct = self.metric_masks(metric)
+        gold_sentences, system_sentences, aligned_sentences = self.cached("sentences", lambda: self.sentence_indices(gold_ud))
+
+        def count(indices, mask=None):
+            return numpy.bincount(indices if mask is None else indices[mask], minlength=len(gold_ud.sentences)).tolist()
+
+        gold = count(gold_sentences, gold_mask)
+        system = count(system_sentences, system_mask)
+        aligned = count(aligned_sentences, aligned_mask)
+        if correct is None:
+            return [Score(gold[i], system[i], aligned[i]) for i in range(len(gold_ud.sentences))]
+        correct = count(aligned_sentences, correct)
+        return [Score(gold[i], system[i], correct[i], aligned[i]) for i in range(len(gold_ud.sentences))]
+
+    def sentence_indices(self, gold_ud):
+        sentence_starts = numpy.array([sentence.start for sentence in gold_ud.sentences], dtype=numpy.int64)
+
+        def sentence_of(words):
+            starts = numpy.fromiter((word.span.start for word in words), dtype=numpy.int64, count=len(words))
+            return numpy.searchsorted(sentence_starts, starts, side="right") - 1
+
+        return sentence_of(self.alignment.gold_words), sentence_of(self.alignment.system_words), sentence_of(self.gold_matched)
+
+
+# Alignments with fewer matched words are scored by alignment_score, as the NumPy arrays do not pay off.
+ALIGNMENT_NUMPY_MIN_WORDS = 64
+
+
+def alignment_arrays(alignment):
+    if numpy is None or len(alignment.matched_words) < ALIGNMENT_NUMPY_MIN_WORDS:
+        return None
+    return AlignmentArrays(alignment)
+
+
+# Evaluate the gold and system treebanks (loaded using load_conllu).
+# Only the given metrics are computed (all of them by default).
+def evaluate(gold_ud, system_ud, metrics=None, alignment_counts=None):
+    metrics = METRICS if metrics is None else metrics
+    check_metrics(metrics, METRICS)
+    check_characters(gold_ud, system_ud)
 
     # Compute the F1-scores
+    evaluation = {}
+    alignment, arrays = None, None
+    for metric in metrics:
+        if metric == "Tokens":
+            evaluation[metric] = spans_score(gold_ud.tokens, system_ud.tokens)
+        elif metric == "Sentences":
+            evaluation[metric] = spans_score(gold_ud.sentences, system_ud.sentences)
+        else:
+            # Align words, only if one of the metrics needs it
+            if alignment is None:
+                alignment = align(gold_ud, system_ud, alignment_counts)
+                arrays = alignment_arrays(alignment)
+            if arrays is not None:
+                evaluation[metric] = arrays.score(metric)
+            else:
+                key_fn, filter_fn = ALIGNMENT_METRICS[metric]
+                evaluation[metric] = alignment_score(alignment, key_fn, filter_fn)
+
+    return evaluation
+
+
+# Score every gold sentence separately, using a single alignment of the whole treebanks.
+# Returns a dictionary with a list of Score instances (one for each gold sentence) for the given
+# metrics computed on aligned words (UAS and LAS by default).
+def evaluate_sentences(gold_ud, system_ud, metrics=None, alignment_counts=None):
+    metrics = ["UAS", "LAS"] if metrics is None else metrics
+    check_metrics(metrics, list(ALIGNMENT_METRICS))
+    check_characters(gold_ud, system_ud)
+
+    # Align words
+    alignment = align(gold_ud, system_ud, alignment_counts)
+    arrays = alignment_arrays(alignment)
+
+    # Compute the F1-scores of each sentence
+    evaluation = {}
+    for metric in metrics:
+        if arrays is not None:
+            evaluation[metric] = arrays.sentence_scores(metric, gold_ud)
+        else:
+            key_fn, filter_fn = ALIGNMENT_METRICS[metric]
+            evaluation[metric] = alignment_sentence_scores(gold_ud, alignment, key_fn, filter_fn)
+
+    return evaluation
+
+
+def alignment_sentence_scores(gold_ud, alignment, key_fn, filter_fn=None):
+    # Words are assigned to the gold sentence where their span starts.
+    sentence_starts = [sentence.start for sentence in gold_ud.sentences]
+    gold = [0] * len(sentence_starts)
+    system = [0] * len(sentence_starts)
+    aligned = [0] * len(sentence_starts)
+    correct = [0] * len(sentence_starts)
+
+    def sentence_of(word):
+        return bisect.bisect_right(sentence_starts, word.span.start) - 1
+
+    def gold_aligned_gold(word):
+        return word
+
+    def gold_aligned_system(word):
+        return alignment.matched_words_map.get(word, "NotAligned") if word is not None else None
+
+    for word in alignment.gold_words:
+        if filter_fn is None or filter_fn(word):
+            gold[sentence_of(word)] += 1
+    for word in alignment.system_words:
+        if filter_fn is None or filter_fn(word):
+            system[sentence_of(word)] += 1
+    for words in alignment.matched_words:
+        if filter_fn is None or filter_fn(words.gold_word):
+            sentence = sentence_of(words.gold_word)
+            aligned[sentence] += 1
+            if key_fn is None or key_fn(words.gold_word, gold_aligned_gold) == key_fn(words.system_word, gold_aligned_system):
+                correct[sentence] += 1
+
+    # Scores for whole aligned words do not have an aligned total, as in alignment_score
+    return [Score(gold[i], system[i], correct[i], aligned[i] if key_fn is not None else None)
+            for i in range(len(sentence_starts))]
+
+
+# In-memory file with the given text, returning the same type of string as the CoNLL-U files in both Python 2 and Python 3
+def text_file(text):
+    return (io.StringIO if sys.version_info >= (3, 0) else io.BytesIO)(text)
+
+
+# Load every sentence of the given CoNLL-U file separately, yielding a UDRepresentation for each one.
+def load_conllu_sentences(file):
+    lines = []
+    for line in iter(file.readline, ""):
+        lines.append(line)
+        if not line.rstrip("\r\n"):
+            yield load_conllu(text_file("".join(lines)))
+            lines = []
+    if lines:
+        # Raises the error of a file not ending with an empty line
+        yield load_conllu(text_file("".join(lines)))
+
+
+# Join consecutive sentences into a single UDRepresentation, moving their spans after the previous ones.
+def concatenate_representations(parts):
+    ud = UDRepresentation()
+    offset = 0
+    for part in parts:
+        # Words reference the span of their token, so moving the tokens moves the words as well
+        for span in part.tokens + part.sentences:
+            span.start += offset
+            span.end += offset
+        ud.tokens.extend(part.tokens)
+        ud.words.extend(part.words)
+        ud.sentences.extend(part.sentences)
+        offset += len(part.characters)
+    ud.characters = "".join(part.characters for part in parts)
+    return ud
+
+
+# A chunk can end before the given sentence if it starts with a word which is not part of a multi-word token.
+# Otherwise, the multi-word span of align_words could include words of the previous sentences when one of
+# the files has words left to align there.
+def starts_chunk(sentence):
+    return len(sentence.words) > 0 and not sentence.words[0].is_multiword
+
+
+# Read the gold and system sentences in lockstep, given as (sentence, number of characters, whether a chunk
+# can end before it) tuples, and yield pairs of lists of sentences which cover the same characters. A chunk
+# ends as soon as the sentences read from both files end at the same character, so no token, word or sentence
+# crosses it and the chunks can be evaluated independently.
+def lockstep_chunks(gold_sentences, system_sentences):
+    gold_next, system_next = next(gold_sentences, None), next(system_sentences, None)
+    gold_parts, system_parts = [], []
+    gold_length, system_length = 0, 0
+    # Once a chunk cannot end at a character, it cannot end there after reading more empty sentences either
+    # (the empty sentences at that character must be in the same chunk as the sentences starting there)
+    blocked_length = 0
+    while gold_next is not None or system_next is not None:
+        if gold_length == system_length > blocked_length:
+            if (gold_next is None or gold_next[2]) and (system_next is None or system_next[2]):
+                yield gold_parts, system_parts
+                gold_parts, system_parts = [], []
+                gold_length, system_length, blocked_length = 0, 0, 0
+            else:
+                blocked_length = gold_length
+
+        # Read from the file which is behind, the gold one first when both are at the same character
+        if gold_next is not None and (gold_length <= system_length or system_next is None):
+            gold_parts.append(gold_next[0])
+            gold_length += gold_next[1]
+            gold_next = next(gold_sentences, None)
+        else:
+            system_parts.append(system_next[0])
+            system_length += system_next[1]
+            system_next = next(system_sentences, None)
+
+    if gold_parts or system_parts:
+        # Last chunk, whose characters only match if both files end at the same character
+        yield gold_parts, system_parts
+
+
+# Read the gold and system files in lockstep, yielding pairs of UDRepresentation which cover the
+# same characters (see lockstep_chunks).
+def stream_chunks(gold_file, system_file):
+    def sentences(file):
+        for sentence in load_conllu_sentences(file):
+            yield sentence, len(sentence.characters), starts_chunk(sentence)
+
+    for gold_parts, system_parts in lockstep_chunks(sentences(gold_file), sentences(system_file)):
+        yield concatenate_representations(gold_parts), concatenate_representations(system_parts)
+
+
+# Break the reference cycles between the words and their functional children, so the words of an
+# evaluated chunk are freed right away instead of waiting for the cyclic garbage collector.
+def release_words(ud):
+    for word in ud.words:
+        word.functional_children = ()
+
+
+# Evaluate the given gold and system files (open file objects) reading them in lockstep, so that
+# only the sentences until the next common boundary are kept in memory. Gives the same scores as
+# evaluate on the whole files.
+def evaluate_stream(gold_file, system_file, metrics=None, alignment_counts=None):
+    metrics = METRICS if metrics is None else metrics
+    check_metrics(metrics, METRICS)
+
+    counts = None
+    for gold_ud, system_ud in stream_chunks(gold_file, system_file):
+        evaluation = evaluate(gold_ud, system_ud, metrics, alignment_counts)
+        release_words(gold_ud)
+        release_words(system_ud)
+        counts = add_counts(counts, evaluation)
+
+    if counts is None:
+        return evaluate(UDRepresentation(), UDRepresentation(), metrics)
+    return {metric: Score(*metric_counts) for metric, metric_counts in counts.items()}
+
+
+# Add the raw counts of the scores of an evaluation to the given counts (None for the first evaluation).
+def add_counts(counts, evaluation):
+    if counts is None:
+        return {metric: [score.gold_total, score.system_total, score.correct, score.aligned_total]
+                for metric, score in evaluation.items()}
+    for metric, score in evaluation.items():
+        metric_counts = counts[metric]
+        metric_counts[0] += score.gold_total
+        metric_counts[1] += score.system_total
+        metric_counts[2] += score.correct
+        if metric_counts[3] is not None:
+            metric_counts[3] += score.aligned_total
+    return counts
+
+
+# Same as evaluate_sentences, but reading the files in lockstep as evaluate_stream does. Yields a
+# dictionary with the Score of every metric for each gold sentence.
+def evaluate_stream_sentences(gold_file, system_file, metrics=None):
+    metrics = ["UAS", "LAS"] if metrics is None else metrics
+    check_metrics(metrics, list(ALIGNMENT_METRICS))
+
+    for gold_ud, system_ud in stream_chunks(gold_file, system_file):
+        evaluation = evaluate_sentences(gold_ud, system_ud, metrics)
+        release_words(gold_ud)
+        release_words(system_ud)
+        for index in range(len(gold_ud.sentences)):
+            yield dict((metric, evaluation[metric][index]) for metric in metrics)
+
+
+# Read every sentence of the given CoNLL-U file without parsing it, yielding its lines, its number of characters
+# and whether a chunk can end before it (see starts_chunk). Badly formed lines are left to load_conllu.
+def scan_conllu_sentences(file):
+    lines, length, starts, words_left = [], 0, None, 0
+    for line in iter(file.readline, ""):
+        lines.append(line)
+        line = line.rstrip("\r\n")
+        if not line:
+            yield "".join(lines), length, bool(starts)
+            lines, length, starts, words_left = [], 0, None, 0
+            continue
+        if words_left:
+            # Word of a multi-word token, which has no characters of its own
+            words_left -= 1
+            continue
+
+        columns = line.split("\t", FORM + 1)
+        if line.startswith("#") or len(columns) <= FORM or "." in columns[ID]:
+            continue
+        if starts is None:
+            starts = "-" not in columns[ID]
+        length += len(remove_spaces(_decode(columns[FORM])))
+        if "-" in columns[ID]:
+            try:
+                start, end = map(int, columns[ID].split("-"))
+                words_left = end - start + 1
+            except ValueError:
+                pass
+    if lines:
+        # Raises the error of a file not ending with an empty line
+        yield "".join(lines), length, False
+
+
+# Number of gold sentences (at least) in each chunk evaluated by a process of evaluate_parallel.
+PARALLEL_CHUNK_SENTENCES = 1000
+
+
+# Split the gold and system files into pairs of texts which cover the same characters (see lockstep_chunks),
+# with at least the given number of gold sentences each.
+def parallel_chunks(gold_file, system_file, chunk_sentences=PARALLEL_CHUNK_SENTENCES):
+    gold_parts, system_parts = [], []
+    for gold, system in lockstep_chunks(scan_conllu_sentences(gold_file), scan_conllu_sentences(system_file)):
+        gold_parts.extend(gold)
+        system_parts.extend(system)
+        if len(gold_parts) >= chunk_sentences:
+            yield "".join(gold_parts), "".join(system_parts)
+            gold_parts, system_parts = [], []
+    if gold_parts or system_parts:
+        yield "".join(gold_parts), "".join(system_parts)
+
+
+def evaluate_chunk(gold_text, system_text, metrics):
+    alignment_counts = new_alignment_counts()
+    evaluation = evaluate(load_conllu(text_file(gold_text)), load_conllu(text_file(system_text)), metrics, alignment_counts)
+    return evaluation, alignment_counts
+
+
+# Evaluate the given gold and system files (open file objects) in the given number of processes, each one
+# evaluating chunks of sentences which cover the same characters in both files. The raw counts of the chunks
+# are added, so the scores are the same as the ones of evaluate on the whole files.
+def evaluate_parallel(gold_file, system_file, metrics=None, jobs=2, chunk_sentences=PARALLEL_CHUNK_SENTENCES, alignment_counts=None):
+    metrics = METRICS if metrics is None else metrics
+    check_metrics(metrics, METRICS)
+
+    counts = None
+    # Only a few chunks per process are waiting to be evaluated, so the files are not read whole
+    pending = collections.deque()
+    pool = multiprocessing.Pool(jobs)
+    try:
+        for gold_text, system_text in parallel_chunks(gold_file, system_file, chunk_sentences):
+            pending.append(pool.apply_async(evaluate_chunk, (gold_text, system_text, metrics)))
+            while len(pending) > 2 * jobs or (pending and pending[0].ready()):
+                counts = add_chunk_counts(counts, pending.popleft().get(), alignment_counts)
+        while pending:
+            counts = add_chunk_counts(counts, pending.popleft().get(), alignment_counts)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    if counts is None:
+        return evaluate(UDRepresentation(), UDRepresentation(), metrics)
+    return {metric: Score(*metric_counts) for metric, metric_counts in counts.items()}
+
+
+def add_chunk_counts(counts, result, alignment_counts=None):
+    evaluation, chunk_alignment_counts = result
+    if alignment_counts is not None:
+        for key, count in chunk_alignment_counts.items():
+            alignment_counts[key] += count
+    return add_counts(counts, evaluation)
+
+
+def load_conllu_file(path):
+    with open(path, mode="r", **({"encoding": "utf-8"} if sys.version_info >= (3, 0) else {})) as _file:
+        return load_conllu(_file)
+
+
+# Flatten a UDRepresentation (loaded using load_conllu) into a dictionary of NumPy arrays, which can be saved,
+# memory-mapped or shared between processes, and turned back into a UDRepresentation by restore_conllu without
+# parsing the CoNLL-U file again. The column values are replaced by their index in a vocabulary.
+def flatten_conllu(ud):
+    words = ud.words
+    values = list(itertools.chain.from_iterable(map(operator.attrgetter("columns"), words)))
+    vocabulary = list(dict.fromkeys(values))
+    vocabulary_index = dict(zip(vocabulary, itertools.count()))
+    token_index = dict(zip(ud.tokens, itertools.count()))
+    word_index = dict(zip(words, itertools.count()))
+    word_index[None] = -1
+
+    def spans(spans):
+        return numpy.array([(span.start, span.end) for span in spans], dtype=numpy.int64).reshape(-1, 2)
+
+    def text(string):
+        return numpy.frombuffer(string.encode("utf-8"), dtype=numpy.uint8)
+
     return {
-        "Tokens": spans_score(gold_ud.tokens, system_ud.tokens),
-        "Sentences": spans_score(gold_ud.sentences, system_ud.sentences),
-        "Words": alignment_score(alignment),
-        "UPOS": alignment_score(alignment, lambda w, _: w.columns[UPOS]),
-        "XPOS": alignment_score(alignment, lambda w, _: w.columns[XPOS]),
-        "UFeats": alignment_score(alignment, lambda w, _: w.columns[FEATS]),
-        "AllTags": alignment_score(alignment, lambda w, _: (w.columns[UPOS], w.columns[XPOS], w.columns[FEATS])),
-        "Lemmas": alignment_score(alignment, lambda w, ga: w.columns[LEMMA] if ga(w).columns[LEMMA] != "_" else "_"),
-        "UAS": alignment_score(alignment, lambda w, ga: ga(w.parent)),
-        "LAS": alignment_score(alignment, lambda w, ga: (ga(w.parent), w.columns[DEPREL])),
-        "CLAS": alignment_score(alignment, lambda w, ga: (ga(w.parent), w.columns[DEPREL]),
-                                filter_fn=lambda w: w.is_content_deprel),
-        "MLAS": alignment_score(alignment,
-                                lambda w, ga: (ga(w.parent), w.columns[DEPREL], w.columns[UPOS], w.columns[FEATS],
-                                               [(ga(c), c.columns[DEPREL], c.columns[UPOS], c.columns[FEATS])
-                                                for c in w.functional_children]),
-                                filter_fn=lambda w: w.is_content_deprel),
-        "BLEX": alignment_score(alignment, lambda w, ga: (ga(w.parent), w.columns[DEPREL],
-                                                          w.columns[LEMMA] if ga(w).columns[LEMMA] != "_" else "_"),
-                                filter_fn=lambda w: w.is_content_deprel),
+        "characters": text(ud.characters),
+        "tokens": spans(ud.tokens),
+        "sentences": spans(ud.sentences),
+        "word_tokens": numpy.fromiter(map(token_index.__getitem__, map(operator.attrgetter("span"), words)),
+                                      dtype=numpy.int64, count=len(words)),
+        "word_multiword": numpy.fromiter(map(operator.attrgetter("is_multiword"), words), dtype=bool, count=len(words)),
+        "word_parents": numpy.fromiter(map(word_index.__getitem__, map(operator.attrgetter("parent"), words)),
+                                       dtype=numpy.int64, count=len(words)),
+        "word_columns": numpy.fromiter(map(vocabulary_index.__getitem__, values), dtype=numpy.int64, count=len(values)).reshape(-1, 10),
+        "vocabulary": text("".join(vocabulary)),
+        "vocabulary_offsets": numpy.cumsum([0] + list(map(len, vocabulary)), dtype=numpy.int64),
     }
 
 
-def load_conllu_file(path):
-    _file = open(path, mode="r", **({"encoding": "utf-8"} if sys.version_info >= (3, 0) else {}))
-    return load_conllu(_file)
+# Column values of the arrays given by flatten_conllu, in the order of their indices.
+def decode_vocabulary(arrays):
+    text = arrays["vocabulary"].tobytes().decode("utf-8")
+    offsets = arrays["vocabulary_offsets"].tolist()
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+# Build the UDRepresentation of the arrays given by flatten_conllu.
+def restore_conllu(arrays):
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        ud = UDRepresentation()
+        ud.characters = arrays["characters"].tobytes().decode("utf-8")
+        ud.tokens = list(map(UDSpan, arrays["tokens"][:, 0].tolist(), arrays["tokens"][:, 1].tolist()))
+        ud.sentences = list(map(UDSpan, arrays["sentences"][:, 0].tolist(), arrays["sentences"][:, 1].tolist()))
+
+        value = decode_vocabulary(arrays).__getitem__
+        # The FEATS and DEPREL values are already normalized, and normalizing them again keeps them as they are
+        tokens = [ud.tokens[index] for index in arrays["word_tokens"].tolist()]
+        ud.words = words = list(map(UDWord, tokens, [list(map(value, columns)) for columns in arrays["word_columns"].tolist()],
+                                    arrays["word_multiword"].tolist(), itertools.repeat(normalized_values())))
+
+        for word, parent in zip(words, arrays["word_parents"].tolist()):
+            if parent >= 0:
+                word.parent = words[parent]
+                if word.is_functional_deprel:
+                    if word.parent.functional_children:
+                        word.parent.functional_children.append(word)
+                    else:
+                        word.parent.functional_children = [word]
+        return ud
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+# Gold treebank kept as the arrays given by flatten_conllu (which can be memory-mapped), without the UDWord
+# instances of restore_conllu. It is evaluated against a system UDRepresentation by evaluate_arrays.
+class UDArrays:
+    def __init__(self, arrays):
+        # UTF-8 encoded characters and the (start, end) character indices of the tokens and sentences
+        self.characters = arrays["characters"]
+        self.tokens = arrays["tokens"]
+        self.sentences = arrays["sentences"]
+        # Token, multi-word flag, HEAD (index of the parent word, -1 for the root) and column value indices of each word
+        self.word_tokens = arrays["word_tokens"]
+        self.word_multiword = arrays["word_multiword"]
+        self.word_parents = arrays["word_parents"]
+        self.word_columns = arrays["word_columns"]
+        self.vocabulary = decode_vocabulary(arrays)
+        self.vocabulary_index = dict(zip(self.vocabulary, itertools.count()))
+
+    # (start, end) character indices of the span of each word
+    def word_spans(self):
+        return self.tokens[self.word_tokens]
+
+
+# (start, end) character indices of the spans of the given UDSpan (or UDWord) instances.
+def span_arrays(spans):
+    starts = numpy.fromiter(map(operator.attrgetter("start"), spans), dtype=numpy.int64, count=len(spans))
+    ends = numpy.fromiter(map(operator.attrgetter("end"), spans), dtype=numpy.int64, count=len(spans))
+    return numpy.stack([starts, ends], axis=1)
+
+
+# Same as spans_score, for gold spans given as an array of (start, end) rows. Both spans_score and the arrays
+# pair the n-th gold span with the n-th system span starting at the same character.
+def spans_score_arrays(gold_spans, system_spans):
+    system_spans = span_arrays(system_spans)
+
+    def keys(spans):
+        starts = spans[:, 0]
+        ranks = numpy.arange(len(starts)) - numpy.searchsorted(starts, starts, side="left")
+        return starts, ranks
+
+    gold_starts, gold_ranks = keys(gold_spans)
+    system_starts, system_ranks = keys(system_spans)
+    rank_limit = max(gold_ranks.max(initial=0), system_ranks.max(initial=0)) + 1
+    _, gold_indices, system_indices = numpy.intersect1d(gold_starts * rank_limit + gold_ranks, system_starts * rank_limit + system_ranks,
+                                                        assume_unique=True, return_indices=True)
+    correct = int((gold_spans[gold_indices, 1] == system_spans[system_indices, 1]).sum())
+    return Score(len(gold_spans), len(system_spans), correct)
+
+
+# Same as check_characters, without decoding the gold characters unless they differ.
+def check_characters_arrays(gold, system_ud):
+    system_characters = numpy.frombuffer(system_ud.characters.encode("utf-8"), dtype=numpy.uint8)
+    if not numpy.array_equal(gold.characters, system_characters):
+        check_texts(_decode(gold.characters.tobytes().decode("utf-8")), system_ud.characters)
+
+
+# Same as align_words, for words given by lists of their span starts, span ends, multi-word flags and a function
+# returning the lowercased FORMs of a range of them. Returns the lists of the indices of the aligned gold and
+# system words.
+def align_word_spans(gold, system):
+    (gold_starts, gold_ends, gold_multiword, gold_forms), (system_starts, system_ends, system_multiword, system_forms) = gold, system
+    gold_aligned, system_aligned = [], []
+
+    def beyond_end(starts, ends, multiword, i, multiword_span_end):
+        if i >= len(starts):
+            return True
+        if multiword[i]:
+            return starts[i] >= multiword_span_end
+        return ends[i] > multiword_span_end
+
+    def extend_end(ends, multiword, i, multiword_span_end):
+        if multiword[i] and ends[i] > multiword_span_end:
+            return ends[i]
+        return multiword_span_end
+
+    gi, si = 0, 0
+    while gi < len(gold_starts) and si < len(system_starts):
+        if gold_multiword[gi] or system_multiword[si]:
+            # A: Multi-word tokens => align via LCS within the whole "multiword span" (see find_multiword_span).
+            if gold_multiword[gi]:
+                multiword_span_end = gold_ends[gi]
+                if not system_multiword[si] and system_starts[si] < gold_starts[gi]:
+                    si += 1
+            else:
+                multiword_span_end = system_ends[si]
+                if not gold_multiword[gi] and gold_starts[gi] < system_starts[si]:
+                    gi += 1
+            gs, ss = gi, si
+            while not beyond_end(gold_starts, gold_ends, gold_multiword, gi, multiword_span_end) or \
+                    not beyond_end(system_starts, system_ends, system_multiword, si, multiword_span_end):
+                if gi < len(gold_starts) and (si >= len(system_starts) or gold_starts[gi] <= system_starts[si]):
+                    multiword_span_end = extend_end(gold_ends, gold_multiword, gi, multiword_span_end)
+                    gi += 1
+                else:
+                    multiword_span_end = extend_end(system_ends, system_multiword, si, multiword_span_end)
+                    si += 1
 
+            if si > ss and gi > gs:
+                span_gold_forms, span_system_forms = gold_forms(gs, gi), system_forms(ss, si)
+                lcs = compute_lcs(span_gold_forms, span_system_forms)
+
+                # Store aligned words
+                s, g = 0, 0
+                while g < gi - gs and s < si - ss:
+                    if span_gold_forms[g] == span_system_forms[s]:
+                        gold_aligned.append(gs + g)
+                        system_aligned.append(ss + s)
+                        g += 1
+                        s += 1
+                    elif lcs[g][s] == lcs[g + 1][s]:
+                        g += 1
+                    else:
+                        s += 1
+        else:
+            # B: No multi-word token => align according to spans.
+            if gold_starts[gi] == system_starts[si] and gold_ends[gi] == system_ends[si]:
+                gold_aligned.append(gi)
+                system_aligned.append(si)
+                gi += 1
+                si += 1
+            elif gold_starts[gi] <= system_starts[si]:
+                gi += 1
+            else:
+                si += 1
+
+    return gold_aligned, system_aligned
+
+
+# Same as align, returning the arrays of the indices of the aligned gold and system words.
+def align_arrays(gold, system_ud, alignment_counts=None):
+    gold_spans, system_spans = gold.word_spans(), span_arrays(list(map(operator.attrgetter("span"), system_ud.words)))
+    system_multiword = numpy.fromiter(map(operator.attrgetter("is_multiword"), system_ud.words), dtype=bool, count=len(system_ud.words))
+
+    def gold_forms(start, end):
+        return [gold.vocabulary[value].lower() for value in gold.word_columns[start:end, FORM].tolist()]
+
+    def system_forms(start, end):
+        return [word.columns[FORM].lower() for word in system_ud.words[start:end]]
+
+    # The words of a multi-word token are aligned by their FORMs, as in identical_alignment
+    identical = len(gold_spans) == len(system_spans) and numpy.array_equal(gold_spans, system_spans) and \
+        numpy.array_equal(gold.word_multiword, system_multiword)
+    if identical:
+        for index in numpy.flatnonzero(system_multiword).tolist():
+            if gold_forms(index, index + 1) != system_forms(index, index + 1):
+                identical = False
+                break
+    if alignment_counts is not None:
+        alignment_counts["identical" if identical else "aligned"] += 1
+    if identical:
+        return numpy.arange(len(gold_spans)), numpy.arange(len(system_spans))
+
+    gold_aligned, system_aligned = align_word_spans(
+        (gold_spans[:, 0].tolist(), gold_spans[:, 1].tolist(), gold.word_multiword.tolist(), gold_forms),
+        (system_spans[:, 0].tolist(), system_spans[:, 1].tolist(), system_multiword.tolist(), system_forms))
+    return numpy.array(gold_aligned, dtype=numpy.int64), numpy.array(system_aligned, dtype=numpy.int64)
+
+
+# Functional children of each word, given the index of the parent of each word and which words are functional:
+# the children sorted by parent (keeping the order of the words), and the start and number of the children of each word.
+def functional_children_arrays(parents, functional):
+    children = numpy.flatnonzero(functional & (parents >= 0))
+    children = children[numpy.argsort(parents[children], kind="stable")]
+    counts = numpy.bincount(parents[children], minlength=len(parents))
+    return children, numpy.cumsum(counts) - counts, counts
+
+
+# AlignmentArrays of the words aligned by align_arrays, computing the masks from the gold arrays, where the
+# values are indices into the gold vocabulary. The system values are replaced by their index in the gold
+# vocabulary, or -1 when missing (so they never match).
+class GoldArraysAlignment(AlignmentArrays):
+    def __init__(self, gold, system_ud, gold_indices, system_indices):
+        self.gold = gold
+        self.system_words = system_ud.words
+        self.gold_indices = gold_indices
+        self.system_indices = system_indices
+        self.cache = {}
+
+    def totals(self):
+        return len(self.gold.word_tokens), len(self.system_words), len(self.gold_indices)
+
+    # Whether each value of the gold vocabulary is one of the given DEPRELs, which are already normalized
+    def deprel_table(self, deprels):
+        return numpy.array([value in deprels for value in self.gold.vocabulary], dtype=bool)
+
+    def gold_deprels(self, deprels):
+        return self.deprel_table(deprels)[self.gold.word_columns[:, DEPREL]]
+
+    def content_masks(self):
+        gold_content = self.cached("gold_content", lambda: self.gold_deprels(CONTENT_DEPRELS))
+        return (gold_content,
+                self.cached("system_content", lambda: self.content(self.system_words)),
+                self.cached("aligned_content", lambda: gold_content[self.gold_indices]))
+
+    # Index in the gold vocabulary of the given column of every system word
+    def system_column(self, column):
+        def compute():
+            values = map(operator.itemgetter(column), map(operator.attrgetter("columns"), self.system_words))
+            return numpy.fromiter(map(self.gold.vocabulary_index.get, values, itertools.repeat(-1)), dtype=numpy.int64,
+                                  count=len(self.system_words))
+        return self.cached(("system", column), compute)
+
+    def equal_column(self, column):
+        return self.cached(column, lambda: self.gold.word_columns[self.gold_indices, column] ==
+                           self.system_column(column)[self.system_indices])
+
+    # Index of the parent of every system word, -1 for the root
+    def system_parents(self):
+        def compute():
+            word_index = dict(zip(self.system_words, itertools.count()))
+            word_index[None] = -1
+            return numpy.fromiter(map(word_index.__getitem__, map(operator.attrgetter("parent"), self.system_words)),
+                                  dtype=numpy.int64, count=len(self.system_words))
+        return self.cached("system_parents", compute)
+
+    # Gold word aligned to every system word, -2 when not aligned (so it differs from the root)
+    def system_aligned_gold(self):
+        def compute():
+            aligned_gold = numpy.full(len(self.system_words), -2, dtype=numpy.int64)
+            aligned_gold[self.system_indices] = self.gold_indices
+            return aligned_gold
+        return self.cached("system_aligned_gold", compute)
+
+    def equal_parents(self):
+        def compute():
+            system_parents = self.system_parents()[self.system_indices]
+            system_parents = numpy.where(system_parents >= 0, self.system_aligned_gold()[system_parents], -1)
+            return self.gold.word_parents[self.gold_indices] == system_parents
+        return self.cached("parents", compute)
+
+    def equal_lemmas(self):
+        def compute():
+            missing = self.gold.word_columns[self.gold_indices, LEMMA] == self.gold.vocabulary_index.get("_", -1)
+            return missing | self.equal_column(LEMMA)
+        return self.cached("lemmas", compute)
+
+    # The children of each pair of candidates are compared all at once, as ragged arrays of the children of
+    # the candidates which have the same number of them.
+    def unequal_children(self, candidates):
+        gold_children, gold_starts, gold_counts = self.cached("gold_children", lambda: functional_children_arrays(
+            self.gold.word_parents, self.gold_deprels(FUNCTIONAL_DEPRELS)))
+        system_children, system_starts, system_counts = self.cached("system_children", lambda: functional_children_arrays(
+            self.system_parents(), numpy.fromiter(map(operator.attrgetter("is_functional_deprel"), self.system_words),
+                                                  dtype=bool, count=len(self.system_words))))
+
+        gold_words, system_words = self.gold_indices[candidates], self.system_indices[candidates]
+        unequal = gold_counts[gold_words] != system_counts[system_words]
+        compared = numpy.flatnonzero(~unequal & (gold_counts[gold_words] > 0))
+        counts = gold_counts[gold_words[compared]]
+        owners = numpy.repeat(numpy.arange(len(compared)), counts)
+        positions = numpy.arange(len(owners)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        gold_child = gold_children[gold_starts[gold_words[compared]][owners] + positions]
+        system_child = system_children[system_starts[system_words[compared]][owners] + positions]
+
+        differ = gold_child != self.system_aligned_gold()[system_child]
+        for column in (DEPREL, UPOS, FEATS):
+            differ |= self.gold.word_columns[gold_child, column] != self.system_column(column)[system_child]
+        unequal[compared[numpy.unique(owners[differ])]] = True
+        return candidates[unequal]
+
+    def sentence_indices(self, gold):
+        sentence_starts = gold.sentences[:, 0]
+
+        def sentence_of(starts):
+            return numpy.searchsorted(sentence_starts, starts, side="right") - 1
+
+        gold_sentences = sentence_of(gold.word_spans()[:, 0])
+        system_starts = numpy.fromiter((word.span.start for word in self.system_words), dtype=numpy.int64, count=len(self.system_words))
+        return gold_sentences, sentence_of(system_starts), gold_sentences[self.gold_indices]
+
+
+# Same as evaluate, for a gold treebank given as UDArrays.
+def evaluate_arrays(gold, system_ud, metrics=None, alignment_counts=None):
+    metrics = METRICS if metrics is None else metrics
+    check_metrics(metrics, METRICS)
+    check_characters_arrays(gold, system_ud)
+
+    evaluation = {}
+    arrays = None
+    for metric in metrics:
+        if metric == "Tokens":
+            evaluation[metric] = spans_score_arrays(gold.tokens, system_ud.tokens)
+        elif metric == "Sentences":
+            evaluation[metric] = spans_score_arrays(gold.sentences, system_ud.sentences)
+        else:
+            # Align words, only if one of the metrics needs it
+            if arrays is None:
+                arrays = GoldArraysAlignment(gold, system_ud, *align_arrays(gold, system_ud, alignment_counts))
+            evaluation[metric] = arrays.score(metric)
+
+    return evaluation
+
+
+# Same as evaluate_sentences, for a gold treebank given as UDArrays.
+def evaluate_sentences_arrays(gold, system_ud, metrics=None, alignment_counts=None):
+    metrics = ["UAS", "LAS"] if metrics is None else metrics
+    check_metrics(metrics, list(ALIGNMENT_METRICS))
+    check_characters_arrays(gold, system_ud)
+
+    arrays = GoldArraysAlignment(gold, system_ud, *align_arrays(gold, system_ud, alignment_counts))
+    return {metric: arrays.sentence_scores(metric, gold) for metric in metrics}
+
+
+def evaluate_wrapper(args, alignment_counts=None):
+    # Without --verbose or --counts only the official metrics are printed
+    metrics = METRICS if args.verbose or args.counts else ["LAS", "MLAS", "BLEX"]
+    if args.jobs > 1:
+        encoding = {"encoding": "utf-8"} if sys.version_info >= (3, 0) else {}
+        with open(args.gold_file, mode="r", **encoding) as gold_file, open(args.system_file, mode="r", **encoding) as system_file:
+            return evaluate_parallel(gold_file, system_file, metrics, args.jobs, alignment_counts=alignment_counts)
+    if args.stream:
+        encoding = {"encoding": "utf-8"} if sys.version_info >= (3, 0) else {}
+        with open(args.gold_file, mode="r", **encoding) as gold_file, open(args.system_file, mode="r", **encoding) as system_file:
+            return evaluate_stream(gold_file, system_file, metrics, alignment_counts)
 
-def evaluate_wrapper(args):
     # Load CoNLL-U files
     gold_ud = load_conllu_file(args.gold_file)
     system_ud = load_conllu_file(args.system_file)
-    return evaluate(gold_ud, system_ud)
+    return evaluate(gold_ud, system_ud, metrics, alignment_counts)
 
 
 def main():
@@ -515,10 +1587,19 @@ def main():
                         help="Print all metrics.")
     parser.add_argument("--counts", "-c", default=False, action="store_true",
                         help="Print raw counts of correct/gold/system/aligned words instead of prec/rec/F1 for all metrics.")
+    parser.add_argument("--stream", "-s", default=False, action="store_true",
+                        help="Read both files in lockstep instead of loading them whole, using a bounded amount of memory.")
+    parser.add_argument("--jobs", "-j", default=1, type=int,
+                        help="Number of processes evaluating chunks of sentences of both files (1 by default).")
+    parser.add_argument("--benchmark", "-b", default=False, action="store_true",
+                        help="Print the evaluation time and how many alignments had identical gold and system words.")
     args = parser.parse_args()
 
     # Evaluate
-    evaluation = evaluate_wrapper(args)
+    start = time.time()
+    alignment_counts = new_alignment_counts()
+    evaluation = evaluate_wrapper(args, alignment_counts)
+    evaluation_time = time.time() - start
 
     # Print the evaluation
     if not args.verbose and not args.counts:
@@ -531,8 +1612,7 @@ def main():
         else:
             print("Metric     | Precision |    Recall |  F1 Score | AligndAcc")
         print("-----------+-----------+-----------+-----------+-----------")
-        for metric in ["Tokens", "Sentences", "Words", "UPOS", "XPOS", "UFeats", "AllTags", "Lemmas", "UAS", "LAS",
-                       "CLAS", "MLAS", "BLEX"]:
+        for metric in METRICS:
             if args.counts:
                 print("{:11}|{:10} |{:10} |{:10} |{:10}".format(
                     metric,
@@ -550,6 +1630,11 @@ def main():
                     "{:10.2f}".format(100 * evaluation[metric].aligned_accuracy) if evaluation[metric].aligned_accuracy is not None else ""
                 ))
 
+    if args.benchmark:
+        print("Evaluation time: {:.3f} s".format(evaluation_time))
+        print("Identical words fast path: {} of {} alignments".format(
+            alignment_counts["identical"], alignment_counts["identical"] + alignment_counts["aligned"]))
+
 
 if __name__ == "__main__":
     main()
@@ -572,7 +1657,7 @@ class TestAlignment(unittest.TestCase):
                 for part in parts[1:]:
                     num_words += 1
                     lines.append("{}\t{}\t_\t_\t_\t_\t{}\t_\t_\t_".format(num_words, part, int(num_words > 1)))
-        return load_conllu((io.StringIO if sys.version_info >= (3, 0) else io.BytesIO)("\n".join(lines + ["\n"])))
+        return load_conllu(text_file("\n".join(lines + ["\n"])))
 
     def _test_exception(self, gold, system):
         self.assertRaises(UDError, evaluate, self._load_words(gold), self._load_words(system))
@@ -605,3 +1690,208 @@ class TestAlignment(unittest.TestCase):
         self._test_ok(["abc a BX c", "def d EX f"], ["ab a b", "cd c d", "ef e f"], 4)
         self._test_ok(["ab a b", "cd bc d"], ["a", "bc", "d"], 2)
         self._test_ok(["a", "bc b c", "d"], ["ab AX BX", "cd CX a"], 1)
+
+    def test_normalized_columns(self):
+        ud = load_conllu(text_file("1\ta\t_\t_\t_\tTypo=Yes|Number=Sing|Case=Nom\t0\tnsubj:pass\t_\t_\n"
+                                   "2\tb\t_\t_\t_\tTypo=Yes|Number=Sing|Case=Nom\t1\tcase\t_\t_\n\n"))
+        self.assertEqual([(word.columns[FEATS], word.columns[DEPREL]) for word in ud.words],
+                         [("Case=Nom|Number=Sing", "nsubj"), ("Case=Nom|Number=Sing", "case")])
+        self.assertEqual([(word.is_content_deprel, word.is_functional_deprel) for word in ud.words], [(True, False), (False, True)])
+        self.assertEqual(ud.words[0].functional_children, [ud.words[1]])
+
+    def test_lcs_implementations(self):
+        if numpy is None:
+            self.skipTest("NumPy is not installed")
+        generator = random.Random(42)
+        for _ in range(200):
+            gold = [generator.choice("abcd") for _ in range(generator.randint(1, 40))]
+            system = [generator.choice("abcd") for _ in range(generator.randint(1, 40))]
+            self.assertEqual(compute_lcs_numpy(gold, system).tolist(), compute_lcs_python(gold, system))
+
+    @staticmethod
+    def _random_tokens(generator, text):
+        tokens, start = [], 0
+        while start < len(text):
+            end = min(len(text), start + generator.randint(1, 6))
+            form = text[start:end]
+            if generator.random() < 0.5:
+                # Multi-word token with random words, which may or may not match the other file
+                words = [generator.choice(["a", "b", "A", "ab", "ba"]) for _ in range(generator.randint(1, 4))]
+                tokens.append(" ".join([form] + words))
+            else:
+                tokens.append(form)
+            start = end
+        return tokens
+
+    def test_random_alignment(self):
+        if numpy is None:
+            self.skipTest("NumPy is not installed")
+        global LCS_NUMPY_MIN_CELLS
+        generator = random.Random(42)
+        minimum_cells = LCS_NUMPY_MIN_CELLS
+        try:
+            for _ in range(100):
+                text = "".join(generator.choice("ab") for _ in range(generator.randint(1, 60)))
+                gold_ud = self._load_words(self._random_tokens(generator, text))
+                system_ud = self._load_words(self._random_tokens(generator, text))
+                alignments = []
+                for LCS_NUMPY_MIN_CELLS in (0, float("inf")):
+                    alignment = align_words(gold_ud.words, system_ud.words)
+                    alignments.append([(gold_ud.words.index(words.gold_word), system_ud.words.index(words.system_word))
+                                       for words in alignment.matched_words])
+                self.assertEqual(alignments[0], alignments[1])
+        finally:
+            LCS_NUMPY_MIN_CELLS = minimum_cells
+
+    @staticmethod
+    def _random_conllu(generator, tokens):
+        # Split the tokens into sentences at random, sometimes adding an empty sentence
+        lines, num_words = [], 0
+        for token in tokens:
+            if num_words and generator.random() < 0.3:
+                lines.append("\n" if generator.random() < 0.1 else "")
+                num_words = 0
+            parts = token.split(" ")
+            if len(parts) > 1:
+                lines.append("{}-{}\t{}\t_\t_\t_\t_\t_\t_\t_\t_".format(num_words + 1, num_words + len(parts) - 1, parts[0]))
+                parts = parts[1:]
+            for part in parts:
+                num_words += 1
+                lines.append("{}\t{}\t{}\t{}\t_\t{}\t{}\t{}\t_\t_".format(num_words, part, generator.choice("_ab"), generator.choice("XY"),
+                                                                           generator.choice(["_", "A=1"]),
+                                                                           generator.randint(0, 1) * int(num_words > 1),
+                                                                           generator.choice(["nsubj", "aux", "root"])))
+        return "\n".join(lines + ["\n"])
+
+    def test_stream(self):
+        generator = random.Random(42)
+        for _ in range(100):
+            text = "".join(generator.choice("ab") for _ in range(generator.randint(1, 80)))
+            tokens = self._random_tokens(generator, text)
+            gold = self._random_conllu(generator, tokens)
+            # Other sentence boundaries and a few different multi-word tokens, so the files are evaluated by several chunks
+            system = self._random_conllu(generator, [token if generator.random() < 0.8 else token.split(" ")[0] for token in tokens])
+            expected = evaluate(load_conllu(text_file(gold)), load_conllu(text_file(system)))
+            evaluation = evaluate_stream(text_file(gold), text_file(system))
+            counts = ("correct", "gold_total", "system_total", "aligned_total")
+            for metric in METRICS:
+                self.assertEqual([getattr(evaluation[metric], count) for count in counts],
+                                 [getattr(expected[metric], count) for count in counts])
+
+            expected = evaluate_sentences(load_conllu(text_file(gold)), load_conllu(text_file(system)))
+            sentences = list(evaluate_stream_sentences(text_file(gold), text_file(system)))
+            self.assertEqual([score.f1 for score in expected["LAS"]], [scores["LAS"].f1 for scores in sentences])
+
+    def test_parallel(self):
+        generator = random.Random(42)
+        for _ in range(20):
+            text = "".join(generator.choice("ab") for _ in range(generator.randint(1, 200)))
+            tokens = self._random_tokens(generator, text)
+            gold = self._random_conllu(generator, tokens)
+            system = self._random_conllu(generator, [token if generator.random() < 0.8 else token.split(" ")[0] for token in tokens])
+            expected = evaluate(load_conllu(text_file(gold)), load_conllu(text_file(system)))
+            alignment_counts = new_alignment_counts()
+            evaluation = evaluate_parallel(text_file(gold), text_file(system), jobs=2, chunk_sentences=3, alignment_counts=alignment_counts)
+            counts = ("correct", "gold_total", "system_total", "aligned_total")
+            for metric in METRICS:
+                self.assertEqual([getattr(evaluation[metric], count) for count in counts],
+                                 [getattr(expected[metric], count) for count in counts])
+            # Each chunk is aligned once, and the counts of the other evaluations of the process are not added
+            chunks = len(list(parallel_chunks(text_file(gold), text_file(system), chunk_sentences=3)))
+            self.assertEqual(alignment_counts["identical"] + alignment_counts["aligned"], chunks)
+
+    def test_alignment_counts(self):
+        alignment_counts = new_alignment_counts()
+        evaluate(self._load_words(["a", "bc b c"]), self._load_words(["a", "bc b c"]), alignment_counts=alignment_counts)
+        evaluate(self._load_words(["a", "bc b c"]), self._load_words(["a", "bc"]), ["Tokens"], alignment_counts)
+        evaluate_sentences(self._load_words(["a", "bc b c"]), self._load_words(["a", "bc"]), alignment_counts=alignment_counts)
+        self.assertEqual(alignment_counts, {"identical": 1, "aligned": 1})
+
+    def test_flatten_conllu(self):
+        if numpy is None:
+            self.skipTest("NumPy is not installed")
+        generator = random.Random(42)
+        for _ in range(50):
+            text = "".join(generator.choice("ab") for _ in range(generator.randint(0, 80)))
+            gold_ud = load_conllu(text_file(self._random_conllu(generator, self._random_tokens(generator, text))))
+            system_ud = load_conllu(text_file(self._random_conllu(generator, self._random_tokens(generator, text))))
+            restored_ud = restore_conllu(flatten_conllu(gold_ud))
+            self.assertEqual(restored_ud.characters, gold_ud.characters)
+            self.assertEqual([word.columns for word in restored_ud.words], [word.columns for word in gold_ud.words])
+            counts = ("correct", "gold_total", "system_total", "aligned_total")
+            expected, evaluation = evaluate(gold_ud, system_ud), evaluate(restored_ud, system_ud)
+            for metric in METRICS:
+                self.assertEqual([getattr(evaluation[metric], count) for count in counts],
+                                 [getattr(expected[metric], count) for count in counts])
+
+    def test_alignment_arrays(self):
+        if numpy is None:
+            self.skipTest("NumPy is not installed")
+        generator = random.Random(42)
+        for _ in range(100):
+            text = "".join(generator.choice("ab") for _ in range(generator.randint(1, 80)))
+            tokens = self._random_tokens(generator, text)
+            gold_ud = load_conllu(text_file(self._random_conllu(generator, tokens)))
+            system_ud = load_conllu(text_file(self._random_conllu(generator, self._random_tokens(generator, text))))
+            alignment = align_words(gold_ud.words, system_ud.words)
+            arrays = AlignmentArrays(alignment)
+            counts = ("correct", "gold_total", "system_total", "aligned_total")
+            for metric, (key_fn, filter_fn) in ALIGNMENT_METRICS.items():
+                expected = alignment_score(alignment, key_fn, filter_fn)
+                self.assertEqual([getattr(arrays.score(metric), count) for count in counts],
+                                 [getattr(expected, count) for count in counts])
+                expected = alignment_sentence_scores(gold_ud, alignment, key_fn, filter_fn)
+                self.assertEqual([[getattr(score, count) for count in counts] for score in arrays.sentence_scores(metric, gold_ud)],
+                                 [[getattr(score, count) for count in counts] for score in expected])
+
+    def test_identical_alignment(self):
+        generator = random.Random(42)
+        for _ in range(100):
+            text = "".join(generator.choice("ab") for _ in range(generator.randint(1, 60)))
+            tokens = self._random_tokens(generator, text)
+            gold_ud, system_ud = self._load_words(tokens), self._load_words(tokens)
+            alignment = identical_alignment(gold_ud.words, system_ud.words)
+            expected = align_words(gold_ud.words, system_ud.words)
+            self.assertEqual([(gold_ud.words.index(words.gold_word), system_ud.words.index(words.system_word))
+                              for words in alignment.matched_words],
+                             [(gold_ud.words.index(words.gold_word), system_ud.words.index(words.system_word))
+                              for words in expected.matched_words])
+        self.assertIsNone(identical_alignment(self._load_words(["ab a b"]).words, self._load_words(["ab"]).words))
+        self.assertIsNone(identical_alignment(self._load_words(["ab a b"]).words, self._load_words(["ab a c"]).words))
+        self.assertIsNotNone(identical_alignment(self._load_words(["ab a b"]).words, self._load_words(["ab A b"]).words))
+
+    def test_evaluate_arrays(self):
+        if numpy is None:
+            self.skipTest("NumPy is not installed")
+        generator = random.Random(42)
+        counts = ("correct", "gold_total", "system_total", "aligned_total")
+        for _ in range(100):
+            text = "".join(generator.choice("ab") for _ in range(generator.randint(0, 80)))
+            tokens = self._random_tokens(generator, text)
+            gold_ud = load_conllu(text_file(self._random_conllu(generator, tokens)))
+            # Half of the system files have the gold tokenization, so the identical words fast path is taken as well
+            system_tokens = tokens if generator.random() < 0.5 else self._random_tokens(generator, text)
+            system_ud = load_conllu(text_file(self._random_conllu(generator, system_tokens)))
+            gold = UDArrays(flatten_conllu(gold_ud))
+
+            expected, evaluation = evaluate(gold_ud, system_ud), evaluate_arrays(gold, system_ud)
+            for metric in METRICS:
+                self.assertEqual([getattr(evaluation[metric], count) for count in counts],
+                                 [getattr(expected[metric], count) for count in counts])
+
+            metrics = list(ALIGNMENT_METRICS)
+            expected = evaluate_sentences(gold_ud, system_ud, metrics)
+            evaluation = evaluate_sentences_arrays(gold, system_ud, metrics)
+            for metric in metrics:
+                self.assertEqual([[getattr(score, count) for count in counts] for score in evaluation[metric]],
+                                 [[getattr(score, count) for count in counts] for score in expected[metric]])
+
+            alignment = align_words(gold_ud.words, system_ud.words)
+            gold_aligned, system_aligned = align_arrays(gold, system_ud)
+            self.assertEqual(list(zip(gold_aligned.tolist(), system_aligned.tolist())),
+                             [(gold_ud.words.index(words.gold_word), system_ud.words.index(words.system_word))
+                              for words in alignment.matched_words])
+
+        gold = UDArrays(flatten_conllu(self._load_words(["a", "bc b c"])))
+        self.assertRaises(UDError, evaluate_arrays, gold, self._load_words(["a", "bd b d"]))
+        self.assertRaises(UDError, evaluate_sentences_arrays, gold, self._load_words(["a", "b"]))
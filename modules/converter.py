@@ -4,21 +4,22 @@ from pathlib import Path
 from re import search
 from typing import List
 
-from .utils import search_files
+from .utils import search_files, transform_file, transform_files
 
 
-def walk_directories(input_path: Path, output_path: Path) -> None:
+def walk_directories(input_path: Path, output_path: Path, jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Browsing through directories to convert")
 
     input_path_name = input_path.name
     files = search_files(input_path)
-    convert_files(files, input_path_name, output_path)
+    convert_files(files, input_path_name, output_path, jobs, chunk_size)
 
 
-def convert_files(files: List[Path], input_path_name: str, output_path: Path) -> None:
+def convert_files(files: List[Path], input_path_name: str, output_path: Path, jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Converting files")
 
     pattern = '\\-(train|test|dev)\\.conllu$'
+    tasks = []
     for file in files:
         name = file.name
         result = search(pattern, name)
@@ -31,22 +32,28 @@ def convert_files(files: List[Path], input_path_name: str, output_path: Path) ->
                 output_file = file_folder.joinpath(output_name)
             else:
                 output_file = output_path.joinpath(output_name)
-            convert_file(file, output_file)
+            print(f"INFO: Converting {file} file to {output_file} file")
+            tasks.append((file, output_file))
+
+    transform_files(tasks, convert_line, jobs, chunk_size)
 
 
 def convert_file(input_file: Path, output_file: Path) -> None:
     print(f"INFO: Converting {input_file} file to {output_file} file")
 
-    with open(input_file, 'rt', encoding='UTF-8', errors="replace") as conllu, open(output_file, 'wt', encoding='UTF-8',
-                                                                                    errors="replace") as conll:
-        for line in conllu:
-            if not line.startswith("#"):
-                if line != "\n":
-                    tuples = line.split("\t")
-                    if len(tuples) == 10 and tuples[0] != '#' and '.' not in tuples[0] and '-' not in tuples[0]:
-                        tuples[8] = tuples[9] = '_'
-                        conll.write('\t'.join(tuples) + '\n')
-                else:
-                    conll.write('\n')
+    transform_file(input_file, output_file, convert_line)
+
+
+def convert_line(line: str) -> str:
+    if not line.startswith("#"):
+        if line != "\n":
+            tuples = line.split("\t")
+            if len(tuples) == 10 and tuples[0] != '#' and '.' not in tuples[0] and '-' not in tuples[0]:
+                tuples[8] = tuples[9] = '_'
+                return '\t'.join(tuples) + '\n'
             else:
-                conll.write(line)
+                return ""
+        else:
+            return '\n'
+    else:
+        return line
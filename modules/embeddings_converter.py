@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from pathlib import Path
+from typing import List
+
+from .embeddings_format import PRECISIONS, get_binary_file, get_chunks_scale, get_embeddings_files, is_binary_file, load_matrix, \
+    read_binary_chunks, read_text_chunks, scan_text_file, write_binary_chunks, write_rows
+from .utils import search_files, run_tasks
+
+
+def walk_directories(input_path: Path, output_path: Path, output_format: str, precision: str = 'float32', jobs: int = 1) -> None:
+    print("INFO: Browsing through directories to convert the embeddings")
+
+    input_path_name = input_path.name
+    files = get_embeddings_files(search_files(input_path))
+
+    convert_files(files, input_path_name, output_path, output_format, precision, jobs)
+
+
+def convert_files(files: List[Path], input_path_name: str, output_path: Path, output_format: str, precision: str = 'float32',
+                  jobs: int = 1) -> None:
+    print("INFO: Converting files")
+
+    tasks = []
+    for file in files:
+        if output_format == 'text' and not is_binary_file(file):
+            print(f"INFO: {file} file is already in the text format, skipping")
+            continue
+        # A binary file can also be stored again with another precision
+        if output_format == 'binary' and is_binary_file(file) and load_matrix(file).dtype == PRECISIONS[precision]:
+            print(f"INFO: {file} file is already in the binary format with {precision} precision, skipping")
+            continue
+        # es.vectors is converted to es.vectors.npy and es.vectors.words, and the other way around
+        if is_binary_file(file):
+            name = file.stem if output_format == 'text' else file.name
+        else:
+            name = get_binary_file(file).name
+        file_folder_name = file.parent.name
+        if file_folder_name != input_path_name:
+            file_folder = output_path.joinpath(file_folder_name)
+            file_folder.mkdir(parents=True, exist_ok=True)
+            output_file = file_folder.joinpath(name)
+        else:
+            output_file = output_path.joinpath(name)
+        tasks.append((file, output_file, precision))
+
+    run_tasks(convert_file, tasks, jobs)
+
+
+def convert_file(input_file: Path, output_file: Path, precision: str = 'float32') -> None:
+    if not is_binary_file(input_file):
+        text_to_binary(input_file, output_file, precision)
+    elif is_binary_file(output_file):
+        binary_to_binary(input_file, output_file, precision)
+    else:
+        binary_to_text(input_file, output_file)
+
+
+def text_to_binary(input_file: Path, output_file: Path, precision: str = 'float32') -> None:
+    print(f"INFO: Converting the text {input_file} file to the binary {output_file} file")
+
+    # The file is read once to know the size of the matrix, and also its largest value for the 8-bit integers, and then to fill the matrix
+    # chunk by chunk
+    rows, dimension = scan_text_file(input_file)
+    scale = 1.0
+    if precision == 'int8':
+        scale = get_chunks_scale(read_text_chunks(input_file, dimension))
+    write_binary_chunks(output_file, read_text_chunks(input_file, dimension), rows, dimension, precision, scale)
+
+
+def binary_to_binary(input_file: Path, output_file: Path, precision: str) -> None:
+    print(f"INFO: Converting the binary {input_file} file to the binary {output_file} file with {precision} precision")
+
+    rows, dimension = load_matrix(input_file).shape
+    scale = 1.0
+    if precision == 'int8':
+        scale = get_chunks_scale(read_binary_chunks(input_file))
+    write_binary_chunks(output_file, read_binary_chunks(input_file), rows, dimension, precision, scale)
+
+
+def binary_to_text(input_file: Path, output_file: Path) -> None:
+    print(f"INFO: Converting the binary {input_file} file to the text {output_file} file")
+
+    with open(output_file, 'wt', encoding='UTF-8', errors="replace") as text_file:
+        for words, vectors in read_binary_chunks(input_file):
+            write_rows(text_file, words, vectors)
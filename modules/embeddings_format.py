@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+from itertools import islice
+from os import replace
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, TextIO, Tuple
+
+import numpy
+from numpy.lib.format import open_memmap
+
+# An embeddings file in the binary format is a NumPy matrix with a row for each word (es.vectors.npy) and a text file with the words in
+# the same order, one per line (es.vectors.words)
+BINARY_SUFFIX = ".npy"
+WORDS_SUFFIX = ".words"
+BINARY_DTYPE = numpy.float32
+# Types in which the values of the binary format can be stored. The 8-bit integers are the values divided by the scale of the file, which
+# is saved in another text file (es.vectors.scale)
+PRECISIONS = {'float32': numpy.float32, 'float16': numpy.float16, 'int8': numpy.int8}
+SCALE_SUFFIX = ".scale"
+INT8_LIMIT = 127
+# Number of values read, converted or written at a time, so the memory used does not grow with the size of the file nor with the size of
+# the vectors
+CHUNK_VALUES = 1024 * 1024
+
+
+def is_binary_file(file: Path) -> bool:
+    return file.suffix == BINARY_SUFFIX
+
+
+def get_words_file(matrix_file: Path) -> Path:
+    return matrix_file.with_suffix(WORDS_SUFFIX)
+
+
+def get_scale_file(matrix_file: Path) -> Path:
+    return matrix_file.with_suffix(SCALE_SUFFIX)
+
+
+def get_binary_file(file: Path) -> Path:
+    return file.with_name(f"{file.name}{BINARY_SUFFIX}")
+
+
+def get_embeddings_files(files: List[Path]) -> List[Path]:
+    # The words and scale files of a binary embeddings file are always processed together with its matrix
+    matrix_files = {file for file in files if is_binary_file(file)}
+    return [file for file in files if not (file.suffix in (WORDS_SUFFIX, SCALE_SUFFIX) and file.with_suffix(BINARY_SUFFIX) in matrix_files)]
+
+
+def is_header(pieces: Sequence[str]) -> bool:
+    # First line of the word2vec text format with the number of words and the size of the vectors
+    return len(pieces) == 2 and pieces[0].isdigit() and pieces[1].isdigit()
+
+
+def get_chunk_rows(dimension: int) -> int:
+    return max(1, CHUNK_VALUES // max(1, dimension))
+
+
+def write_rows(file: TextIO, words: List[str], vectors: numpy.ndarray) -> None:
+    # A single format for the whole line, so each line is formatted by one operation instead of one for each value, and the lines are
+    # written one by one instead of being joined into a string as big as the chunk
+    line_format = "%s " + " ".join(["%1.6f"] * vectors.shape[1]) + " \n"
+    file.writelines(line_format % (word, *values) for word, values in zip(words, vectors.tolist()))
+
+
+def scan_text_file(input_file: Path) -> Tuple[int, int]:
+    # Number of words and size of the vectors of a text embeddings file, without keeping its lines in memory
+    rows = 0
+    dimension = 0
+    with open(input_file, 'rt', encoding='UTF-8', errors="replace") as file:
+        for line_number, line in enumerate(file, 1):
+            if line.isspace():
+                continue
+            if rows == 0:
+                pieces = line.split()
+                if line_number == 1 and is_header(pieces):
+                    continue
+                dimension = len(pieces) - 1
+            rows += 1
+
+    return rows, dimension
+
+
+def read_text_chunks(input_file: Path, dimension: int) -> Iterator[Tuple[List[str], numpy.ndarray]]:
+    chunk_rows = get_chunk_rows(dimension)
+    with open(input_file, 'rt', encoding='UTF-8', errors="replace") as file:
+        lines = []
+        for line_number, line in enumerate(file, 1):
+            if line.isspace() or (line_number == 1 and is_header(line.split())):
+                continue
+            lines.append(line)
+            if len(lines) == chunk_rows:
+                yield parse_text_rows(input_file, lines, dimension)
+                lines = []
+        if lines:
+            yield parse_text_rows(input_file, lines, dimension)
+
+
+def parse_text_rows(input_file: Path, lines: List[str], dimension: int) -> Tuple[List[str], numpy.ndarray]:
+    # The values of all the lines are parsed by NumPy at once
+    pieces = [line.split(None, 1) for line in lines]
+    words = [piece[0] for piece in pieces]
+    try:
+        vectors = numpy.fromstring(" ".join([piece[1] if len(piece) > 1 else "" for piece in pieces]), dtype=BINARY_DTYPE, sep=" ")
+    except ValueError:
+        vectors = None
+    if vectors is None or vectors.size != len(lines) * dimension:
+        for line in lines:
+            if len(line.split()) != dimension + 1:
+                raise ValueError(f"The line of the word {line.split()[0]} of {input_file} does not have {dimension} numeric values")
+        raise ValueError(f"{input_file} has values that are not numbers")
+
+    return words, vectors.reshape(len(lines), dimension)
+
+
+def create_matrix(matrix_file: Path, rows: int, dimension: int, dtype: numpy.dtype = BINARY_DTYPE) -> numpy.ndarray:
+    # The matrix is written directly to the file, so it is filled chunk by chunk without keeping it in memory
+    return open_memmap(matrix_file, mode='w+', dtype=dtype, shape=(rows, dimension))
+
+
+def load_matrix(matrix_file: Path) -> numpy.ndarray:
+    return numpy.load(matrix_file, mmap_mode='r')
+
+
+def read_scale(matrix_file: Path) -> float:
+    scale_file = get_scale_file(matrix_file)
+    if not scale_file.exists():
+        return 1.0
+    with open(scale_file, 'rt', encoding='UTF-8') as file:
+        return float(file.read())
+
+
+def write_scale(matrix_file: Path, scale: float) -> None:
+    with open(get_scale_file(matrix_file), 'wt', encoding='UTF-8') as file:
+        file.write(f"{scale!r}\n")
+
+
+def get_scale(max_value: float) -> float:
+    # The largest absolute value of the file is stored as the largest 8-bit integer
+    return max_value / INT8_LIMIT if max_value > 0 else 1.0
+
+
+def get_chunks_scale(chunks: Iterable[Tuple[List[str], numpy.ndarray]]) -> float:
+    return get_scale(max([float(numpy.abs(vectors).max(initial=0.0)) for _, vectors in chunks], default=0.0))
+
+
+def quantize(vectors: numpy.ndarray, dtype: numpy.dtype, scale: float = 1.0) -> numpy.ndarray:
+    if numpy.dtype(dtype) == numpy.int8:
+        return numpy.clip(numpy.rint(vectors / scale), -INT8_LIMIT, INT8_LIMIT).astype(numpy.int8)
+    return vectors.astype(dtype)
+
+
+def dequantize(vectors: numpy.ndarray, scale: float = 1.0) -> numpy.ndarray:
+    if vectors.dtype == numpy.int8:
+        return vectors.astype(BINARY_DTYPE) * BINARY_DTYPE(scale)
+    return vectors.astype(BINARY_DTYPE)
+
+
+def read_binary_chunks(matrix_file: Path) -> Iterator[Tuple[List[str], numpy.ndarray]]:
+    # The vectors are returned as 32-bit floats whatever the precision in which they are stored
+    matrix = load_matrix(matrix_file)
+    scale = read_scale(matrix_file)
+    start = 0
+    for words in read_words_chunks(matrix_file, get_chunk_rows(matrix.shape[1])):
+        vectors = matrix[start:start + len(words)]
+        if len(vectors) != len(words):
+            raise ValueError(f"The matrix has {len(matrix)} rows but there are more words")
+        yield words, dequantize(vectors, scale)
+        start += len(words)
+    if start != len(matrix):
+        raise ValueError(f"The matrix has {len(matrix)} rows but there are {start} words")
+
+
+def write_binary_chunks(output_file: Path, chunks: Iterable[Tuple[List[str], numpy.ndarray]], rows: int, dimension: int,
+                        precision: str = 'float32', scale: float = 1.0) -> None:
+    dtype = PRECISIONS[precision]
+    matrix = create_matrix(output_file, rows, dimension, dtype)
+    start = 0
+    max_error = 0.0
+    squared_error = 0.0
+    with open(get_words_file(output_file), 'wt', encoding='UTF-8', errors="replace") as words_file:
+        for words, vectors in chunks:
+            quantized = quantize(vectors, dtype, scale)
+            matrix[start:start + len(words)] = quantized
+            write_words(words_file, words)
+            errors = numpy.abs(dequantize(quantized, scale) - vectors)
+            max_error = max(max_error, float(errors.max(initial=0.0)))
+            squared_error += float(numpy.square(errors, dtype=numpy.float64).sum())
+            start += len(words)
+    matrix.flush()
+    if dtype == numpy.int8:
+        write_scale(output_file, scale)
+
+    if precision != 'float32':
+        mean_error = (squared_error / max(1, rows * dimension)) ** 0.5
+        print(f"INFO: Stored the values of {output_file} as {precision} ({4 // numpy.dtype(dtype).itemsize}x smaller than float32), with a "
+              f"reconstruction error of {max_error:.3g} at most and a root mean square error of {mean_error:.3g}")
+
+
+def read_words(matrix_file: Path) -> List[str]:
+    with open(get_words_file(matrix_file), 'rt', encoding='UTF-8', errors="replace") as file:
+        return [line.rstrip("\n") for line in file]
+
+
+def read_words_chunks(matrix_file: Path, chunk_rows: int) -> Iterator[List[str]]:
+    with open(get_words_file(matrix_file), 'rt', encoding='UTF-8', errors="replace") as file:
+        while True:
+            words = [line.rstrip("\n") for line in islice(file, chunk_rows)]
+            if not words:
+                break
+            yield words
+
+
+def write_words(file: TextIO, words: List[str]) -> None:
+    file.write("".join([f"{word}\n" for word in words]))
+
+
+def insert_row(matrix_file: Path, word: str, vector: numpy.ndarray, index: int) -> None:
+    # The matrix and the words are copied chunk by chunk to temporary files with the new row, which then replace the original files
+    matrix = load_matrix(matrix_file)
+    rows, dimension = matrix.shape
+    words_file = get_words_file(matrix_file)
+    temporary_matrix_file = matrix_file.with_name(f".{matrix_file.name}.tmp")
+    temporary_words_file = words_file.with_name(f".{words_file.name}.tmp")
+
+    chunk_rows = get_chunk_rows(dimension)
+    new_matrix = create_matrix(temporary_matrix_file, rows + 1, dimension, matrix.dtype)
+    for start in range(0, index, chunk_rows):
+        end = min(start + chunk_rows, index)
+        new_matrix[start:end] = matrix[start:end]
+    new_matrix[index] = quantize(numpy.asarray(vector), matrix.dtype, read_scale(matrix_file))
+    for start in range(index, rows, chunk_rows):
+        end = min(start + chunk_rows, rows)
+        new_matrix[start + 1:end + 1] = matrix[start:end]
+    new_matrix.flush()
+    del new_matrix, matrix
+
+    with open(words_file, 'rt', encoding='UTF-8', errors="replace") as original, open(temporary_words_file, 'wt', encoding='UTF-8',
+                                                                                      errors="replace") as destination:
+        for line in islice(original, index):
+            destination.write(line)
+        destination.write(f"{word}\n")
+        for line in original:
+            destination.write(line)
+
+    replace(temporary_matrix_file, matrix_file)
+    replace(temporary_words_file, words_file)
@@ -1,16 +1,28 @@
 # -*- coding: utf-8 -*-
 
+from hashlib import blake2b
 from pathlib import Path
 from re import search
-from typing import List
+from typing import Iterator, List, Optional
 
 import numpy
 
+from .embeddings_format import get_binary_file, get_chunk_rows, get_scale, write_binary_chunks, write_rows
+from .utils import run_tasks
+from .vocabulary import CONLLU_PATTERN, VOCABULARY_PATTERN, count_vocabulary, read_vocabulary
 
-def walk_directories(input_path: Path, output_path: Path, dimensions: int) -> None:
+# Fixed seed to be able to reproduce the experiments
+EMBEDDINGS_SEED = 42
+# Increment of the splitmix64 generator (the golden ratio)
+SPLITMIX_GAMMA = numpy.uint64(0x9E3779B97F4A7C15)
+
+
+def walk_directories(input_path: Path, output_path: Path, dimensions: int, output_format: str = 'text', precision: str = 'float32',
+                     jobs: int = 1) -> None:
     print("INFO: Browsing through directories to generate")
 
-    pattern = '\\-(train|dev)\\.conllu$'
+    # A folder may have a vocabulary written by the vocab command instead of the training and validation files
+    pattern = f"{CONLLU_PATTERN}|{VOCABULARY_PATTERN}"
     input_path_name = input_path.name
     files_to_generate = []
     files_root_folder = []
@@ -30,83 +42,101 @@ def walk_directories(input_path: Path, output_path: Path, dimensions: int) -> No
     if files_root_folder:
         files_to_generate.append(files_root_folder)
 
-    generate_files(files_to_generate, dimensions, input_path_name, output_path)
+    generate_files(files_to_generate, dimensions, input_path_name, output_path, output_format, precision, jobs)
 
 
-def generate_files(file_groups: List[List[Path]], dimensions: int, input_folder_name: str, output_path: Path) -> None:
+def generate_files(file_groups: List[List[Path]], dimensions: int, input_folder_name: str, output_path: Path, output_format: str = 'text',
+                   precision: str = 'float32', jobs: int = 1) -> None:
     print("INFO: Generating files")
 
+    tasks = []
     for file_group in file_groups:
-        train_file = file_group[0]
-        dev_file = file_group[1]
+        vocabulary_files = [file for file in file_group if search(VOCABULARY_PATTERN, file.name) is not None]
+        if vocabulary_files:
+            # The vectors are generated for the words of each vocabulary, which already has the name of the language
+            group_tasks = [(vocabulary_file, None, vocabulary_file.stem) for vocabulary_file in vocabulary_files]
+        else:
+            train_file = file_group[0]
+            dev_file = file_group[1]
+            group_tasks = [(train_file, dev_file, train_file.name.split("_")[0])]
 
-        raw_file_name = train_file.name
-        pieces = raw_file_name.split("_")
-        if len(pieces) > 0:
-            language_abbreviation = pieces[0]
+        for input_file, dev_file, language_abbreviation in group_tasks:
             output_file_name = f"{language_abbreviation}.vectors"
-            raw_file_parent_name = file_group[0].parent.name
-
+            raw_file_parent_name = input_file.parent.name
             if raw_file_parent_name != input_folder_name:
                 file_folder = output_path.joinpath(raw_file_parent_name)
                 file_folder.mkdir(parents=True, exist_ok=True)
                 output_file = file_folder.joinpath(output_file_name)
             else:
                 output_file = output_path.joinpath(output_file_name)
+            if output_format == 'binary':
+                output_file = get_binary_file(output_file)
 
-            words = get_words(train_file, dev_file)
-            random_embeddings = generate_vectors(words, dimensions)
-            write_embeddings(output_file, random_embeddings)
-        else:
-            print("WARNING: The format of the file name does not correspond to the one used by UD")
+            tasks.append((input_file, dev_file, output_file, dimensions, output_format, precision))
+
+    run_tasks(generate_file, tasks, jobs)
+
+
+def generate_file(input_file: Path, dev_file: Optional[Path], output_file: Path, dimensions: int, output_format: str = 'text',
+                  precision: str = 'float32') -> None:
+    words = read_vocabulary(input_file) if dev_file is None else get_words(input_file, dev_file)
+    if output_format == 'binary':
+        write_binary_embeddings(output_file, words, dimensions, precision)
+    else:
+        write_embeddings(output_file, words, dimensions)
 
 
 def get_words(train_file: Path, dev_file: Path) -> List[str]:
     print(f"INFO: Getting words from {train_file.name} file and {dev_file.name} file")
 
-    train_words = read_file(train_file)
-    dev_words = read_file(dev_file)
-    unique_words = list(set(train_words + dev_words))
+    # The words keep the order in which they first appear, so the file is the same in every run
+    return list(count_vocabulary([train_file, dev_file]))
 
-    return unique_words
 
+def generate_vectors(words: List[str], dimension: int, seed: int = EMBEDDINGS_SEED) -> numpy.ndarray:
+    # The vector of each word only depends on the seed and the word, so it is the same whatever the chunk or the process that generates
+    # it. Each value is the output of a splitmix64 sequence started from the hash of the word, mapped to [-1 / (2 * dimension),
+    # 1 / (2 * dimension)).
+    word_hashes = numpy.fromiter((int.from_bytes(blake2b(word.encode('UTF-8'), digest_size=8).digest(), 'little') for word in words),
+                                 dtype=numpy.uint64, count=len(words))
+    word_states = splitmix64(word_hashes ^ numpy.uint64(seed))
+    states = word_states[:, None] + numpy.arange(1, dimension + 1, dtype=numpy.uint64) * SPLITMIX_GAMMA
+    uniform = (splitmix64(states) >> numpy.uint64(11)).astype(numpy.float64) * 2.0 ** -53
 
-def read_file(input_file: Path) -> List[str]:
-    print(f"INFO: Reading {input_file.name} file")
+    low_side = -(1 / (2 * dimension))
+    high_side = 1 / (2 * dimension)
+    return low_side + (high_side - low_side) * uniform
 
-    words = []
-    with open(input_file, 'rt', encoding='UTF-8', errors="replace") as file:
-        for line in file:
-            pieces = line.split()
-            if len(pieces) > 0:
-                word = pieces[1]
-                words.append(word)
-            else:
-                continue
 
-    return words
+def splitmix64(values: numpy.ndarray) -> numpy.ndarray:
+    # Mixing function of the splitmix64 generator, applied to every value of the array (the operations wrap around on overflow)
+    values = values + SPLITMIX_GAMMA
+    values = (values ^ (values >> numpy.uint64(30))) * numpy.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> numpy.uint64(27))) * numpy.uint64(0x94D049BB133111EB)
+    return values ^ (values >> numpy.uint64(31))
 
 
-def generate_vectors(words: List[str], dimension: int) -> List[str]:
+def write_embeddings(output_file: Path, words: List[str], dimension: int) -> None:
     print(f"INFO: Generating a random vector with a dimension of {dimension} for each word")
+    print(f"INFO: Writing the random embeddings to the {output_file} file")
 
-    words_with_vectors = []
-    for word in words:
-        low_side = -(1 / (2 * dimension))
-        high_side = 1 / (2 * dimension)
-        # Fixed seed to be able to reproduce the experiments
-        random_generator = numpy.random.default_rng(42)
-        values = random_generator.uniform(low_side, high_side, dimension)
-        result = f"{word} {' '.join('%1.6f' % value for value in values)} "
-        words_with_vectors.append(result)
-
-    return words_with_vectors
+    with open(output_file, 'wt', encoding='UTF-8', errors="replace") as file:
+        for chunk in get_word_chunks(words, dimension):
+            write_rows(file, chunk, generate_vectors(chunk, dimension))
 
 
-def write_embeddings(output_file: Path, random_embeddings: List[str]) -> None:
+def write_binary_embeddings(output_file: Path, words: List[str], dimension: int, precision: str = 'float32') -> None:
+    print(f"INFO: Generating a random vector with a dimension of {dimension} for each word")
     print(f"INFO: Writing the random embeddings to the {output_file} file")
 
-    with open(output_file, 'wt', encoding='UTF-8', errors="replace") as file:
-        for random_embedding in random_embeddings:
-            file.write(random_embedding)
-            file.write("\n")
+    # The largest value of the random vectors is known, so the scale of the 8-bit integers does not need another pass over the vectors
+    chunks = ((chunk, generate_vectors(chunk, dimension)) for chunk in get_word_chunks(words, dimension))
+    write_binary_chunks(output_file, chunks, len(words), dimension, precision, get_scale(1 / (2 * dimension)))
+
+
+def get_word_chunks(words: List[str], dimension: int) -> Iterator[List[str]]:
+    # The vectors of the words are generated and written a chunk at a time, with the same number of values whatever the dimension, so the
+    # memory used grows neither with the vocabulary nor with the size of the vectors
+    chunk_words = get_chunk_rows(dimension)
+    for start in range(0, len(words), chunk_words):
+        yield words[start:start + chunk_words]
@@ -4,21 +4,22 @@ from pathlib import Path
 from re import search
 from typing import List, TextIO
 
-from modules.utils import search_files
+from modules.utils import search_files, run_tasks
 
 
-def walk_directories(input_path: Path, output_path: Path) -> None:
+def walk_directories(input_path: Path, output_path: Path, jobs: int = 1) -> None:
     print("INFO: Browsing through directories to convert")
 
     input_path_name = input_path.name
     files = search_files(input_path)
-    remove_empty_nodes(files, input_path_name, output_path)
+    remove_empty_nodes(files, input_path_name, output_path, jobs)
 
 
-def remove_empty_nodes(files: List[Path], input_path_name: str, output_path: Path) -> None:
+def remove_empty_nodes(files: List[Path], input_path_name: str, output_path: Path, jobs: int = 1) -> None:
     print("INFO: Converting files")
 
     pattern = '\\-(train|test|dev)\\.conllu$'
+    tasks = []
     for file in files:
         name = file.name
         result = search(pattern, name)
@@ -30,7 +31,9 @@ def remove_empty_nodes(files: List[Path], input_path_name: str, output_path: Pat
                 output_file = file_folder.joinpath(name)
             else:
                 output_file = output_path.joinpath(name)
-            remove(file, output_file)
+            tasks.append((file, output_file))
+
+    run_tasks(remove, tasks, jobs)
 
 
 def remove(input_file: Path, output_file: Path) -> None:
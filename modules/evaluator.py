@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+from functools import lru_cache
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.conll18_ud_eval import METRICS, evaluate, evaluate_arrays, load_conllu_file
+from modules.shared_gold import load_shared_gold, share_gold_files
+from modules.utils import run_tasks, search_files_pattern
+
+GOLD_PATTERN = '\\-test\\.conll$'
+PREDICTED_PATTERN = '\\-predicted-test\\.conll$'
+
+TABLE_COLUMNS = ['language', 'system', 'model', 'metric', 'precision', 'recall', 'f1', 'aligned_accuracy', 'correct', 'gold_total',
+                 'system_total', 'aligned_total']
+
+
+def walk_directories(gold_path: Path, predicted_paths: List[Path], output_path: Path, output_format: str, jobs: int = 1) -> None:
+    print("INFO: Browsing through directories to evaluate the predicted files")
+
+    # Only one GOLD file per language is expected
+    gold_files = {}
+    for gold_file in sorted(search_files_pattern(gold_path, GOLD_PATTERN)):
+        gold_files.setdefault(gold_file.parent.name, gold_file)
+
+    tasks = []
+    for predicted_path in predicted_paths:
+        for predicted_file in sorted(search_files_pattern(predicted_path, PREDICTED_PATTERN)):
+            language = predicted_file.parent.name
+            if language in gold_files:
+                tasks.append((predicted_file, language, gold_files[language], predicted_path.name))
+            else:
+                print(f"Error: There is no gold file for the language {language} of the predicted file {predicted_file}")
+
+    # The predicted files of the same language go one after the other, so each GOLD file is loaded once per process
+    tasks.sort(key=lambda task: task[1])
+    with TemporaryDirectory() as shared_path:
+        # With several workers, each GOLD file is parsed once by the pool and its arrays are mapped into memory by the workers
+        shared_folders = share_gold_files([task[2] for task in tasks] if jobs > 1 else [], Path(shared_path), jobs)
+        results = run_tasks(evaluate_file, [task + (shared_folders.get(task[2]),) for task in tasks], jobs)
+        load_gold_file.cache_clear()
+        load_shared_gold.cache_clear()
+
+    output_file = output_path.joinpath(f"evaluation.{output_format}")
+    write_table(output_file, get_table_rows(tasks, results), output_format)
+
+
+def evaluate_file(predicted_file: Path, language: str, gold_file: Path, system: str, shared_gold: Optional[Path] = None) -> Dict[str, Any]:
+    print(f"INFO: Evaluating the file {predicted_file.name} of the system {system} in language {language}")
+
+    predicted_ud = load_conllu_file(predicted_file)
+    if shared_gold is not None:
+        # The shared GOLD file is evaluated straight from its memory-mapped arrays
+        return evaluate_arrays(load_shared_gold(shared_gold), predicted_ud)
+
+    return evaluate(load_gold_file(gold_file), predicted_ud)
+
+
+@lru_cache(maxsize=4)
+def load_gold_file(gold_file: Path) -> Any:
+    print(f"INFO: Loading the gold file {gold_file.name}")
+
+    return load_conllu_file(gold_file)
+
+
+def get_table_rows(tasks: List[Tuple[Path, str, Path, str]], results: List[Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    rows = []
+    for (predicted_file, language, _, system), evaluation in zip(tasks, results):
+        # A file whose evaluation failed has already been reported and is left out
+        if evaluation is None:
+            continue
+        for metric in METRICS:
+            score = evaluation[metric]
+            rows.append({
+                'language': language,
+                'system': system,
+                'model': predicted_file.stem,
+                'metric': metric,
+                'precision': 100 * score.precision,
+                'recall': 100 * score.recall,
+                'f1': 100 * score.f1,
+                'aligned_accuracy': 100 * score.aligned_accuracy if score.aligned_accuracy is not None else None,
+                'correct': score.correct,
+                'gold_total': score.gold_total,
+                'system_total': score.system_total,
+                'aligned_total': score.aligned_total
+            })
+
+    return rows
+
+
+def write_table(output_file: Path, rows: List[Dict[str, Any]], output_format: str) -> None:
+    print(f"INFO: Writing the scores of {len(rows) // len(METRICS)} files to {output_file}")
+
+    with open(output_file, 'wt', encoding='UTF-8', newline='') as table:
+        if output_format == 'json':
+            json.dump(rows, table, indent=2)
+            table.write("\n")
+        else:
+            writer = csv.DictWriter(table, fieldnames=TABLE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
@@ -3,12 +3,15 @@
 from decimal import getcontext, ROUND_HALF_UP, Decimal
 from pathlib import Path
 from random import sample
-from typing import List
+from typing import Any, List
 
-from modules.utils import get_blocks_file
+import numpy
 
+from modules.indexer import load_index, read_indexed_sentences
+from modules.utils import count_sentences, read_sentences, run_tasks
 
-def walk_directories(input_path: Path, output_path: Path, percentages: List[int]) -> None:
+
+def walk_directories(input_path: Path, output_path: Path, percentages: List[int], jobs: int = 1) -> None:
     print("INFO: Browsing through directories to extract")
 
     input_path_name = input_path.name
@@ -24,12 +27,13 @@ def walk_directories(input_path: Path, output_path: Path, percentages: List[int]
         else:
             continue
 
-    extract_sentences(files, input_path_name, output_path, percentages)
+    extract_sentences(files, input_path_name, output_path, percentages, jobs)
 
 
-def extract_sentences(files: List[Path], input_path_name: str, output_path: Path, percentages: List[int]) -> None:
+def extract_sentences(files: List[Path], input_path_name: str, output_path: Path, percentages: List[int], jobs: int = 1) -> None:
     print("INFO: Extracting sentences from file")
 
+    tasks = []
     for file in files:
         for percentage in percentages:
             name = f"{file.stem}-{percentage}{file.suffix}"
@@ -40,35 +44,46 @@ def extract_sentences(files: List[Path], input_path_name: str, output_path: Path
                 output_file = file_folder.joinpath(name)
             else:
                 output_file = output_path.joinpath(name)
-            extract(file, output_file, percentage)
+            tasks.append((file, output_file, percentage))
+
+    run_tasks(extract, tasks, jobs)
 
 
 def extract(original_file: Path, output_file: Path, percentage: int) -> None:
-    blocks = get_blocks_file(original_file)
-    sentences = select_random_blocks(blocks, percentage)
-    if sentences:
-        write_sentences(output_file, sentences)
+    index = load_index(original_file)
+    total_sentences = len(index) if index is not None else count_sentences(original_file)
+    selected = select_random_sentences(total_sentences, percentage)
+    if any(selected):
+        write_sentences(original_file, output_file, selected, index)
 
 
-def select_random_blocks(blocks: List[str], percentage: int) -> List[str]:
+def select_random_sentences(total_sentences: int, percentage: int) -> bytearray:
     print(f"INFO: Selecting {percentage}% of random data")
 
-    total_blocks = len(blocks)
     context = getcontext()
     context.rounding = ROUND_HALF_UP
-    number_items = int(round(Decimal((percentage / 100) * total_blocks), 0))
+    number_items = int(round(Decimal((percentage / 100) * total_sentences), 0))
+    # One flag per sentence of the file, set for the selected ones
+    selected = bytearray(total_sentences)
     try:
-        sentences = sample(blocks, number_items)
+        for index in sample(range(total_sentences), number_items):
+            selected[index] = 1
     except ValueError:
         print(f"WARNING: The file does not contain enough sentences to select a {percentage}%, skipping")
-        sentences = []
 
-    return sentences
+    return selected
 
 
-def write_sentences(output_file: Path, sentences: List[str]) -> None:
+def write_sentences(original_file: Path, output_file: Path, selected: bytearray, index: Any = None) -> None:
     print(f"INFO: Writing data to file {output_file}")
 
     with open(output_file, 'wt', encoding='UTF-8', errors="replace") as output:
-        for block in sentences:
-            output.write(block)
+        if index is not None:
+            # Only the selected sentences are read from the file
+            sentence_numbers = numpy.flatnonzero(numpy.frombuffer(selected, dtype=numpy.uint8))
+            for sentence in read_indexed_sentences(original_file, index, sentence_numbers):
+                output.write(sentence)
+        else:
+            for number, sentence in enumerate(read_sentences(original_file)):
+                if selected[number]:
+                    output.write(sentence)
@@ -7,7 +7,8 @@ from typing import List, Any
 
 import numpy as numpy
 
-from .utils import search_files
+from .embeddings_format import get_embeddings_files, insert_row, is_binary_file, load_matrix, read_words
+from .utils import search_files, run_tasks
 
 
 def validate_parameters(tag_name: str) -> bool:
@@ -16,22 +17,32 @@ def validate_parameters(tag_name: str) -> bool:
     return tag_name.isalpha()
 
 
-def walk_directories(input_path: Path, label: str, dimension: int, position: Any) -> None:
+def walk_directories(input_path: Path, label: str, dimension: int, position: Any, jobs: int = 1) -> None:
     print("INFO: Browsing through directories to fill in")
 
-    files = search_files(input_path)
-    fill_files(files, label, dimension, position)
+    files = get_embeddings_files(search_files(input_path))
+    fill_files(files, label, dimension, position, jobs)
 
 
-def fill_files(files: List[Path], label: str, dimension: int, position: Any) -> None:
+def fill_files(files: List[Path], label: str, dimension: int, position: Any, jobs: int = 1) -> None:
     print("INFO: Filling in the files")
 
-    for file in files:
+    tasks = [(file, label, dimension, position) for file in files]
+    run_tasks(fill_in, tasks, jobs)
+
+
+def fill_in(file: Path, label: str, dimension: int, position: Any) -> None:
+    if is_binary_file(file):
+        has_unknown_tag = check_binary_unknown_tag(file, label, position)
+    else:
         has_unknown_tag = check_unknown_tag(file, label, position)
-        if not has_unknown_tag:
-            fill_file(file, label, dimension, position)
+    if not has_unknown_tag:
+        if is_binary_file(file):
+            fill_binary_file(file, label, dimension, position)
         else:
-            print(f"INFO: {file} file already has the {label} tag, skipping")
+            fill_file(file, label, dimension, position)
+    else:
+        print(f"INFO: {file} file already has the {label} tag, skipping")
 
 
 def check_unknown_tag(input_file, tag_name, position: Any) -> bool:
@@ -70,6 +81,28 @@ def fill_file(input_file: Path, label: str, dimension: int, position: Any) -> No
             add_specific_position(input_file, line, position)
 
 
+def check_binary_unknown_tag(input_file: Path, tag_name: str, position: Any) -> bool:
+    print(f"INFO: Checking if {input_file} file already has the {tag_name} tag")
+
+    words = read_words(input_file)
+
+    return tag_name in (words if position is None else words[:position])
+
+
+def fill_binary_file(input_file: Path, label: str, dimension: int, position: Any) -> None:
+    print(f"INFO: Filling in {input_file} file with {label} tag for {dimension} dimension(s)")
+
+    rows, file_dimension = load_matrix(input_file).shape
+    if file_dimension != dimension:
+        raise ValueError(f"The vectors of the file have a dimension of {file_dimension}, not {dimension}")
+
+    vector_values = generate_vector(dimension)
+    print(f"INFO: Writing data to file")
+    # Same row as the line where the label is inserted in a text file
+    index = rows if position is None else max(0, min(position - 1, rows))
+    insert_row(input_file, label, vector_values, index)
+
+
 def generate_vector(dimension: int) -> Any:
     print(f"INFO: Generating vector of random numbers with a dimension of {dimension}")
 
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List
+
+import numpy
+
+from .utils import INDEX_SUFFIX, run_tasks, search_files_pattern
+
+
+def walk_directories(input_path: Path, jobs: int = 1) -> None:
+    print("INFO: Browsing through directories to index")
+
+    pattern = '\\.conllu?$'
+    files = search_files_pattern(input_path, pattern)
+    index_files(files, jobs)
+
+
+def index_files(files: List[Path], jobs: int = 1) -> None:
+    print("INFO: Indexing files")
+
+    tasks = [(file,) for file in files]
+    run_tasks(build_index, tasks, jobs)
+
+
+def get_index_file(file: Path) -> Path:
+    return file.with_name(f"{file.name}{INDEX_SUFFIX}")
+
+
+def build_index(file: Path) -> None:
+    index_file = get_index_file(file)
+    print(f"INFO: Indexing the sentences of {file} file into {index_file} file")
+
+    status = file.stat()
+    # Start byte offset and length in bytes of each sentence, including the blank line that closes it
+    offsets = array('q')
+    lengths = array('q')
+    position = 0
+    start = None
+    with open(file, 'rb') as original:
+        for line in original:
+            if line == b"\n" or line == b"\r\n":
+                if start is not None:
+                    offsets.append(start)
+                    lengths.append(position + len(line) - start)
+                    start = None
+            elif start is None:
+                start = position
+            position += len(line)
+    # The last sentence of the file may not be followed by a blank line
+    if start is not None:
+        offsets.append(start)
+        lengths.append(position - start)
+
+    # The first row stores the size and the modification time of the indexed file to detect outdated indexes
+    index = numpy.empty((len(offsets) + 1, 2), dtype=numpy.int64)
+    index[0] = (status.st_size, status.st_mtime_ns)
+    index[1:, 0] = numpy.frombuffer(offsets, dtype=numpy.int64)
+    index[1:, 1] = numpy.frombuffer(lengths, dtype=numpy.int64)
+    with open(index_file, 'wb') as output:
+        numpy.save(output, index)
+
+
+def load_index(file: Path) -> Any:
+    index_file = get_index_file(file)
+    if not index_file.is_file():
+        return None
+
+    index = numpy.load(index_file, mmap_mode='r')
+    status = file.stat()
+    if index.ndim != 2 or len(index) == 0 or tuple(index[0]) != (status.st_size, status.st_mtime_ns):
+        print(f"WARNING: {index_file} index is outdated, rebuild it with the index command")
+        return None
+
+    print(f"INFO: Using {index_file} index")
+    return index[1:]
+
+
+def read_indexed_sentences(file: Path, index: Any, sentence_numbers: Iterable[int]) -> Iterator[str]:
+    if len(index) == 0:
+        return
+
+    with open(file, 'rb') as original, mmap(original.fileno(), 0, access=ACCESS_READ) as data:
+        for number in sentence_numbers:
+            offset, length = index[number]
+            sentence = data[offset:offset + length].decode('UTF-8', errors="replace")
+            # Same newline translation and closing blank line as utils.read_sentences
+            sentence = sentence.replace("\r\n", "\n").replace("\r", "\n")
+            if not sentence.endswith("\n"):
+                sentence += "\n"
+            if not sentence.endswith("\n\n"):
+                sentence += "\n"
+            yield sentence
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+from functools import partial
+from pathlib import Path
+from shlex import split
+from typing import Callable, List
+
+from .column_inserter import insert_line
+from .column_remover import remove_line
+from .columns_generator import generate_line
+from .columns_swapper import swap_line
+from .converter import convert_line
+from .remove_pos import remove_pos_line
+from .ud_enhancer import enhance_line
+from .utils import search_files_pattern, transform_file, transform_files
+
+# Name of each step and the number of positional arguments it expects
+STEPS = {
+    'convert': 0,
+    'columns': 0,
+    'remove-pos': 0,
+    'swap': 2,
+    'remove-column': 1,
+    'add-column': 2,
+    'enhanced-ud': 0,
+}
+
+
+def parse_steps(description: str) -> List[Callable[[str], str]]:
+    steps = []
+    for raw_step in description.split("|"):
+        pieces = split(raw_step)
+        if not pieces:
+            raise ValueError("Empty step in the pipeline")
+        name, arguments = pieces[0], pieces[1:]
+        if name not in STEPS:
+            raise ValueError(f"Unknown step '{name}', valid steps are: {', '.join(STEPS)}")
+        options = [argument for argument in arguments if argument.startswith("--")]
+        arguments = [argument for argument in arguments if not argument.startswith("--")]
+        if len(arguments) != STEPS[name]:
+            raise ValueError(f"Step '{name}' expects {STEPS[name]} argument(s), got {len(arguments)}")
+        if options and (name != 'enhanced-ud' or options != ['--keep']):
+            raise ValueError(f"Unknown option(s) {' '.join(options)} for step '{name}'")
+        steps.append(build_step(name, arguments, options))
+
+    return steps
+
+
+def build_step(name: str, arguments: List[str], options: List[str]) -> Callable[[str], str]:
+    try:
+        if name == 'convert':
+            return convert_line
+        elif name == 'columns':
+            return generate_line
+        elif name == 'remove-pos':
+            return remove_pos_line
+        elif name == 'swap':
+            return partial(swap_line, column_from=int(arguments[0]), column_to=int(arguments[1]))
+        elif name == 'remove-column':
+            return partial(remove_line, position=int(arguments[0]))
+        elif name == 'add-column':
+            return partial(insert_line, position=int(arguments[0]), content=arguments[1])
+        else:
+            return partial(enhance_line, keep_content='--keep' in options)
+    except ValueError:
+        raise ValueError(f"The positions of step '{name}' must be integers")
+
+
+def apply_steps(line: str, steps: List[Callable[[str], str]]) -> str:
+    for step in steps:
+        line = step(line)
+        # The line has been discarded by one of the steps
+        if not line:
+            break
+
+    return line
+
+
+def walk_directories(input_path: Path, output_path: Path, steps: List[Callable[[str], str]], rename: bool,
+                     jobs: int = 1, chunk_size: int = 0) -> None:
+    print("INFO: Browsing through directories to run the pipeline")
+
+    pattern = '\\.conllu?$'
+    input_path_name = input_path.name
+    files = search_files_pattern(input_path, pattern)
+
+    run_pipeline(files, input_path_name, output_path, steps, rename, jobs, chunk_size)
+
+
+def run_pipeline(files: List[Path], input_path_name: str, output_path: Path, steps: List[Callable[[str], str]], rename: bool,
+                 jobs: int = 1, chunk_size: int = 0) -> None:
+    print(f"INFO: Running a pipeline of {len(steps)} step(s)")
+
+    tasks = []
+    for file in files:
+        name = file.name
+        # Keep the naming of the convert command when the pipeline converts to CoNLL
+        output_name = name.replace("conllu", "conll") if rename else name
+        file_folder_name = file.parent.name
+        if file_folder_name != input_path_name:
+            file_folder = output_path.joinpath(file_folder_name)
+            file_folder.mkdir(parents=True, exist_ok=True)
+            output_file = file_folder.joinpath(output_name)
+        else:
+            output_file = output_path.joinpath(output_name)
+        print(f"INFO: Processing {file} file to {output_file} file")
+        tasks.append((file, output_file))
+
+    transform_files(tasks, partial(apply_steps, steps=steps), jobs, chunk_size)
+
+
+def process_file(input_file: Path, output_file: Path, steps: List[Callable[[str], str]]) -> None:
+    print(f"INFO: Processing {input_file} file to {output_file} file")
+
+    transform_file(input_file, output_file, partial(apply_steps, steps=steps))
@@ -3,33 +3,43 @@
 from pathlib import Path
 from typing import List
 
-from .utils import search_files
+from .utils import search_files, transform_file, transform_files
 
 
-def walk_directories(input_path: Path, output_path: Path) -> None:
+def walk_directories(input_path: Path, output_path: Path, jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Browsing through directories to remove POS")
 
     files = search_files(input_path)
-    remove_pos_column(files, output_path)
+    remove_pos_column(files, output_path, jobs, chunk_size)
 
 
-def remove_pos_column(files: List[Path], output_path: Path) -> None:
+def remove_pos_column(files: List[Path], output_path: Path, jobs: int = 1, chunk_size: int = 0) -> None:
     print("INFO: Removing POS information")
 
+    tasks = []
     for file in files:
         filename = file.name
         output_file = Path(output_path).joinpath(filename)
-        with open(file, 'rt', encoding='UTF-8') as pos_file, open(output_file, 'wt', encoding='UTF-8') as no_pos_file:
-            for line in pos_file:
-                if not line.startswith("#"):
-                    if line != "\n":
-                        tuples = line.split("\t")
-                        if len(tuples) == 10 and tuples[0] != '#' and '.' not in tuples[0] and '-' not in tuples[0]:
-                            tuples[3] = '_'
-                            no_pos_file.write('\t'.join(tuples))
-                        else:
-                            no_pos_file.write(line)
-                    else:
-                        no_pos_file.write("\n")
-                else:
-                    no_pos_file.write(line)
+        tasks.append((file, output_file))
+
+    # The files are decoded strictly, so a file with invalid UTF-8 fails instead of having its bytes replaced
+    transform_files(tasks, remove_pos_line, jobs, chunk_size, errors="strict")
+
+
+def remove_pos_file(input_file: Path, output_file: Path) -> None:
+    transform_file(input_file, output_file, remove_pos_line, errors="strict")
+
+
+def remove_pos_line(line: str) -> str:
+    if not line.startswith("#"):
+        if line != "\n":
+            tuples = line.split("\t")
+            if len(tuples) == 10 and tuples[0] != '#' and '.' not in tuples[0] and '-' not in tuples[0]:
+                tuples[3] = '_'
+                return '\t'.join(tuples)
+            else:
+                return line
+        else:
+            return "\n"
+    else:
+        return line
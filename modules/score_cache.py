@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from functools import lru_cache
+from hashlib import sha256
+from os import getpid, replace, utime
+from pathlib import Path
+from typing import Dict, List, Optional
+from zipfile import BadZipFile
+
+import numpy
+
+from .conll18_ud_eval import VERSION
+
+CACHE_PATH = Path.home().joinpath(".cache", "conllu-conll-tool", "scores")
+# Maximum size in bytes of the cached scores, the least recently used ones are removed above it
+CACHE_SIZE = 512 * 1024 * 1024
+# Version of the layout of the cached files
+CACHE_VERSION = 1
+
+
+def get_cache_file(gold_file: Path, predicted_file: Path, metrics: List[str]) -> Path:
+    status = gold_file.stat()
+    gold_hash = hash_file(gold_file, status.st_size, status.st_mtime_ns)
+    status = predicted_file.stat()
+    predicted_hash = hash_file(predicted_file, status.st_size, status.st_mtime_ns)
+    key = f"{gold_hash}:{predicted_hash}:{VERSION}:{CACHE_VERSION}:{','.join(metrics)}"
+
+    return CACHE_PATH.joinpath(f"{sha256(key.encode('UTF-8')).hexdigest()}.npz")
+
+
+@lru_cache(maxsize=64)
+def hash_file(file: Path, size: int, modification_time: int) -> str:
+    # The size and the modification time are only part of the memoization key, so a modified file is hashed again
+    digest = sha256()
+    with open(file, 'rb') as original:
+        for block in iter(lambda: original.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def load_scores(cache_file: Path) -> Optional[Dict[str, List[float]]]:
+    if not cache_file.is_file():
+        return None
+
+    try:
+        with numpy.load(cache_file) as data:
+            scores = {metric: data[metric].tolist() for metric in data.files}
+    except (OSError, ValueError, BadZipFile) as error:
+        print(f"WARNING: Ignoring the cached scores of {cache_file}: {error}")
+        return None
+    # The modification time records the last use of the file for the eviction
+    utime(cache_file)
+
+    return scores
+
+
+def save_scores(cache_file: Path, scores: Dict[str, List[float]]) -> None:
+    CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    # Written under a temporary name and moved, so other processes never read a partial file
+    temporary_file = cache_file.with_name(f"{cache_file.stem}.{getpid()}.tmp")
+    with open(temporary_file, 'wb') as output:
+        numpy.savez(output, **{metric: numpy.asarray(values, dtype=numpy.float64) for metric, values in scores.items()})
+    replace(temporary_file, cache_file)
+
+
+def evict_scores(maximum_size: int = CACHE_SIZE) -> None:
+    # Called once at the end of each command, as it goes through the whole cache folder
+    files = []
+    for file in CACHE_PATH.glob("*.npz"):
+        try:
+            files.append((file.stat(), file))
+        except FileNotFoundError:
+            # Removed by another process in the meantime
+            continue
+
+    total_size = sum(status.st_size for status, _ in files)
+    for status, file in sorted(files, key=lambda item: item[0].st_mtime_ns):
+        if total_size <= maximum_size:
+            break
+        try:
+            file.unlink()
+        except FileNotFoundError:
+            # Removed by another process in the meantime
+            pass
+        total_size -= status.st_size
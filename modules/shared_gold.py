@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy
+
+from .conll18_ud_eval import UDArrays, flatten_conllu, load_conllu_file
+from .utils import run_tasks
+
+
+def share_gold_files(gold_files: List[Path], shared_path: Path, jobs: int = 1) -> Dict[Path, Path]:
+    # Each GOLD file is parsed once by one of the worker processes, in parallel with the other GOLD files, and its arrays are saved to a
+    # folder of shared_path. The workers evaluating the predicted files then build the GOLD file from them instead of parsing it again.
+    gold_files = list(dict.fromkeys(gold_files))
+    tasks = [(gold_file, shared_path.joinpath(str(index))) for index, gold_file in enumerate(gold_files)]
+    shared_folders = run_tasks(share_gold_file, tasks, jobs)
+
+    # A GOLD file whose sharing failed has already been reported, the workers parse it themselves and report the error for each predicted
+    # file
+    return {gold_file: shared_folder for gold_file, shared_folder in zip(gold_files, shared_folders) if shared_folder is not None}
+
+
+def share_gold_file(gold_file: Path, shared_folder: Path) -> Path:
+    print(f"INFO: Sharing the gold file {gold_file.name} with the worker processes")
+
+    arrays = flatten_conllu(load_conllu_file(gold_file))
+    shared_folder.mkdir()
+    for name, array in arrays.items():
+        numpy.save(shared_folder.joinpath(f"{name}.npy"), array)
+
+    return shared_folder
+
+
+@lru_cache(maxsize=4)
+def load_shared_gold(shared_folder: Path) -> Any:
+    # The arrays are mapped into memory instead of being read, so their pages are shared by all the processes. The GOLD file is evaluated
+    # straight from them (see evaluate_arrays), without building a UDRepresentation with an object for each word.
+    arrays = {array_file.stem: numpy.load(array_file, mmap_mode='r') for array_file in shared_folder.glob("*.npy")}
+
+    return UDArrays(arrays)
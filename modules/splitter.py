@@ -2,14 +2,15 @@
 
 from decimal import getcontext, ROUND_HALF_UP, Decimal
 from pathlib import Path
-from random import sample
+from random import Random
 from re import search
-from typing import List, Tuple
+from typing import Any, List
 
-from modules.utils import get_blocks_file
+from modules.indexer import load_index
+from modules.utils import count_sentences, read_sentences, run_tasks
 
 
-def walk_directories(input_path: Path, output_path: Path) -> None:
+def walk_directories(input_path: Path, output_path: Path, ratio: float = 0.8, seed: Any = None, jobs: int = 1) -> None:
     print("INFO: Browsing through directories to split")
 
     input_path_name = input_path.name
@@ -25,7 +26,7 @@ def walk_directories(input_path: Path, output_path: Path) -> None:
         else:
             continue
 
-    split_training_files(files, input_path_name, output_path)
+    split_training_files(files, input_path_name, output_path, ratio, seed, jobs)
 
 
 def valid_file_split(name: str) -> bool:
@@ -38,9 +39,11 @@ def valid_file_split(name: str) -> bool:
         return False
 
 
-def split_training_files(files: List[Path], input_path_name: str, output_path: Path) -> None:
+def split_training_files(files: List[Path], input_path_name: str, output_path: Path, ratio: float = 0.8, seed: Any = None,
+                         jobs: int = 1) -> None:
     print("INFO: Splitting the training files")
 
+    tasks = []
     for file in files:
         name = file.name
         file_folder_name = file.parent.name
@@ -54,41 +57,49 @@ def split_training_files(files: List[Path], input_path_name: str, output_path: P
             output_training_file = output_path.joinpath(name)
             validation_name = name.replace("-train.", "-dev.")
             output_validation_file = output_path.joinpath(validation_name)
-        split_file(file, output_training_file, output_validation_file)
+        tasks.append((file, output_training_file, output_validation_file, ratio, seed))
 
+    run_tasks(split_file, tasks, jobs)
 
-def split_file(training_file: Path, new_training_file: Path, validation_file: Path) -> None:
+
+def split_file(training_file: Path, new_training_file: Path, validation_file: Path, ratio: float = 0.8, seed: Any = None) -> None:
     print(f"INFO: Splitting {training_file} file")
 
-    blocks = get_blocks_file(training_file)
-    training_collection, validation_collection = select_random_blocks(blocks)
-    if training_collection and validation_collection:
-        write_split_data(new_training_file, training_collection)
-        write_split_data(validation_file, validation_collection)
+    # The index avoids reading the whole file only to count its sentences
+    index = load_index(training_file)
+    total_sentences = len(index) if index is not None else count_sentences(training_file)
+    training_selection = select_random_blocks(total_sentences, ratio, seed)
+    if 0 < sum(training_selection) < total_sentences:
+        write_split_data(training_file, new_training_file, validation_file, training_selection)
+    else:
+        print(f"WARNING: The file does not contain enough sentences to make a {ratio:.0%}-{1 - ratio:.0%} split, skipping")
 
 
-def select_random_blocks(blocks: List[str]) -> Tuple[List[str], List[str]]:
+def select_random_blocks(total_blocks: int, ratio: float = 0.8, seed: Any = None) -> bytearray:
     print(f"INFO: Selecting random data")
 
-    # The file is divided into a ratio of 80% training and 20% validation
-    total_blocks = len(blocks)
+    # By default the file is divided into a ratio of 80% training and 20% validation
     context = getcontext()
     context.rounding = ROUND_HALF_UP
-    number_training_items = int(round(Decimal(0.8 * total_blocks), 0))
-    try:
-        training_collection = sample(blocks, number_training_items)
-        validation_collection = [block for block in blocks if block not in training_collection]
-    except ValueError:
-        print(f"WARNING: The file does not contain enough sentences to make an 80-20 split, skipping")
-        training_collection = []
-        validation_collection = []
-
-    return training_collection, validation_collection
-
-
-def write_split_data(new_file: Path, data_collection: List[str]) -> None:
-    print(f"INFO: Writing data to file {new_file}")
-
-    with open(new_file, 'wt', encoding='UTF-8', errors="replace") as output:
-        for block in data_collection:
-            output.write(block)
+    number_training_items = int(round(Decimal(ratio * total_blocks), 0))
+    # The sentence indices are shuffled and the first ones are assigned to the training collection, each sentence is flagged by its
+    # position so that repeated sentences are also assigned only once
+    indices = list(range(total_blocks))
+    Random(seed).shuffle(indices)
+    training_selection = bytearray(total_blocks)
+    for index in indices[:number_training_items]:
+        training_selection[index] = 1
+
+    return training_selection
+
+
+def write_split_data(training_file: Path, new_training_file: Path, validation_file: Path, training_selection: bytearray) -> None:
+    print(f"INFO: Writing data to files {new_training_file} and {validation_file}")
+
+    with open(new_training_file, 'wt', encoding='UTF-8', errors="replace") as training, open(validation_file, 'wt', encoding='UTF-8',
+                                                                                             errors="replace") as validation:
+        for index, block in enumerate(read_sentences(training_file)):
+            if training_selection[index]:
+                training.write(block)
+            else:
+                validation.write(block)
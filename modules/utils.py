@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO, TextIOWrapper
 from pathlib import Path
+from shutil import copyfileobj
 from re import search
-from typing import List
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# Suffix of the sentence index files created next to the CoNLL-U files, which are never processed as input files
+INDEX_SUFFIX = ".idx"
 
 
 def search_files_pattern(input_folder: Path, pattern: str) -> List[Path]:
@@ -26,9 +33,9 @@ def search_files(input_path: Path) -> List[Path]:
     for item in input_path.glob("*"):
         if item.is_dir() and not item.name.startswith('.'):
             for element in item.iterdir():
-                if element.is_file():
+                if element.is_file() and not element.name.endswith(INDEX_SUFFIX):
                     files.append(element)
-        elif item.is_file() and not item.name.startswith('.'):
+        elif item.is_file() and not item.name.startswith('.') and not item.name.endswith(INDEX_SUFFIX):
             files.append(item)
         else:
             continue
@@ -36,18 +43,155 @@ def search_files(input_path: Path) -> List[Path]:
     return files
 
 
-def get_blocks_file(file: Path) -> List[str]:
-    print(f"INFO: Reading {file} file")
-
-    blocks = []
-    block = ""
+def read_sentences(file: Path) -> Iterator[str]:
     with open(file, 'rt', encoding='UTF-8', errors="replace") as original:
+        lines = []
         for line in original:
             if line == "\n":
-                block += "\n"
-                blocks.append(block)
-                block = ""
+                # Consecutive blank lines do not produce empty sentences
+                if lines:
+                    lines.append(line)
+                    yield "".join(lines)
+                    lines = []
             else:
-                block += line
+                lines.append(line)
+
+    # The last sentence of the file may not be followed by a blank line
+    if lines:
+        if not lines[-1].endswith("\n"):
+            lines.append("\n")
+        lines.append("\n")
+        yield "".join(lines)
+
+
+def count_sentences(file: Path) -> int:
+    print(f"INFO: Counting the sentences of {file} file")
+
+    return sum(1 for _ in read_sentences(file))
+
+
+def transform_file(input_file: Path, output_file: Path, transform: Callable[[str], str], errors: str = "replace") -> None:
+    with open(input_file, 'rt', encoding='UTF-8', errors=errors) as actual_file, open(output_file, 'wt', encoding='UTF-8',
+                                                                                      errors=errors) as new_file:
+        for line in actual_file:
+            new_file.write(transform(line))
+
+
+def transform_files(file_pairs: List[Tuple[Path, Path]], transform: Callable[[str], str], jobs: int = 1, chunk_size: int = 0,
+                    errors: str = "replace") -> None:
+    # Files bigger than the chunk size are cut into ranges of sentences that are transformed by different workers and stitched back
+    # together in order, so that a single huge file can also use all the workers.
+    tasks = []
+    chunked_files = []
+    for input_file, output_file in file_pairs:
+        if jobs > 1 and 0 < chunk_size < input_file.stat().st_size:
+            ranges = find_sentence_ranges(input_file, chunk_size)
+            print(f"INFO: Splitting {input_file} file into {len(ranges)} chunks of sentences")
+            parts = [output_file.with_name(f"{output_file.name}.part{index}") for index in range(len(ranges))]
+            chunked_files.append((output_file, len(tasks), parts))
+            for (start, end), part in zip(ranges, parts):
+                tasks.append((input_file, part, transform, start, end, errors))
+        else:
+            tasks.append((input_file, output_file, transform, 0, None, errors))
+
+    results = run_tasks(transform_range, tasks, jobs)
+
+    for output_file, first_task, parts in chunked_files:
+        if all(results[first_task:first_task + len(parts)]):
+            join_parts(parts, output_file)
+        else:
+            print(f"ERROR: {output_file} file has not been created because some of its chunks failed")
+            for part in parts:
+                if part.exists():
+                    part.unlink()
+
+
+def find_sentence_ranges(input_file: Path, chunk_size: int) -> List[Tuple[int, int]]:
+    ranges = []
+    size = input_file.stat().st_size
+    start = 0
+    with open(input_file, 'rb') as original:
+        while start < size:
+            end = size
+            if start + chunk_size < size:
+                original.seek(start + chunk_size)
+                # Move to the end of the current line and then to the first blank line, which closes a sentence
+                original.readline()
+                for line in iter(original.readline, b""):
+                    if line == b"\n" or line == b"\r\n":
+                        end = original.tell()
+                        break
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def transform_range(input_file: Path, output_file: Path, transform: Callable[[str], str], start: int, end: Optional[int],
+                    errors: str = "replace") -> bool:
+    if end is None:
+        transform_file(input_file, output_file, transform, errors)
+    else:
+        with open(input_file, 'rb') as original:
+            original.seek(start)
+            data = original.read(end - start)
+        # Decode the range in the same way as the whole file is decoded by transform_file
+        with TextIOWrapper(BytesIO(data), encoding='UTF-8', errors=errors) as actual_file, open(output_file, 'wt', encoding='UTF-8',
+                                                                                                errors=errors) as new_file:
+            for line in actual_file:
+                new_file.write(transform(line))
+
+    return True
+
+
+def join_parts(parts: List[Path], output_file: Path) -> None:
+    with open(output_file, 'wb') as joined:
+        for part in parts:
+            with open(part, 'rb') as piece:
+                copyfileobj(piece, joined)
+            part.unlink()
+
+
+def run_tasks(function: Callable, tasks: List[Tuple], jobs: int = 1) -> List[Any]:
+    # Each task is the tuple of arguments of a call to the function. The results are returned in the same order as the tasks and a
+    # failed task is reported and its result left as None, so that one bad file does not abort the whole batch.
+    results = []
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            futures = [executor.submit(run_captured_task, function, task) for task in tasks]
+            # The messages of each task are printed once it has finished and in the order of the tasks, so the log is deterministic
+            for task, future in zip(tasks, futures):
+                try:
+                    output, result, error = future.result()
+                except Exception as exception:
+                    output, result, error = "", None, exception
+                print(output, end="")
+                if error is not None:
+                    report_task_error(task, error)
+                results.append(result)
+    else:
+        for task in tasks:
+            try:
+                results.append(function(*task))
+            except Exception as error:
+                report_task_error(task, error)
+                results.append(None)
+
+    return results
+
+
+def run_captured_task(function: Callable, task: Tuple) -> Tuple[str, Any, Optional[Exception]]:
+    output = StringIO()
+    result, error = None, None
+    with redirect_stdout(output):
+        try:
+            result = function(*task)
+        except Exception as exception:
+            error = exception
+
+    return output.getvalue(), result, error
+
 
-    return blocks
+def report_task_error(task: Tuple, error: Exception) -> None:
+    subject = task[0] if task else "task"
+    print(f"ERROR: Processing {subject} failed: {type(error).__name__}: {error}")
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+from io import BytesIO
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .utils import find_sentence_ranges, run_tasks, search_files_pattern
+
+CONLLU_PATTERN = '\\-(train|dev)\\.conllu$'
+VOCABULARY_PATTERN = '\\.vocab$'
+VOCABULARY_SUFFIX = ".vocab"
+
+
+def walk_directories(input_path: Path, output_path: Path, min_count: int = 1, jobs: int = 1, chunk_size: int = 0) -> None:
+    print("INFO: Browsing through directories to count the vocabulary")
+
+    # The files of each language folder, or the files placed directly in the input folder, share a vocabulary
+    file_groups = {}
+    # The training file goes before the validation file, as the order of the words tied in frequency is the order of the files
+    for file in sorted(search_files_pattern(input_path, CONLLU_PATTERN), key=lambda file: (file.parent, '-dev.' in file.name, file.name)):
+        file_groups.setdefault(file.parent, []).append(file)
+
+    output_files = []
+    for folder, files in file_groups.items():
+        output_file_name = f"{files[0].name.split('_')[0]}{VOCABULARY_SUFFIX}"
+        if folder != input_path:
+            output_folder = output_path.joinpath(folder.name)
+            output_folder.mkdir(parents=True, exist_ok=True)
+            output_files.append(output_folder.joinpath(output_file_name))
+        else:
+            output_files.append(output_path.joinpath(output_file_name))
+
+    for output_file, counts in zip(output_files, count_vocabularies(list(file_groups.values()), jobs, chunk_size)):
+        if counts is None:
+            print(f"ERROR: {output_file} file has not been created because the words of some of its files could not be counted")
+        else:
+            write_vocabulary(output_file, counts, min_count)
+
+
+def count_vocabulary(files: List[Path], jobs: int = 1, chunk_size: int = 0) -> Counter:
+    return count_vocabularies([files], jobs, chunk_size)[0]
+
+
+def count_vocabularies(file_groups: List[List[Path]], jobs: int = 1, chunk_size: int = 0) -> List[Optional[Counter]]:
+    # The files of all the groups are counted by the same workers, and files bigger than the chunk size are cut into ranges of sentences
+    # counted by different workers. The counts are merged in the order of the files, so the words tied in frequency keep the order in
+    # which they first appear whatever the number of workers.
+    tasks = []
+    task_groups = []
+    for group, files in enumerate(file_groups):
+        for file in files:
+            if jobs > 1 and 0 < chunk_size < file.stat().st_size:
+                ranges = find_sentence_ranges(file, chunk_size)
+                print(f"INFO: Splitting {file} file into {len(ranges)} chunks of sentences")
+            else:
+                ranges = [(0, None)]
+            for start, end in ranges:
+                tasks.append((file, start, end))
+                task_groups.append(group)
+
+    vocabularies = [Counter() for _ in file_groups]
+    for group, counts in zip(task_groups, run_tasks(count_words, tasks, jobs)):
+        if counts is None or vocabularies[group] is None:
+            vocabularies[group] = None
+        else:
+            vocabularies[group].update(counts)
+
+    return vocabularies
+
+
+def count_words(input_file: Path, start: int = 0, end: Optional[int] = None) -> Counter:
+    print(f"INFO: Counting the words of {input_file.name} file")
+
+    with open(input_file, 'rb') as file:
+        if end is None:
+            forms = Counter(get_forms(file))
+        else:
+            file.seek(start)
+            forms = Counter(get_forms(BytesIO(file.read(end - start))))
+
+    # The forms are counted as bytes and decoded once for each different form
+    words = Counter()
+    for form, count in forms.items():
+        word = form.decode('UTF-8', errors="replace")
+        if is_word(word):
+            words[word] += count
+
+    return words
+
+
+def is_word(word: str) -> bool:
+    # The FORMs with spaces (as the syllables of a Vietnamese word) are skipped: the values of a line of the embeddings are separated by
+    # spaces, so they would be read as a shorter word followed by a value that is not a number
+    return len(word.split()) == 1
+
+
+def get_forms(lines: Iterable[bytes]) -> Iterator[bytes]:
+    # Only the lines of the words are used: comments, multiword token ranges (1-2) and empty nodes (1.1) are skipped
+    for line in lines:
+        pieces = line.split(b"\t", 2)
+        if len(pieces) > 2 and pieces[0].isdigit():
+            yield pieces[1]
+
+
+def write_vocabulary(output_file: Path, counts: Dict[str, int], min_count: int = 1) -> None:
+    # Python sorts are stable, so the words with the same frequency keep the order in which they first appear
+    words = sorted([(word, count) for word, count in counts.items() if count >= min_count], key=itemgetter(1), reverse=True)
+    print(f"INFO: Writing {len(words)} words to the {output_file} file ({len(counts) - len(words)} words appear less than {min_count} "
+          f"times)")
+
+    with open(output_file, 'wt', encoding='UTF-8', errors="replace") as file:
+        file.write("".join([f"{word}\t{count}\n" for word, count in words]))
+
+
+def read_vocabulary(vocabulary_file: Path) -> List[str]:
+    print(f"INFO: Reading {vocabulary_file.name} file")
+
+    with open(vocabulary_file, 'rt', encoding='UTF-8', errors="replace") as file:
+        # The vocabulary files counted before the FORMs with spaces were skipped may still have them
+        return [word for word in (line.rstrip("\n").split("\t", 1)[0] for line in file if line.strip()) if is_word(word)]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import io
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy
+
+from modules.calculate_ttest import compare_directories, compare_systems, paired_bootstrap_test, permutation_test
+from tests.test_evaluator import write_system
+from tests.test_utils import write_sentences
+
+
+class TestPairedTests(unittest.TestCase):
+    def test_no_sentences(self):
+        for test in (paired_bootstrap_test, permutation_test):
+            with self.assertRaisesRegex(ValueError, "no sentences to compare"):
+                test([], [], 100, numpy.random.default_rng(0))
+
+    def test_compare_systems(self):
+        # The pair without sentences is reported and left out, the other pairs are still compared
+        system_values = {'a': [([90.0, 80.0], [85.0, 75.0]), ([], [])], 'b': [([70.0, 60.0], [65.0, 55.0]), ([], [])]}
+        rows = compare_systems(system_values, 'permutation', 100, numpy.random.default_rng(0))
+        self.assertEqual([(row['model'], row['metric'], row['system_a'], row['system_b']) for row in rows],
+                         [(1, 'UAS', 'a', 'b'), (1, 'UAS', 'b', 'a'), (1, 'LAS', 'a', 'b'), (1, 'LAS', 'b', 'a')])
+        self.assertEqual([row['statistic'] for row in rows], [20.0, -20.0, 20.0, -20.0])
+
+
+class TestCompareDirectories(unittest.TestCase):
+    def test_root_files(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            gold_path = folder.joinpath("gold")
+            gold_path.joinpath("fr").mkdir(parents=True)
+            write_sentences(gold_path.joinpath("es-test.conll"), 20)
+            write_sentences(gold_path.joinpath("fr", "fr-test.conll"), 20)
+            # The files directly inside the GOLD folder and inside each system folder are the same language
+            system_paths = {'base': folder.joinpath("base"), 'large': folder.joinpath("large")}
+            for every, system_path in enumerate(system_paths.values(), 2):
+                write_system(gold_path.joinpath("es-test.conll"), system_path.joinpath("es-m1-predicted-test.conll"), every)
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                compare_directories(gold_path, system_paths, folder, 'csv', use_cache=False, test='permutation', resamples=100, seed=1)
+
+            with open(folder.joinpath("gold.csv"), 'rt', encoding='UTF-8', newline='') as table:
+                rows = list(csv.DictReader(table))
+            self.assertEqual([(row['metric'], row['system_a'], row['system_b']) for row in rows],
+                             [('UAS', 'base', 'large'), ('UAS', 'large', 'base'), ('LAS', 'base', 'large'), ('LAS', 'large', 'base')])
+            self.assertIn("WARNING: There are no predicted files for the language fr", output.getvalue())
+            self.assertFalse(folder.joinpath("fr.csv").exists())
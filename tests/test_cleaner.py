@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from modules import cleaner
+from modules.cleaner import clean_file, clean_file_in_place
+
+ROWS = "".join(f"palabra{word} 0.{word:06d} -0.{word:06d}\n" for word in range(100))
+
+
+class TestCleaner(unittest.TestCase):
+    def test_clean_in_place(self):
+        with TemporaryDirectory() as folder:
+            file = Path(folder).joinpath("es.vectors")
+            file.write_text("100 2\n" + ROWS, encoding='UTF-8')
+
+            # The blocks are smaller than the file, so the rest of the file is moved back over the first line by several blocks
+            with patch.object(cleaner, 'COPY_BLOCK_SIZE', 64):
+                clean_file_in_place(file)
+            self.assertEqual(file.read_text(encoding='UTF-8'), ROWS)
+
+            # Without the line with the number of words and the size of the vectors the file is left as it is
+            clean_file_in_place(file)
+            self.assertEqual(file.read_text(encoding='UTF-8'), ROWS)
+
+    def test_first_line_kept(self):
+        with TemporaryDirectory() as folder:
+            # A word of a single value is not the line with the number of words, even when both look like numbers
+            for first_line in ("-3 2\n", "3 2.5\n", "palabra 2\n"):
+                input_file = Path(folder).joinpath("es.vectors")
+                input_file.write_text(first_line + ROWS, encoding='UTF-8')
+                output_file = Path(folder).joinpath("clean.vectors")
+
+                clean_file(input_file, output_file)
+                clean_file_in_place(input_file)
+
+                self.assertEqual(output_file.read_text(encoding='UTF-8'), first_line + ROWS)
+                self.assertEqual(input_file.read_text(encoding='UTF-8'), first_line + ROWS)
+
+            input_file.write_text("100 2\n" + ROWS, encoding='UTF-8')
+            clean_file(input_file, output_file)
+            self.assertEqual(output_file.read_text(encoding='UTF-8'), ROWS)
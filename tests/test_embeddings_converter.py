@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy
+
+from modules import embeddings_format
+from modules.embeddings_converter import convert_file, walk_directories
+from modules.embeddings_format import get_words_file, load_matrix, read_words, write_rows
+
+
+def write_text_embeddings(file: Path, words: int, dimension: int) -> numpy.ndarray:
+    vectors = numpy.random.default_rng(0).uniform(-1, 1, size=(words, dimension)).astype(numpy.float32)
+    with open(file, 'wt', encoding='UTF-8') as text_file:
+        text_file.write(f"{words} {dimension}\n")
+        write_rows(text_file, [f"palabra{word}" for word in range(words)], vectors)
+    return vectors
+
+
+class TestEmbeddingsConverter(unittest.TestCase):
+    def test_round_trip(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            text_file = folder.joinpath("es.vectors")
+            vectors = write_text_embeddings(text_file, 50, 8)
+
+            # The chunks are smaller than the file, so the rows of several chunks are joined
+            with patch.object(embeddings_format, 'CHUNK_VALUES', 24):
+                convert_file(text_file, folder.joinpath("es.vectors.npy"))
+                convert_file(folder.joinpath("es.vectors.npy"), folder.joinpath("converted.vectors"))
+
+            self.assertEqual(read_words(folder.joinpath("es.vectors.npy")), [f"palabra{word}" for word in range(50)])
+            numpy.testing.assert_allclose(load_matrix(folder.joinpath("es.vectors.npy")), vectors, atol=1e-6)
+            # The header line is not written back, as the text files written by the other commands do not have one
+            self.assertEqual(folder.joinpath("converted.vectors").read_text(encoding='UTF-8'),
+                             "".join(text_file.read_text(encoding='UTF-8').splitlines(keepends=True)[1:]))
+
+    def test_walk_directories(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            input_path = folder.joinpath("input")
+            input_path.joinpath("es").mkdir(parents=True)
+            write_text_embeddings(input_path.joinpath("es", "es.vectors"), 10, 4)
+            output_path = folder.joinpath("output")
+            output_path.mkdir()
+
+            walk_directories(input_path, output_path, 'binary')
+
+            matrix_file = output_path.joinpath("es", "es.vectors.npy")
+            self.assertEqual(load_matrix(matrix_file).shape, (10, 4))
+            self.assertTrue(get_words_file(matrix_file).exists())
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy
+
+from modules.embeddings_format import INT8_LIMIT, dequantize, get_chunks_scale, get_scale, get_scale_file, load_matrix, quantize, \
+    read_binary_chunks, read_scale, write_binary_chunks
+
+
+class TestQuantization(unittest.TestCase):
+    def test_round_trip(self):
+        vectors = numpy.random.default_rng(0).uniform(-0.5, 0.5, size=(100, 16)).astype(numpy.float32)
+        scale = get_scale(float(numpy.abs(vectors).max()))
+
+        # The 8-bit integers are rounded to the nearest multiple of the scale, and the largest value is the largest integer
+        quantized = quantize(vectors, numpy.int8, scale)
+        self.assertEqual(quantized.dtype, numpy.int8)
+        self.assertEqual(int(numpy.abs(quantized).max()), INT8_LIMIT)
+        self.assertLessEqual(float(numpy.abs(dequantize(quantized, scale) - vectors).max()), scale / 2 + 1e-7)
+
+        quantized = quantize(vectors, numpy.float16)
+        self.assertEqual(quantized.dtype, numpy.float16)
+        self.assertEqual(dequantize(quantized).dtype, numpy.float32)
+        numpy.testing.assert_allclose(dequantize(quantized), vectors, rtol=2 ** -11)
+
+    def test_scale(self):
+        self.assertEqual(get_scale(0.0), 1.0)
+        self.assertEqual(get_chunks_scale([([], numpy.zeros((0, 4), dtype=numpy.float32))]), 1.0)
+        self.assertEqual(get_chunks_scale([(["a"], numpy.array([[0.5, -1.27]])), (["b"], numpy.array([[0.2, 0.1]]))]), 1.27 / INT8_LIMIT)
+
+    def test_binary_file(self):
+        with TemporaryDirectory() as folder:
+            vectors = numpy.random.default_rng(0).uniform(-0.5, 0.5, size=(30, 8)).astype(numpy.float32)
+            words = [f"palabra{word}" for word in range(30)]
+            chunks = [(words[:10], vectors[:10]), (words[10:], vectors[10:])]
+            for precision in ('float16', 'int8'):
+                matrix_file = Path(folder).joinpath(f"{precision}.vectors.npy")
+                scale = get_chunks_scale(chunks) if precision == 'int8' else 1.0
+                write_binary_chunks(matrix_file, chunks, 30, 8, precision, scale)
+
+                # Only the 8-bit integers have a scale file, and the values are read back as 32-bit floats
+                self.assertEqual(load_matrix(matrix_file).dtype, numpy.dtype(precision))
+                self.assertEqual(get_scale_file(matrix_file).exists(), precision == 'int8')
+                self.assertEqual(read_scale(matrix_file), scale)
+                read_words, read_vectors = zip(*read_binary_chunks(matrix_file))
+                self.assertEqual(sum(read_words, []), words)
+                read_vectors = numpy.concatenate(read_vectors)
+                self.assertEqual(read_vectors.dtype, numpy.float32)
+                self.assertLessEqual(float(numpy.abs(read_vectors - vectors).max()), scale / 2 + 1e-7 if precision == 'int8' else 1e-3)
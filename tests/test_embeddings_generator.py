@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy
+
+from modules import embeddings_format
+from modules.embeddings_format import read_binary_chunks, read_scale
+from modules.embeddings_generator import generate_vectors, write_binary_embeddings, write_embeddings
+
+WORDS = [f"palabra{word}" for word in range(200)]
+
+
+class TestEmbeddingsGenerator(unittest.TestCase):
+    def test_generate_vectors(self):
+        vectors = generate_vectors(WORDS, 10)
+        self.assertEqual(vectors.shape, (200, 10))
+        self.assertLess(float(numpy.abs(vectors).max()), 1 / 20)
+        # The vector of a word does not depend on the other words of the chunk, but it does on the seed
+        numpy.testing.assert_array_equal(generate_vectors(WORDS[150:] + WORDS[:150], 10), numpy.concatenate([vectors[150:], vectors[:150]]))
+        self.assertFalse(numpy.array_equal(generate_vectors(WORDS, 10, seed=1), vectors))
+
+    def test_chunks(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            write_embeddings(folder.joinpath("expected.vectors"), WORDS, 10)
+            # The chunks are smaller than the vocabulary, so the vectors are generated and written by several chunks
+            with patch.object(embeddings_format, 'CHUNK_VALUES', 64):
+                write_embeddings(folder.joinpath("es.vectors"), WORDS, 10)
+                write_binary_embeddings(folder.joinpath("es.vectors.npy"), WORDS, 10, 'int8')
+
+            self.assertEqual(folder.joinpath("es.vectors").read_text(encoding='UTF-8'),
+                             folder.joinpath("expected.vectors").read_text(encoding='UTF-8'))
+            # The 8-bit integers use the largest possible value of the vectors as their scale
+            scale = read_scale(folder.joinpath("es.vectors.npy"))
+            self.assertAlmostEqual(scale, 1 / 20 / 127)
+            words, vectors = zip(*read_binary_chunks(folder.joinpath("es.vectors.npy")))
+            self.assertEqual(sum(words, []), WORDS)
+            self.assertLessEqual(float(numpy.abs(numpy.concatenate(vectors) - generate_vectors(WORDS, 10)).max()), scale / 2 + 1e-7)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from modules.conll18_ud_eval import evaluate, load_conllu_file
+from modules.evaluator import walk_directories
+from tests.test_utils import write_sentences
+
+
+def write_system(gold_file: Path, system_file: Path, every: int) -> None:
+    # Every few words the DEPREL is changed, so the systems have different scores
+    lines = gold_file.read_text(encoding='UTF-8').splitlines(keepends=True)
+    for number, line in enumerate(lines):
+        if number % every == 0 and line[0].isdigit():
+            lines[number] = line.replace("\tdep\t", "\tobj\t")
+    system_file.parent.mkdir(parents=True, exist_ok=True)
+    system_file.write_text("".join(lines), encoding='UTF-8')
+
+
+class TestEvaluator(unittest.TestCase):
+    def test_walk_directories(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            gold_file = folder.joinpath("gold", "es", "es-test.conll")
+            gold_file.parent.mkdir(parents=True)
+            write_sentences(gold_file, 30)
+            system_files = [folder.joinpath(system, "es", f"es-{model}-predicted-test.conll") for system in ("base", "large")
+                            for model in ("m1", "m2")]
+            for every, system_file in enumerate(system_files, 2):
+                write_system(gold_file, system_file, every)
+
+            walk_directories(folder.joinpath("gold"), [folder.joinpath("base"), folder.joinpath("large")], folder, 'csv')
+
+            with open(folder.joinpath("evaluation.csv"), 'rt', encoding='UTF-8', newline='') as table:
+                rows = [row for row in csv.DictReader(table) if row['metric'] == 'LAS']
+            self.assertEqual([(row['system'], row['model']) for row in rows],
+                             [("base", "es-m1-predicted-test"), ("base", "es-m2-predicted-test"), ("large", "es-m1-predicted-test"),
+                              ("large", "es-m2-predicted-test")])
+            for row, system_file in zip(rows, system_files):
+                expected = evaluate(load_conllu_file(gold_file), load_conllu_file(system_file))["LAS"]
+                self.assertEqual((int(row['correct']), int(row['gold_total'])), (expected.correct, expected.gold_total))
+                self.assertAlmostEqual(float(row['f1']), 100 * expected.f1)
+            self.assertEqual(len({row['f1'] for row in rows}), 4)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from modules.extractor import extract
+from modules.indexer import build_index
+from modules.utils import read_sentences
+from tests.test_utils import write_sentences
+
+
+class TestExtractor(unittest.TestCase):
+    def test_extract(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            original_file = folder.joinpath("es-train.conllu")
+            write_sentences(original_file, 40)
+            sentences = list(read_sentences(original_file))
+
+            for indexed in (False, True):
+                if indexed:
+                    build_index(original_file)
+                output_file = folder.joinpath(f"es-train-25-{indexed}.conllu")
+                extract(original_file, output_file, 25)
+
+                # 25% of the sentences, whole and in the order of the original file
+                extracted = list(read_sentences(output_file))
+                self.assertEqual(len(extracted), 10)
+                positions = [sentences.index(sentence) for sentence in extracted]
+                self.assertEqual(positions, sorted(positions))
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from modules.indexer import build_index, get_index_file, load_index, read_indexed_sentences
+from modules.utils import read_sentences
+
+
+class TestIndexer(unittest.TestCase):
+    def test_read_indexed_sentences(self):
+        with TemporaryDirectory() as folder:
+            file = Path(folder).joinpath("es-train.conllu")
+            # Windows newlines, several blank lines and a last sentence without a blank line
+            file.write_bytes("1\ta\r\n\r\n\r\n# c\n1\tñ\n2\tb\n\n\n1\td".encode('UTF-8'))
+            build_index(file)
+            self.assertTrue(get_index_file(file).is_file())
+
+            index = load_index(file)
+            self.assertEqual(len(index), 3)
+            sentences = list(read_sentences(file))
+            self.assertEqual(list(read_indexed_sentences(file, index, [2, 0, 1])), [sentences[2], sentences[0], sentences[1]])
+
+    def test_outdated_index(self):
+        with TemporaryDirectory() as folder:
+            file = Path(folder).joinpath("es-train.conllu")
+            file.write_text("1\ta\n\n", encoding='UTF-8')
+            self.assertIsNone(load_index(file))
+            build_index(file)
+            self.assertIsNotNone(load_index(file))
+
+            # A file changed after it was indexed does not use the index, even when its size is the same
+            file.write_text("1\tb\n\n", encoding='UTF-8')
+            status = file.stat()
+            os.utime(file, ns=(status.st_atime_ns, status.st_mtime_ns + 1_000_000_000))
+            self.assertIsNone(load_index(file))
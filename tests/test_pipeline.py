@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from modules.columns_swapper import swap_line
+from modules.converter import convert_line
+from modules.pipeline import apply_steps, parse_steps, run_pipeline
+
+CONLLU = ("# text = Hola mundo\n"
+          "1-2\tHolas\t_\t_\t_\t_\t_\t_\t_\t_\n"
+          "1\tHola\thola\tINTJ\t_\t_\t0\troot\t_\tSpaceAfter=No\n"
+          "2\ts\ts\tNOUN\t_\t_\t1\tdep\t_\t_\n"
+          "2.1\tmundo\tmundo\tNOUN\t_\t_\t_\t_\t1:dep\t_\n"
+          "3\tmundo\tmundo\tNOUN\t_\t_\t1\tobj\t2:dep\t_\n"
+          "\n")
+
+
+class TestPipeline(unittest.TestCase):
+    def test_parse_steps(self):
+        self.assertEqual(len(parse_steps("convert | swap 1 2 | remove-column 3 | add-column 2 X | enhanced-ud --keep")), 5)
+        for description in ("", "convert |", "unknown", "swap 1", "swap a b", "convert --keep", "remove-column 1 2"):
+            with self.assertRaises(ValueError):
+                parse_steps(description)
+
+    def test_apply_steps(self):
+        steps = parse_steps("convert | swap 1 2")
+        for line in CONLLU.splitlines(keepends=True):
+            # The same result as running the commands one after the other, and a discarded line is not passed to the next step
+            converted = convert_line(line)
+            self.assertEqual(apply_steps(line, steps), swap_line(converted, 1, 2) if converted else "")
+
+    def test_run_pipeline(self):
+        with TemporaryDirectory() as folder:
+            input_path = Path(folder).joinpath("input")
+            output_path = Path(folder).joinpath("output")
+            input_path.joinpath("es").mkdir(parents=True)
+            output_path.mkdir()
+            input_file = input_path.joinpath("es", "es-test.conllu")
+            input_file.write_text(CONLLU * 3, encoding='UTF-8')
+
+            run_pipeline([input_file], input_path.name, output_path, parse_steps("convert | remove-column 2"), rename=True)
+
+            output = output_path.joinpath("es", "es-test.conll").read_text(encoding='UTF-8')
+            steps = parse_steps("convert | remove-column 2")
+            self.assertEqual(output, "".join(apply_steps(line, steps) for line in (CONLLU * 3).splitlines(keepends=True)))
+            # The multiword tokens and the empty nodes are removed by the first step
+            self.assertEqual([line.split("\t")[0] for line in output.splitlines()[:4]], ["# text = Hola mundo", "1", "2", "3"])
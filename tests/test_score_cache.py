@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from modules import score_cache
+from modules.score_cache import evict_scores, get_cache_file, load_scores, save_scores
+
+
+class TestScoreCache(unittest.TestCase):
+    def test_cache_file(self):
+        with TemporaryDirectory() as folder:
+            gold_file = Path(folder).joinpath("es-test.conll")
+            predicted_file = Path(folder).joinpath("es-predicted-test.conll")
+            gold_file.write_text("1\ta\n\n", encoding='UTF-8')
+            predicted_file.write_text("1\tb\n\n", encoding='UTF-8')
+
+            cache_file = get_cache_file(gold_file, predicted_file, ['UAS', 'LAS'])
+            self.assertEqual(get_cache_file(gold_file, predicted_file, ['UAS', 'LAS']), cache_file)
+            # The files are not interchangeable, and the metrics are part of the key
+            self.assertNotEqual(get_cache_file(predicted_file, gold_file, ['UAS', 'LAS']), cache_file)
+            self.assertNotEqual(get_cache_file(gold_file, predicted_file, ['UAS']), cache_file)
+
+            # A modified file changes the key, even with the same size
+            status = predicted_file.stat()
+            predicted_file.write_text("1\tc\n\n", encoding='UTF-8')
+            os.utime(predicted_file, ns=(status.st_atime_ns, status.st_mtime_ns + 1_000_000_000))
+            self.assertNotEqual(get_cache_file(gold_file, predicted_file, ['UAS', 'LAS']), cache_file)
+
+    def test_save_and_evict_scores(self):
+        with TemporaryDirectory() as folder, patch.object(score_cache, 'CACHE_PATH', Path(folder)):
+            cache_files = [Path(folder).joinpath(f"{number}.npz") for number in range(3)]
+            for number, cache_file in enumerate(cache_files):
+                save_scores(cache_file, {'UAS': [100.0, 50.0 + number], 'LAS': [75.0]})
+                os.utime(cache_file, ns=(number * 1_000_000_000, number * 1_000_000_000))
+            self.assertEqual(load_scores(cache_files[0]), {'UAS': [100.0, 50.0], 'LAS': [75.0]})
+            self.assertIsNone(load_scores(Path(folder).joinpath("missing.npz")))
+
+            # Loading the first file makes it the most recently used, so the second one is removed first
+            size = cache_files[0].stat().st_size
+            evict_scores(2 * size)
+            self.assertEqual([cache_file.exists() for cache_file in cache_files], [True, False, True])
+            evict_scores(0)
+            self.assertEqual(list(Path(folder).glob("*")), [])
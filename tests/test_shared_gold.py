@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy
+
+from modules.calculate_ttest import evaluate_model
+from modules.conll18_ud_eval import METRICS, UDArrays, evaluate, evaluate_arrays, load_conllu_file
+from modules.evaluator import walk_directories
+from modules.shared_gold import load_shared_gold, share_gold_files
+from tests.test_evaluator import write_system
+from tests.test_utils import write_sentences
+
+
+class TestSharedGold(unittest.TestCase):
+    def test_shared_gold(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            gold_file = folder.joinpath("gold", "es", "es-test.conll")
+            gold_file.parent.mkdir(parents=True)
+            write_sentences(gold_file, 30)
+            system_file = folder.joinpath("base", "es", "es-m1-predicted-test.conll")
+            write_system(gold_file, system_file, 3)
+            shared_path = folder.joinpath("shared")
+            shared_path.mkdir()
+
+            shared_folders = share_gold_files([gold_file, gold_file], shared_path)
+            self.assertEqual(list(shared_folders), [gold_file])
+            gold = load_shared_gold(shared_folders[gold_file])
+            load_shared_gold.cache_clear()
+
+            # The GOLD file is evaluated from the memory-mapped arrays, with the same scores as the parsed file
+            self.assertIsInstance(gold, UDArrays)
+            self.assertIsInstance(gold.word_columns, numpy.memmap)
+            expected = evaluate(load_conllu_file(gold_file), load_conllu_file(system_file))
+            evaluation = evaluate_arrays(gold, load_conllu_file(system_file))
+            for metric in METRICS:
+                self.assertEqual((evaluation[metric].correct, evaluation[metric].gold_total, evaluation[metric].system_total),
+                                 (expected[metric].correct, expected[metric].gold_total, expected[metric].system_total))
+
+            self.assertEqual(evaluate_model(system_file, "es", gold_file, shared_gold=shared_folders[gold_file]),
+                             evaluate_model(system_file, "es", gold_file))
+
+    def test_walk_directories_jobs(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            gold_file = folder.joinpath("gold", "es", "es-test.conll")
+            gold_file.parent.mkdir(parents=True)
+            write_sentences(gold_file, 30)
+            for every, model in enumerate(("m1", "m2"), 2):
+                write_system(gold_file, folder.joinpath("base", "es", f"es-{model}-predicted-test.conll"), every)
+
+            # The parallel run uses the shared GOLD file and the sequential one parses it
+            for jobs in (1, 2):
+                output_path = folder.joinpath(f"jobs{jobs}")
+                output_path.mkdir()
+                walk_directories(folder.joinpath("gold"), [folder.joinpath("base")], output_path, 'csv', jobs)
+            self.assertEqual(folder.joinpath("jobs2", "evaluation.csv").read_text(encoding='UTF-8'),
+                             folder.joinpath("jobs1", "evaluation.csv").read_text(encoding='UTF-8'))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from modules.splitter import select_random_blocks, split_file
+from modules.utils import read_sentences
+from tests.test_utils import write_sentences
+
+
+class TestSplitter(unittest.TestCase):
+    def test_select_random_blocks(self):
+        for total, ratio, training in ((10, 0.8, 8), (7, 0.5, 4), (3, 0.9, 3), (0, 0.8, 0)):
+            self.assertEqual(sum(select_random_blocks(total, ratio, seed=1)), training)
+        # The same seed gives the same split, and another seed a different one
+        self.assertEqual(select_random_blocks(100, 0.8, seed=1), select_random_blocks(100, 0.8, seed=1))
+        self.assertNotEqual(select_random_blocks(100, 0.8, seed=1), select_random_blocks(100, 0.8, seed=2))
+
+    def test_split_file(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            training_file = folder.joinpath("es-train.conllu")
+            # Repeated sentences are still assigned to a single file each
+            write_sentences(training_file, 25)
+            with open(training_file, 'at', encoding='UTF-8') as file:
+                file.write(training_file.read_text(encoding='UTF-8')[:200].rsplit("\n\n", 1)[0] + "\n\n")
+            sentences = list(read_sentences(training_file))
+
+            new_training_file = folder.joinpath("new-train.conllu")
+            validation_file = folder.joinpath("new-dev.conllu")
+            split_file(training_file, new_training_file, validation_file, ratio=0.75, seed=3)
+
+            training = list(read_sentences(new_training_file))
+            validation = list(read_sentences(validation_file))
+            self.assertEqual(len(training), round(0.75 * len(sentences)))
+            self.assertEqual(sorted(training + validation), sorted(sentences))
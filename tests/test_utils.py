@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from modules.converter import convert_line
+from modules.utils import count_sentences, find_sentence_ranges, read_sentences, transform_file, transform_files
+
+
+def write_sentences(file: Path, sentences: int) -> None:
+    lines = []
+    for sentence in range(sentences):
+        lines.append(f"# sent_id = {sentence}\n")
+        for word in range(1, sentence % 7 + 2):
+            lines.append(f"{word}\tpalabra{sentence}\t_\tNOUN\t_\t_\t{word - 1}\tdep\t_\tSpaceAfter=No\n")
+        lines.append("\n")
+    file.write_text("".join(lines), encoding='UTF-8')
+
+
+class TestTransformFiles(unittest.TestCase):
+    def test_find_sentence_ranges(self):
+        with TemporaryDirectory() as folder:
+            file = Path(folder).joinpath("es-test.conllu")
+            write_sentences(file, 200)
+            content = file.read_bytes()
+            ranges = find_sentence_ranges(file, 500)
+            self.assertGreater(len(ranges), 1)
+            # The ranges cover the whole file and every range but the last one ends right after a blank line
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], len(content))
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+                self.assertEqual(content[end - 2:end], b"\n\n")
+
+    def test_chunks_are_joined_in_order(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            input_file = folder.joinpath("es-test.conllu")
+            write_sentences(input_file, 300)
+            expected_file = folder.joinpath("expected.conll")
+            transform_file(input_file, expected_file, convert_line)
+
+            # The chunk size is smaller than a sentence, so most of the cuts fall in the middle of one
+            output_file = folder.joinpath("es-test.conll")
+            transform_files([(input_file, output_file)], convert_line, jobs=2, chunk_size=100)
+
+            self.assertEqual(output_file.read_bytes(), expected_file.read_bytes())
+            self.assertEqual([file.name for file in folder.glob("*.part*")], [])
+
+
+class TestReadSentences(unittest.TestCase):
+    def test_read_sentences(self):
+        with TemporaryDirectory() as folder:
+            file = Path(folder).joinpath("es-test.conllu")
+            # Consecutive blank lines do not make empty sentences, and the last sentence is closed even without a blank line
+            file.write_text("1\ta\n\n\n\n1\tb\n2\tc\n\n1\td", encoding='UTF-8')
+            self.assertEqual(list(read_sentences(file)), ["1\ta\n\n", "1\tb\n2\tc\n\n", "1\td\n\n"])
+            self.assertEqual(count_sentences(file), 3)
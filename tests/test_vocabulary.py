@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from modules.embeddings_generator import generate_file
+from modules.vocabulary import count_vocabulary, read_vocabulary, walk_directories
+from tests.test_utils import write_sentences
+
+VIETNAMESE = ("1\tHà Nội\tHà Nội\tPROPN\t_\t_\t0\troot\t_\t_\n"
+              "2\tlà\tlà\tAUX\t_\t_\t1\tcop\t_\t_\n"
+              "3\tthủ\u00a0đô\tthủ đô\tNOUN\t_\t_\t1\tnsubj\t_\t_\n"
+              "\n")
+
+
+class TestVocabulary(unittest.TestCase):
+    def test_chunks(self):
+        with TemporaryDirectory() as folder:
+            file = Path(folder).joinpath("es_ancora-ud-train.conllu")
+            write_sentences(file, 300)
+
+            # The words of the sentences cut by the chunks are counted once, in the order in which they first appear
+            expected = count_vocabulary([file])
+            counts = count_vocabulary([file], jobs=2, chunk_size=100)
+            self.assertEqual(list(counts.items()), list(expected.items()))
+            self.assertEqual(sum(counts.values()), sum(sentence % 7 + 1 for sentence in range(300)))
+
+    def test_forms_with_spaces(self):
+        with TemporaryDirectory() as folder:
+            folder = Path(folder)
+            input_path = folder.joinpath("input")
+            input_path.joinpath("vi").mkdir(parents=True)
+            input_path.joinpath("vi", "vi_vtb-ud-train.conllu").write_text(VIETNAMESE * 2, encoding='UTF-8')
+            input_path.joinpath("vi", "vi_vtb-ud-dev.conllu").write_text("1\tnhà\t_\tNOUN\t_\t_\t0\troot\t_\t_\n\n" + VIETNAMESE,
+                                                                         encoding='UTF-8')
+            output_path = folder.joinpath("output")
+            output_path.mkdir()
+
+            walk_directories(input_path, output_path)
+
+            # The FORMs with a space or a no-break space are skipped, and the words of the training file go first
+            vocabulary_file = output_path.joinpath("vi", "vi.vocab")
+            self.assertEqual(vocabulary_file.read_text(encoding='UTF-8'), "là\t3\nnhà\t1\n")
+
+            embeddings_file = folder.joinpath("vi.vectors")
+            generate_file(input_path.joinpath("vi", "vi_vtb-ud-train.conllu"), input_path.joinpath("vi", "vi_vtb-ud-dev.conllu"),
+                          embeddings_file, 4)
+            lines = embeddings_file.read_text(encoding='UTF-8').splitlines()
+            self.assertEqual([line.split(" ")[0] for line in lines], ["là", "nhà"])
+            self.assertEqual({len(line.split()) for line in lines}, {5})
+
+            # A vocabulary file with such a FORM, counted before they were skipped, gives the same words
+            vocabulary_file.write_text("là\t3\nHà Nội\t2\nnhà\t1\n", encoding='UTF-8')
+            self.assertEqual(read_vocabulary(vocabulary_file), ["là", "nhà"])